@@ -0,0 +1,172 @@
+"""
+Campo de texto con sugerencias para elegir un registro
+
+Autocompletar muestra, mientras se escribe, una lista desplegable con los
+registros que devuelve una función de búsqueda (por ejemplo
+Producto.buscar_por_prefijo) y recuerda el registro elegido. El id se toma
+del registro y no del texto, de modo que dos registros con el mismo nombre
+no se confunden.
+
+Teclado: flechas para moverse por la lista, Enter para elegir y Escape para
+cerrarla.
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+MAXIMO_SUGERENCIAS = 15
+FILAS_VISIBLES = 8
+
+
+class Autocompletar:
+    """Entry con lista de sugerencias que devuelve el registro elegido"""
+
+    def __init__(
+        self,
+        parent,
+        buscar,
+        texto,
+        detalle=None,
+        al_seleccionar=None,
+        width=30,
+    ):
+        """
+        Args:
+            parent: contenedor del campo
+            buscar: función (texto, limite) -> lista de registros
+            texto: función registro -> texto que queda en el campo al elegirlo
+            detalle: función registro -> texto de la sugerencia (por defecto texto)
+            al_seleccionar: función opcional llamada con el registro elegido
+        """
+        self.buscar = buscar
+        self.texto = texto
+        self.detalle = detalle or texto
+        self.al_seleccionar = al_seleccionar
+
+        self.seleccionado = None
+        self._sugerencias = []
+        self._popup = None
+        self._lista = None
+        self._escribiendo = True
+
+        self.var = tk.StringVar()
+        self.entry = ttk.Entry(parent, textvariable=self.var, width=width)
+        self.var.trace_add("write", self._al_escribir)
+        self.entry.bind("<Down>", lambda e: self._mover(1))
+        self.entry.bind("<Up>", lambda e: self._mover(-1))
+        self.entry.bind("<Return>", self._confirmar)
+        self.entry.bind("<Escape>", lambda e: self._cerrar())
+        self.entry.bind("<FocusOut>", self._al_salir)
+
+    def grid(self, **kwargs):
+        self.entry.grid(**kwargs)
+
+    def focus(self):
+        self.entry.focus()
+
+    def get_id(self):
+        """Id del registro elegido, o None si no se eligió ninguno"""
+        return self.seleccionado.id if self.seleccionado is not None else None
+
+    def seleccionar(self, registro):
+        """Muestra el registro en el campo como elegido (None lo limpia)"""
+        self.seleccionado = registro
+        self._escribiendo = False
+        self.var.set(self.texto(registro) if registro is not None else "")
+        self._escribiendo = True
+        self.entry.icursor(tk.END)
+        self._cerrar()
+
+    def limpiar(self):
+        self.seleccionar(None)
+
+    def _al_escribir(self, *args):
+        if not self._escribiendo:
+            return
+        # Cualquier cambio del texto anula la elección anterior
+        self.seleccionado = None
+        texto = self.var.get().strip()
+        if not texto:
+            self._cerrar()
+            return
+        self._sugerencias = self.buscar(texto, MAXIMO_SUGERENCIAS)
+        self._mostrar_sugerencias()
+
+    def _mostrar_sugerencias(self):
+        if not self._sugerencias:
+            self._cerrar()
+            return
+
+        if self._popup is None:
+            self._popup = tk.Toplevel(self.entry)
+            self._popup.wm_overrideredirect(True)
+            self._lista = tk.Listbox(self._popup, exportselection=False)
+            self._lista.pack(fill=tk.BOTH, expand=True)
+            self._lista.bind("<ButtonRelease-1>", self._al_hacer_clic)
+
+        self._lista.delete(0, tk.END)
+        for registro in self._sugerencias:
+            self._lista.insert(tk.END, self.detalle(registro))
+        self._lista.config(height=min(len(self._sugerencias), FILAS_VISIBLES))
+        self._lista.selection_set(0)
+
+        # Debajo del campo y con su mismo ancho
+        x = self.entry.winfo_rootx()
+        y = self.entry.winfo_rooty() + self.entry.winfo_height()
+        self._popup.geometry(f"+{x}+{y}")
+        self._lista.config(width=0)
+        self._popup.update_idletasks()
+        ancho = max(self.entry.winfo_width(), self._lista.winfo_reqwidth())
+        self._popup.geometry(f"{ancho}x{self._lista.winfo_reqheight()}+{x}+{y}")
+        self._popup.lift()
+
+    def _cerrar(self):
+        if self._popup is not None:
+            self._popup.destroy()
+            self._popup = None
+            self._lista = None
+
+    def _indice_actual(self):
+        seleccion = self._lista.curselection() if self._lista else ()
+        return seleccion[0] if seleccion else 0
+
+    def _mover(self, paso):
+        if self._lista is None:
+            # Abrir la lista con las sugerencias del texto actual
+            self._al_escribir()
+            return "break"
+        indice = max(0, min(self._indice_actual() + paso, len(self._sugerencias) - 1))
+        self._lista.selection_clear(0, tk.END)
+        self._lista.selection_set(indice)
+        self._lista.see(indice)
+        return "break"
+
+    def _elegir(self, indice):
+        registro = self._sugerencias[indice]
+        self.seleccionar(registro)
+        if self.al_seleccionar:
+            self.al_seleccionar(registro)
+
+    def _confirmar(self, event=None):
+        if self._lista is not None and self._sugerencias:
+            self._elegir(self._indice_actual())
+            return "break"
+
+    def _al_hacer_clic(self, event):
+        indice = self._lista.nearest(event.y)
+        if 0 <= indice < len(self._sugerencias):
+            self._elegir(indice)
+            self.entry.focus()
+
+    def _al_salir(self, event=None):
+        # El clic en la lista quita el foco al campo: cerrar solo si el foco
+        # no pasó a la lista
+        self.entry.after(150, self._cerrar_sin_foco)
+
+    def _cerrar_sin_foco(self):
+        try:
+            foco = self.entry.focus_get()
+        except (KeyError, tk.TclError):
+            foco = None
+        if self._lista is None or foco not in (self.entry, self._lista):
+            self._cerrar()
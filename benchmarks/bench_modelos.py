@@ -0,0 +1,393 @@
+"""
+Benchmark de la capa de modelos de database.py
+
+Genera bases de datos sintéticas de tamaño creciente (ver generador_datos.py)
+y mide cada operación pública de los modelos: get_all, get_by_*, save,
+delete, verificar_solapamiento y las estadísticas por rango. Para cada
+operación informa ops/s, latencia p50/p95 y pico de memoria (tracemalloc).
+
+Los resultados se guardan en JSON junto con el commit actual para poder
+comparar ejecuciones; con --comparar se marcan las regresiones respecto a un
+resultado anterior y el proceso termina con código 1 si hay alguna.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_modelos [--escalas pequena,mediana]
+        [--repeticiones N] [--salida archivo.json] [--comparar base.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+DIRECTORIO_RESULTADOS = Path(__file__).parent / "resultados"
+
+# Diferencia mínima en ms para considerar una regresión (evita ruido)
+REGRESION_MINIMA_MS = 0.05
+
+
+def commit_actual() -> str:
+    """Devuelve el hash corto del commit actual (con -dirty si hay cambios)"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=RAIZ,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        cambios = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=RAIZ,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+        return f"{commit}-dirty" if cambios else commit
+    except Exception:
+        return "desconocido"
+
+
+def usar_base_datos(ruta: Path):
+    """Apunta los modelos a otra base de datos"""
+    from database import Database, indice_semanas
+
+    Database.db_path_por_defecto = ruta
+    indice_semanas.invalidar()
+
+
+def operaciones_lectura(datos):
+    """Operaciones de solo lectura: lista de (nombre, función)"""
+    from database import (
+        Categoria,
+        Compra,
+        Costo,
+        CuentaCobrar,
+        CuentaPagar,
+        Producto,
+        Semana,
+        TipoCosto,
+        Venta,
+        get_margen_neto_rango,
+        get_margen_neto_semana,
+        get_margen_neto_serie,
+        get_total_compras_rango,
+        get_total_ventas_rango,
+    )
+
+    inicio, fin = datos["primera_fecha"], datos["ultima_fecha"]
+    anio = max(inicio, fin - timedelta(days=364))
+    medio = inicio + (fin - inicio) / 2
+
+    return [
+        ("Categoria.get_all", Categoria.get_all),
+        ("Categoria.get_by_id", lambda: Categoria.get_by_id(datos["categoria_id"])),
+        ("Producto.get_all", Producto.get_all),
+        (
+            "Producto.get_by_categoria",
+            lambda: Producto.get_by_categoria(datos["categoria_id"]),
+        ),
+        ("Producto.get_by_id", lambda: Producto.get_by_id(datos["producto_id"])),
+        (
+            "Producto.get_productos_agrupados_por_categoria",
+            Producto.get_productos_agrupados_por_categoria,
+        ),
+        ("Compra.get_all", Compra.get_all),
+        ("Compra.get_by_id", lambda: Compra.get_by_id(datos["compra_id"])),
+        ("Semana.get_all", Semana.get_all),
+        ("Semana.get_by_id", lambda: Semana.get_by_id(datos["semana_id"])),
+        ("Semana.find_by_fecha", lambda: Semana.find_by_fecha(medio)),
+        (
+            "Semana.verificar_solapamiento",
+            lambda: Semana.verificar_solapamiento(medio, medio + timedelta(days=6)),
+        ),
+        ("Costo.get_all", Costo.get_all),
+        ("Costo.get_by_tipo", lambda: Costo.get_by_tipo(TipoCosto.FIJO)),
+        ("Costo.get_by_id", lambda: Costo.get_by_id(datos["costo_id"])),
+        ("Costo.get_total_general", Costo.get_total_general),
+        ("Venta.get_all", Venta.get_all),
+        ("Venta.get_by_semana", lambda: Venta.get_by_semana(datos["semana_id"])),
+        ("Venta.get_by_producto", lambda: Venta.get_by_producto(datos["producto_id"])),
+        ("Venta.get_by_id", lambda: Venta.get_by_id(datos["venta_id"])),
+        (
+            "Venta.get_total_monto_semana",
+            lambda: Venta.get_total_monto_semana(datos["semana_id"]),
+        ),
+        ("CuentaCobrar.get_all", CuentaCobrar.get_all),
+        ("CuentaCobrar.get_by_id", lambda: CuentaCobrar.get_by_id(1)),
+        ("CuentaPagar.get_all", CuentaPagar.get_all),
+        ("CuentaPagar.get_by_id", lambda: CuentaPagar.get_by_id(1)),
+        ("get_total_compras_rango 1 año", lambda: get_total_compras_rango(anio, fin)),
+        ("get_total_ventas_rango 1 año", lambda: get_total_ventas_rango(anio, fin)),
+        ("get_total_ventas_rango todo", lambda: get_total_ventas_rango(inicio, fin)),
+        (
+            "get_margen_neto_semana",
+            lambda: get_margen_neto_semana(datos["semana_id"]),
+        ),
+        ("get_margen_neto_rango 1 año", lambda: get_margen_neto_rango(anio, fin)),
+        ("get_margen_neto_rango todo", lambda: get_margen_neto_rango(inicio, fin)),
+        ("get_margen_neto_serie 1 año", lambda: get_margen_neto_serie(anio, fin)),
+    ]
+
+
+def operaciones_escritura(datos):
+    """
+    Operaciones save/delete: lista de (nombre, crear objeto)
+
+    Cada repetición guarda un objeto nuevo y luego lo elimina, midiendo por
+    separado save y delete para que la base de datos no cambie de tamaño.
+    """
+    from database import (
+        Categoria,
+        Compra,
+        Costo,
+        CuentaCobrar,
+        CuentaPagar,
+        Producto,
+        Semana,
+        TipoCosto,
+        Venta,
+    )
+
+    # Una semana libre después de la última generada
+    inicio_libre = datos["ultima_fecha"] + timedelta(days=1)
+
+    return [
+        ("Categoria", lambda: Categoria("Categoría benchmark")),
+        (
+            "Producto",
+            lambda: Producto(
+                "Producto benchmark", datos["categoria_id"], 10.0, 15.0, 100
+            ),
+        ),
+        ("Compra", lambda: Compra("Producto benchmark", 100.0, 10, 1)),
+        ("Semana", lambda: Semana(inicio_libre, inicio_libre + timedelta(days=6))),
+        ("Costo", lambda: Costo("Costo benchmark", 50.0, TipoCosto.VARIABLE)),
+        (
+            "Venta",
+            lambda: Venta(
+                semana_id=datos["semana_id"],
+                producto_id=datos["producto_id"],
+                cantidad_vendida=1,
+                monto=1.0,
+            ),
+        ),
+        ("CuentaCobrar", lambda: CuentaCobrar(nombre_persona="Benchmark", cantidad=1)),
+        ("CuentaPagar", lambda: CuentaPagar(nombre_proveedor="Benchmark", cantidad=1)),
+    ]
+
+
+def resumir(tiempos, memoria_pico):
+    """Calcula ops/s, p50 y p95 (ms) a partir de los tiempos en segundos"""
+    ms = sorted(t * 1000 for t in tiempos)
+    p95 = statistics.quantiles(ms, n=20)[18] if len(ms) > 1 else ms[0]
+    return {
+        "n": len(ms),
+        "ops_s": len(ms) / sum(tiempos) if sum(tiempos) else 0.0,
+        "p50_ms": statistics.median(ms),
+        "p95_ms": p95,
+        "memoria_pico_kb": memoria_pico / 1024,
+    }
+
+
+def medir_memoria(funcion) -> int:
+    """Pico de memoria (bytes) de una ejecución, medido aparte del tiempo"""
+    tracemalloc.start()
+    try:
+        funcion()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def medir_lectura(funcion, repeticiones):
+    funcion()  # calentamiento (caché de páginas, índice de semanas)
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return resumir(tiempos, medir_memoria(funcion))
+
+
+def medir_escritura(crear, repeticiones):
+    """Devuelve (resumen save, resumen delete)"""
+    tiempos_save, tiempos_delete = [], []
+    for _ in range(repeticiones):
+        objeto = crear()
+        inicio = time.perf_counter()
+        objeto.save()
+        tiempos_save.append(time.perf_counter() - inicio)
+
+        inicio = time.perf_counter()
+        objeto.delete()
+        tiempos_delete.append(time.perf_counter() - inicio)
+
+    objeto = crear()
+    memoria_save = medir_memoria(objeto.save)
+    memoria_delete = medir_memoria(objeto.delete)
+    return (
+        resumir(tiempos_save, memoria_save),
+        resumir(tiempos_delete, memoria_delete),
+    )
+
+
+def datos_de_referencia(ruta: Path) -> dict:
+    """Ids y fechas existentes para parametrizar las operaciones"""
+    conn = sqlite3.connect(ruta)
+    try:
+        consulta = lambda sql: conn.execute(sql).fetchone()[0]
+        primera, ultima = conn.execute(
+            "SELECT MIN(fecha_inicio), MAX(fecha_fin) FROM semanas"
+        ).fetchone()
+        return {
+            "categoria_id": consulta(
+                "SELECT categoria_id FROM productos GROUP BY categoria_id "
+                "ORDER BY COUNT(*) DESC LIMIT 1"
+            ),
+            "producto_id": consulta(
+                "SELECT id FROM productos ORDER BY cantidad DESC LIMIT 1"
+            ),
+            "semana_id": consulta("SELECT MAX(id) FROM semanas"),
+            "compra_id": consulta("SELECT MAX(id) FROM compras"),
+            "costo_id": consulta("SELECT MIN(id) FROM costos"),
+            "venta_id": consulta("SELECT MAX(id) FROM ventas"),
+            "primera_fecha": datetime.strptime(primera, "%Y-%m-%d").date(),
+            "ultima_fecha": datetime.strptime(ultima, "%Y-%m-%d").date(),
+        }
+    finally:
+        conn.close()
+
+
+def ejecutar_escala(escala, directorio, semilla, repeticiones):
+    from generador_datos import generar
+
+    ruta = Path(directorio) / f"bench_{escala}.db"
+    inicio = time.perf_counter()
+    totales = generar(ruta, escala, semilla)
+    print(
+        f"\n== Escala {escala}: {totales['productos']} productos, "
+        f"{totales['semanas']} semanas, {totales['ventas']} ventas "
+        f"(generada en {time.perf_counter() - inicio:.1f} s)"
+    )
+
+    usar_base_datos(ruta)
+    datos = datos_de_referencia(ruta)
+
+    resultados = {}
+    for nombre, funcion in operaciones_lectura(datos):
+        resultados[nombre] = medir_lectura(funcion, repeticiones)
+        imprimir_fila(nombre, resultados[nombre])
+
+    for modelo, crear in operaciones_escritura(datos):
+        save, delete = medir_escritura(crear, repeticiones)
+        resultados[f"{modelo}.save"] = save
+        resultados[f"{modelo}.delete"] = delete
+        imprimir_fila(f"{modelo}.save", save)
+        imprimir_fila(f"{modelo}.delete", delete)
+
+    return resultados
+
+
+def imprimir_encabezado():
+    print(f"{'operación':<48}{'ops/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'mem KB':>10}")
+
+
+def imprimir_fila(nombre, r):
+    print(
+        f"{nombre:<48}{r['ops_s']:>10.1f}{r['p50_ms']:>10.2f}"
+        f"{r['p95_ms']:>10.2f}{r['memoria_pico_kb']:>10.0f}"
+    )
+
+
+def comparar(actual: dict, base: dict, umbral: float) -> list:
+    """Devuelve las regresiones de p50 mayores que el umbral relativo"""
+    regresiones = []
+    for escala, operaciones in actual["resultados"].items():
+        operaciones_base = base["resultados"].get(escala, {})
+        for nombre, r in operaciones.items():
+            if nombre not in operaciones_base:
+                continue
+            antes, ahora = operaciones_base[nombre]["p50_ms"], r["p50_ms"]
+            if ahora - antes > REGRESION_MINIMA_MS and ahora > antes * (1 + umbral):
+                regresiones.append((escala, nombre, antes, ahora))
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--escalas",
+        default="pequena,mediana",
+        help="Escalas separadas por comas (pequena, mediana, grande)",
+    )
+    parser.add_argument("--repeticiones", type=int, default=20)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--salida", help="Archivo JSON de resultados")
+    parser.add_argument("--comparar", help="JSON de una ejecución anterior")
+    parser.add_argument(
+        "--umbral",
+        type=float,
+        default=0.2,
+        help="Aumento relativo de p50 considerado regresión (por defecto 0.2)",
+    )
+    args = parser.parse_args()
+
+    escalas = [e.strip() for e in args.escalas.split(",") if e.strip()]
+    commit = commit_actual()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Antes de importar database para que no se toque app_database.db
+        os.environ["SISTEMA_GESTION_DB"] = str(Path(tmp) / "inicial.db")
+
+        resultados = {}
+        imprimir_encabezado()
+        for escala in escalas:
+            resultados[escala] = ejecutar_escala(
+                escala, tmp, args.semilla, args.repeticiones
+            )
+
+    ejecucion = {
+        "commit": commit,
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "semilla": args.semilla,
+        "repeticiones": args.repeticiones,
+        "resultados": resultados,
+    }
+
+    salida = args.salida
+    if not salida:
+        DIRECTORIO_RESULTADOS.mkdir(exist_ok=True)
+        marca = datetime.now().strftime("%Y%m%d-%H%M%S")
+        salida = DIRECTORIO_RESULTADOS / f"modelos-{commit}-{marca}.json"
+    Path(salida).write_text(json.dumps(ejecucion, indent=2, ensure_ascii=False))
+    print(f"\nResultados guardados en {salida}")
+
+    if args.comparar:
+        base = json.loads(Path(args.comparar).read_text())
+        regresiones = comparar(ejecucion, base, args.umbral)
+        print(f"\nComparación con {base['commit']} (umbral {args.umbral:.0%}):")
+        if not regresiones:
+            print("Sin regresiones")
+        for escala, nombre, antes, ahora in regresiones:
+            print(
+                f"REGRESIÓN [{escala}] {nombre}: {antes:.2f} ms -> {ahora:.2f} ms "
+                f"({ahora / antes - 1:+.0%})"
+            )
+        if regresiones:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
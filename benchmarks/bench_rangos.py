@@ -0,0 +1,151 @@
+"""
+Benchmark de las estadísticas por rango (ventas y margen neto)
+
+Genera una base de datos temporal con 10 años de semanas y 500 productos y
+mide get_total_ventas_rango y get_margen_neto_rango para rangos de distinto
+tamaño. Como referencia también mide la versión anterior basada en una lista
+IN con un parámetro por semana.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_rangos [--repeticiones N]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sqlite3
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+ANIOS = 10
+NUM_PRODUCTOS = 500
+PRODUCTOS_POR_SEMANA = 100
+
+
+def poblar(db_path: Path):
+    """Llena la base de datos con semanas, productos y ventas"""
+    from database import Database
+
+    random.seed(42)
+    db = Database(db_path)
+    categoria_id = Database.get_default_categoria_id()
+
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.executemany(
+            """
+            INSERT INTO productos
+            (nombre, categoria_id, costo, precio_venta, cantidad, margen_bruto)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """,
+            [
+                (f"Producto {i:04d}", categoria_id, 1.0, 2.0, 1_000_000, 1.0)
+                for i in range(NUM_PRODUCTOS)
+            ],
+        )
+
+        inicio = date(2015, 1, 5)
+        semanas = [
+            (
+                (inicio + timedelta(weeks=i)).strftime("%Y-%m-%d"),
+                (inicio + timedelta(weeks=i, days=6)).strftime("%Y-%m-%d"),
+            )
+            for i in range(ANIOS * 52)
+        ]
+        cursor.executemany(
+            "INSERT INTO semanas (fecha_inicio, fecha_fin) VALUES (?, ?)", semanas
+        )
+
+        productos_ids = [row[0] for row in cursor.execute("SELECT id FROM productos")]
+        semanas_ids = [row[0] for row in cursor.execute("SELECT id FROM semanas")]
+        ventas = []
+        for semana_id in semanas_ids:
+            for producto_id in random.sample(productos_ids, PRODUCTOS_POR_SEMANA):
+                cantidad = random.randint(1, 20)
+                ventas.append((semana_id, producto_id, cantidad, cantidad * 2.0))
+        cursor.executemany(
+            """
+            INSERT INTO ventas (semana_id, producto_id, cantidad_vendida, monto)
+            VALUES (?, ?, ?, ?)
+        """,
+            ventas,
+        )
+        cursor.executemany(
+            "INSERT INTO costos (nombre, cantidad, tipo) VALUES (?, ?, ?)",
+            [("Renta", 1000.0, "fijo"), ("Transporte", 250.0, "variable")],
+        )
+        conn.commit()
+
+    return inicio, len(ventas)
+
+
+def total_ventas_rango_lista_in(db_path: Path, fecha_inicio: date, fecha_fin: date):
+    """Versión anterior de get_total_ventas_rango (lista IN), como referencia"""
+    with sqlite3.connect(db_path) as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT id FROM semanas WHERE fecha_inicio <= ? AND fecha_fin >= ?",
+            (fecha_fin.strftime("%Y-%m-%d"), fecha_inicio.strftime("%Y-%m-%d")),
+        )
+        semanas_ids = [row[0] for row in cursor.fetchall()]
+        placeholders = ",".join("?" * len(semanas_ids))
+        cursor.execute(
+            f"SELECT SUM(monto) FROM ventas WHERE semana_id IN ({placeholders})",
+            semanas_ids,
+        )
+        return cursor.fetchone()[0]
+
+
+def medir(funcion, repeticiones):
+    """Ejecuta la función varias veces y devuelve (mediana, mínimo) en ms"""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos), min(tiempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeticiones", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench_rangos.db"
+        os.environ["SISTEMA_GESTION_DB"] = str(db_path)
+
+        from database import get_margen_neto_rango, get_total_ventas_rango
+
+        inicio, num_ventas = poblar(db_path)
+        print(
+            f"Datos: {ANIOS * 52} semanas, {NUM_PRODUCTOS} productos, {num_ventas} ventas"
+        )
+        print(f"{'operación':<42}{'mediana ms':>12}{'mínimo ms':>12}")
+
+        for anios in (1, 5, ANIOS):
+            fin = inicio + timedelta(weeks=anios * 52) - timedelta(days=1)
+            casos = [
+                (
+                    f"get_total_ventas_rango {anios} año(s)",
+                    lambda f=fin: get_total_ventas_rango(inicio, f),
+                ),
+                (
+                    f"  referencia lista IN {anios} año(s)",
+                    lambda f=fin: total_ventas_rango_lista_in(db_path, inicio, f),
+                ),
+                (
+                    f"get_margen_neto_rango {anios} año(s)",
+                    lambda f=fin: get_margen_neto_rango(inicio, f),
+                ),
+            ]
+            for nombre, funcion in casos:
+                mediana, minimo = medir(funcion, args.repeticiones)
+                print(f"{nombre:<42}{mediana:>12.2f}{minimo:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
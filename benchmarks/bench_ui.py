@@ -0,0 +1,304 @@
+"""
+Benchmark de renderizado de las ventanas Tk
+
+Crea cada ventana (ProductosWindow, ComprasWindow, VentasWindow,
+ContabilidadWindow y las de configuración) contra una base de datos generada
+con generador_datos.py y mide:
+
+- carga inicial: constructor más el primer dibujado completo
+- refresco tras guardar: guardar un registro con el modelo y recargar la
+  vista con el mismo método que usa la ventana después de guardar
+- desplazamiento: recorrer cada lista (Treeview/Canvas) de arriba abajo; en
+  las listas paginadas (TablaPaginada) es la primera página
+
+Las ventanas cargan en segundo plano (EjecutorDB) y por lotes
+(CargadorTreeview): cada medición espera a que terminen ambas cosas.
+
+Si no hay DISPLAY se lanza un Xvfb propio. Los cuadros de diálogo
+(messagebox) se sustituyen para que no bloqueen.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_ui [--escala mediana] [--repeticiones N]
+        [--salida archivo.json] [--comparar base.json]
+"""
+
+import argparse
+import importlib
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from benchmarks.bench_modelos import (
+    DIRECTORIO_RESULTADOS,
+    commit_actual,
+    comparar,
+    datos_de_referencia,
+    usar_base_datos,
+)
+
+PASOS_DESPLAZAMIENTO = 20
+
+# Tiempo máximo que se espera a que una ventana termine de cargar (s)
+ESPERA_MAXIMA_SEG = 120
+
+
+def iniciar_xvfb():
+    """Lanza Xvfb en un display libre y devuelve el proceso"""
+    if not shutil.which("Xvfb"):
+        sys.exit("No hay DISPLAY y Xvfb no está instalado")
+
+    for numero in range(99, 200):
+        if not Path(f"/tmp/.X11-unix/X{numero}").exists():
+            break
+    proceso = subprocess.Popen(
+        ["Xvfb", f":{numero}", "-screen", "0", "1920x1080x24", "-nolisten", "tcp"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    # Esperar a que el servidor acepte conexiones
+    for _ in range(50):
+        if Path(f"/tmp/.X11-unix/X{numero}").exists():
+            break
+        time.sleep(0.1)
+    os.environ["DISPLAY"] = f":{numero}"
+    return proceso
+
+
+def silenciar_dialogos():
+    """Sustituye los messagebox para que no esperen al usuario"""
+    from tkinter import messagebox
+
+    for nombre in ("showinfo", "showwarning", "showerror"):
+        setattr(messagebox, nombre, lambda *args, **kwargs: "ok")
+    for nombre in ("askyesno", "askokcancel", "askyesnocancel"):
+        setattr(messagebox, nombre, lambda *args, **kwargs: True)
+
+
+def ventanas(datos):
+    """
+    Ventanas a medir: (módulo, clase, método de recarga, crear registro)
+
+    El método de recarga es el que llama la ventana después de guardar.
+    """
+    from database import (
+        Categoria,
+        Compra,
+        Costo,
+        CuentaCobrar,
+        Producto,
+        Semana,
+        TipoCosto,
+        Venta,
+    )
+
+    inicio_libre = datos["ultima_fecha"] + timedelta(days=1)
+
+    return [
+        (
+            "productos",
+            "ProductosWindow",
+            "load_productos",
+            lambda: Producto("Producto benchmark", datos["categoria_id"], 1, 2, 10),
+        ),
+        (
+            "compras",
+            "ComprasWindow",
+            "load_compras",
+            lambda: Compra("Producto benchmark", 100.0, 10, 1),
+        ),
+        (
+            "ventas",
+            "VentasWindow",
+            "refrescar_datos",
+            lambda: Venta(
+                semana_id=datos["semana_id"],
+                producto_id=datos["producto_id"],
+                cantidad_vendida=1,
+                monto=1.0,
+            ),
+        ),
+        (
+            "contabilidad",
+            "ContabilidadWindow",
+            "load_cuentas_cobrar",
+            lambda: CuentaCobrar(nombre_persona="Benchmark", cantidad=1),
+        ),
+        (
+            "config_semanas",
+            "ConfigSemanasWindow",
+            "load_semanas",
+            lambda: Semana(inicio_libre, inicio_libre + timedelta(days=6)),
+        ),
+        (
+            "config_costos",
+            "ConfigCostosWindow",
+            "load_costos",
+            lambda: Costo("Costo benchmark", 50.0, TipoCosto.VARIABLE),
+        ),
+        (
+            "config_categorias",
+            "CategoriasWindow",
+            "load_categorias",
+            lambda: Categoria("Categoría benchmark"),
+        ),
+    ]
+
+
+def resumir(tiempos):
+    ms = sorted(t * 1000 for t in tiempos)
+    return {
+        "n": len(ms),
+        "ops_s": len(ms) / sum(tiempos) if sum(tiempos) else 0.0,
+        "p50_ms": statistics.median(ms),
+        "p95_ms": statistics.quantiles(ms, n=20)[18] if len(ms) > 1 else ms[0],
+    }
+
+
+def widgets_desplazables(widget):
+    """Treeview y Canvas con barra de desplazamiento vertical"""
+    from tkinter import ttk
+    import tkinter as tk
+
+    encontrados = []
+    for hijo in widget.winfo_children():
+        if isinstance(hijo, (ttk.Treeview, tk.Canvas)) and hijo.cget("yscrollcommand"):
+            encontrados.append(hijo)
+        encontrados.extend(widgets_desplazables(hijo))
+    return encontrados
+
+
+def esperar(root, ventana):
+    """Procesa eventos hasta que la ventana termina sus consultas y cargas por lotes"""
+    from carga_treeview import hay_cargas_en_curso
+
+    root.update()
+    ejecutor = getattr(ventana, "ejecutor", None)
+    limite = time.perf_counter() + ESPERA_MAXIMA_SEG
+    while (ejecutor is not None and ejecutor.ocupado) or hay_cargas_en_curso():
+        if time.perf_counter() > limite:
+            # Una medición que nunca termina no es una medición
+            raise RuntimeError(
+                f"{type(ventana).__name__} sigue cargando tras {ESPERA_MAXIMA_SEG} s"
+            )
+        time.sleep(0.001)
+        root.update()
+
+
+def medir_ventana(modulo, clase, recarga, crear, repeticiones):
+    import tkinter as tk
+
+    ventana_clase = getattr(importlib.import_module(modulo), clase)
+
+    tiempos_carga, tiempos_refresco, tiempos_paso = [], [], []
+    for _ in range(repeticiones):
+        root = tk.Tk()
+        try:
+            inicio = time.perf_counter()
+            ventana = ventana_clase(root)
+            esperar(root, ventana)
+            tiempos_carga.append(time.perf_counter() - inicio)
+
+            registro = crear()
+            registro.save()
+            inicio = time.perf_counter()
+            getattr(ventana, recarga)()
+            esperar(root, ventana)
+            tiempos_refresco.append(time.perf_counter() - inicio)
+            registro.delete()
+            getattr(ventana, recarga)()
+            esperar(root, ventana)
+
+            for widget in widgets_desplazables(root):
+                for paso in range(PASOS_DESPLAZAMIENTO + 1):
+                    inicio = time.perf_counter()
+                    widget.yview_moveto(paso / PASOS_DESPLAZAMIENTO)
+                    root.update()
+                    tiempos_paso.append(time.perf_counter() - inicio)
+        finally:
+            root.destroy()
+
+    resultados = {
+        f"{clase} carga inicial": resumir(tiempos_carga),
+        f"{clase} refresco tras guardar": resumir(tiempos_refresco),
+    }
+    if tiempos_paso:
+        resultados[f"{clase} paso de desplazamiento"] = resumir(tiempos_paso)
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--escala", default="mediana", help="pequena, mediana o grande")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--salida", help="Archivo JSON de resultados")
+    parser.add_argument("--comparar", help="JSON de una ejecución anterior")
+    parser.add_argument("--umbral", type=float, default=0.2)
+    args = parser.parse_args()
+
+    xvfb = iniciar_xvfb() if not os.environ.get("DISPLAY") else None
+    commit = commit_actual()
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            # Antes de importar database para que no se toque app_database.db
+            os.environ["SISTEMA_GESTION_DB"] = str(Path(tmp) / "inicial.db")
+            from generador_datos import generar
+
+            ruta = Path(tmp) / f"bench_ui_{args.escala}.db"
+            totales = generar(ruta, args.escala, args.semilla)
+            print(
+                f"Escala {args.escala}: {totales['productos']} productos, "
+                f"{totales['compras']} compras, {totales['ventas']} ventas"
+            )
+            usar_base_datos(ruta)
+            datos = datos_de_referencia(ruta)
+            silenciar_dialogos()
+
+            print(f"{'medición':<52}{'p50 ms':>10}{'p95 ms':>10}")
+            resultados = {}
+            for modulo, clase, recarga, crear in ventanas(datos):
+                medidas = medir_ventana(
+                    modulo, clase, recarga, crear, args.repeticiones
+                )
+                for nombre, r in medidas.items():
+                    print(f"{nombre:<52}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}")
+                resultados.update(medidas)
+    finally:
+        if xvfb:
+            xvfb.terminate()
+
+    ejecucion = {
+        "commit": commit,
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "semilla": args.semilla,
+        "repeticiones": args.repeticiones,
+        "resultados": {args.escala: resultados},
+    }
+
+    salida = args.salida
+    if not salida:
+        DIRECTORIO_RESULTADOS.mkdir(exist_ok=True)
+        marca = datetime.now().strftime("%Y%m%d-%H%M%S")
+        salida = DIRECTORIO_RESULTADOS / f"ui-{commit}-{marca}.json"
+    Path(salida).write_text(json.dumps(ejecucion, indent=2, ensure_ascii=False))
+    print(f"\nResultados guardados en {salida}")
+
+    if args.comparar:
+        base = json.loads(Path(args.comparar).read_text())
+        regresiones = comparar(ejecucion, base, args.umbral)
+        for escala, nombre, antes, ahora in regresiones:
+            print(f"REGRESIÓN [{escala}] {nombre}: {antes:.1f} ms -> {ahora:.1f} ms")
+        if regresiones:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
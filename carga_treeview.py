@@ -0,0 +1,111 @@
+"""
+Carga de filas en un Treeview por lotes
+
+Insertar decenas de miles de filas en un solo bucle bloquea el bucle de
+eventos de Tk hasta que termina. CargadorTreeview inserta las filas en lotes
+programados con root.after, de modo que la ventana sigue respondiendo
+(escribir, desplazarse, hacer clic) mientras se completa la lista y, si se
+indica una etiqueta, muestra el progreso.
+
+Una carga nueva sobre el mismo Treeview cancela la que estuviera en curso.
+"""
+
+import time
+import tkinter as tk
+
+# Filas insertadas por lote y tiempo máximo de un lote antes de ceder a Tk (ms)
+TAMANO_LOTE = 500
+TIEMPO_MAXIMO_LOTE_MS = 30
+
+
+class CargadorTreeview:
+    """Inserta filas en un Treeview por lotes sin bloquear la interfaz"""
+
+    # Cargadores con una carga en curso (benchmarks y pruebas pueden esperarlos)
+    en_curso = set()
+
+    def __init__(self, tree, indicador=None, tamano_lote=TAMANO_LOTE):
+        """
+        Args:
+            tree: Treeview que recibe las filas
+            indicador: etiqueta opcional donde mostrar el progreso
+        """
+        self.tree = tree
+        self.indicador = indicador
+        self.tamano_lote = tamano_lote
+        self._filas = []
+        self._posicion = 0
+        self._al_terminar = None
+        self._after_id = None
+
+    @property
+    def cargando(self) -> bool:
+        return self._after_id is not None
+
+    def cargar(self, filas, al_terminar=None):
+        """
+        Reemplaza el contenido del Treeview por las filas indicadas
+
+        Args:
+            filas: lista de tuplas con los valores de cada fila
+            al_terminar: función opcional llamada cuando se insertó la última fila
+        """
+        self.cancelar()
+        # Un solo delete con todos los items es mucho más rápido que uno por item
+        self.tree.delete(*self.tree.get_children())
+
+        self._filas = filas
+        self._posicion = 0
+        self._al_terminar = al_terminar
+        # El primer lote se inserta enseguida para que la lista no quede vacía
+        self._insertar_lote()
+
+    def cancelar(self):
+        """Detiene la carga en curso (las filas ya insertadas se conservan)"""
+        if self._after_id is not None:
+            self.tree.after_cancel(self._after_id)
+            self._after_id = None
+        CargadorTreeview.en_curso.discard(self)
+        self._mostrar_progreso(None)
+
+    def _insertar_lote(self):
+        self._after_id = None
+        total = len(self._filas)
+        limite = time.perf_counter() + TIEMPO_MAXIMO_LOTE_MS / 1000
+
+        fin = min(self._posicion + self.tamano_lote, total)
+        try:
+            while self._posicion < fin:
+                self.tree.insert("", tk.END, values=self._filas[self._posicion])
+                self._posicion += 1
+                # Con filas costosas de dibujar, ceder antes de completar el lote
+                if self._posicion % 50 == 0 and time.perf_counter() > limite:
+                    break
+        except tk.TclError:
+            # El Treeview se destruyó (ventana cerrada durante la carga)
+            CargadorTreeview.en_curso.discard(self)
+            return
+
+        if self._posicion < total:
+            CargadorTreeview.en_curso.add(self)
+            self._mostrar_progreso(f"Cargando {self._posicion} de {total}...")
+            self._after_id = self.tree.after(1, self._insertar_lote)
+            return
+
+        CargadorTreeview.en_curso.discard(self)
+        self._mostrar_progreso(None)
+        self._filas = []
+        if self._al_terminar:
+            self._al_terminar()
+
+    def _mostrar_progreso(self, texto):
+        if self.indicador is not None:
+            try:
+                self.indicador.config(text=texto or "")
+            except tk.TclError:
+                pass
+
+
+def hay_cargas_en_curso() -> bool:
+    """Indica si algún Treeview todavía está recibiendo filas"""
+    return bool(CargadorTreeview.en_curso)
@@ -5,9 +5,14 @@ Módulo para gestión de Compras - CRUD completo
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
+from carga_treeview import CargadorTreeview
 from database import Compra
+from ejecutor_db import EjecutorDB
+from instrumentacion import perfilar_ventana
+from tabla_paginada import TablaPaginada
 
 
+@perfilar_ventana
 class ComprasWindow:
     def __init__(self, root):
         self.root = root
@@ -20,6 +25,35 @@ class ComprasWindow:
         # Crear interfaz
         self.create_widgets()
 
+        # Consultas en segundo plano para no congelar la ventana
+        self.ejecutor = EjecutorDB(self.root, self.estado_label)
+        self.cargador = CargadorTreeview(self.tree, self.estado_label)
+
+        # Orden, filtro y paginación en SQL
+        self.tabla = TablaPaginada(
+            self.lista_frame,
+            self.tree,
+            Compra.get_pagina,
+            {
+                "ID": "id",
+                "Producto": "producto",
+                "Costo Total": "costo_total",
+                "Cantidad": "cantidad",
+                "Costo Unit": "costo_unitario",
+                "Merma": "merma",
+                "Pérdidas": "perdidas",
+                "Fecha": "fecha",
+            },
+            self.fila_compra,
+            self.ejecutor,
+            self.cargador,
+            etiqueta_filtro="Producto:",
+            al_fallar=self.error_cargar_compras,
+        )
+        self.tabla.barra.grid(
+            row=1, column=0, columnspan=2, pady=(5, 0), sticky=(tk.W, tk.E)
+        )
+
         # Cargar compras iniciales
         self.load_compras()
 
@@ -145,6 +179,7 @@ class ComprasWindow:
         # ========== SECCIÓN DE LISTA ==========
         # Frame para la lista
         lista_frame = ttk.LabelFrame(main_frame, text="Lista de Compras", padding="10")
+        self.lista_frame = lista_frame
         lista_frame.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
 
         # Configurar expansión
@@ -212,6 +247,8 @@ class ComprasWindow:
         ttk.Button(action_frame, text="Cerrar", command=self.root.destroy).pack(
             side=tk.RIGHT, padx=5
         )
+        self.estado_label = ttk.Label(action_frame, text="", foreground="gray")
+        self.estado_label.pack(side=tk.LEFT, padx=10)
 
     def get_fecha_from_selectores(self):
         """Obtiene la fecha desde los selectores y la valida"""
@@ -272,46 +309,33 @@ class ComprasWindow:
         self.producto_entry.focus()
 
     def load_compras(self):
-        """Carga todas las compras en el Treeview"""
-        # Limpiar lista actual
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        try:
-            compras = Compra.get_all()
-
-            if not compras:
-                return
-
-            for compra in compras:
-                # Calcular valores para mostrar (costo unitario y pérdidas)
-                costo_unitario = (
-                    compra.costo_total / compra.cantidad_elementos
-                    if compra.cantidad_elementos > 0
-                    else 0
-                )
-                perdidas = costo_unitario * compra.merma
-
-                self.tree.insert(
-                    "",
-                    tk.END,
-                    values=(
-                        compra.id,
-                        compra.producto_nombre,
-                        f"{compra.costo_total:.2f}",
-                        compra.cantidad_elementos,
-                        f"{costo_unitario:.2f}",
-                        compra.merma,
-                        f"{perdidas:.2f}",
-                        compra.fecha_compra,
-                    ),
-                )
-
-        except Exception as e:
-            print(f"Error al cargar compras: {e}")
-            messagebox.showerror(
-                "Error", f"No se pudieron cargar las compras: {str(e)}"
-            )
+        """Carga la página visible de compras (consulta en segundo plano)"""
+        self.tabla.recargar()
+
+    def error_cargar_compras(self, e):
+        print(f"Error al cargar compras: {e}")
+        messagebox.showerror("Error", f"No se pudieron cargar las compras: {str(e)}")
+
+    def fila_compra(self, compra):
+        """Valores de la fila del Treeview para una compra"""
+        # Calcular valores para mostrar (costo unitario y pérdidas)
+        costo_unitario = (
+            compra.costo_total / compra.cantidad_elementos
+            if compra.cantidad_elementos > 0
+            else 0
+        )
+        perdidas = costo_unitario * compra.merma
+
+        return (
+            compra.id,
+            compra.producto_nombre,
+            f"{compra.costo_total:.2f}",
+            compra.cantidad_elementos,
+            f"{costo_unitario:.2f}",
+            compra.merma,
+            f"{perdidas:.2f}",
+            compra.fecha_compra,
+        )
 
     def on_compra_select(self, event):
         """Cuando se selecciona una compra en la lista"""
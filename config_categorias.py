@@ -4,9 +4,12 @@ Módulo para gestión de Categorías - CRUD completo
 
 import tkinter as tk
 from tkinter import ttk, messagebox
+from carga_treeview import CargadorTreeview
 from database import Categoria
+from instrumentacion import perfilar_ventana
 
 
+@perfilar_ventana
 class CategoriasWindow:
     def __init__(self, root):
         self.root = root
@@ -18,6 +21,7 @@ class CategoriasWindow:
 
         # Crear interfaz
         self.create_widgets()
+        self.cargador = CargadorTreeview(self.tree)
 
         # Cargar categorías iniciales
         self.load_categorias()
@@ -117,15 +121,10 @@ class CategoriasWindow:
 
     def load_categorias(self):
         """Carga todas las categorías en el Treeview"""
-        # Limpiar lista actual
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
         # Obtener y mostrar categorías
         try:
             categorias = Categoria.get_all()
-            for cat in categorias:
-                self.tree.insert("", tk.END, values=(cat.id, cat.nombre))
+            self.cargador.cargar([(cat.id, cat.nombre) for cat in categorias])
         except Exception as e:
             messagebox.showerror(
                 "Error", f"No se pudieron cargar las categorías: {str(e)}"
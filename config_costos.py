@@ -2,11 +2,16 @@
 Módulo para configuración de Costos
 """
 
+import functools
 import tkinter as tk
 from tkinter import ttk, messagebox
+from carga_treeview import CargadorTreeview
 from database import Costo, TipoCosto
+from instrumentacion import perfilar_ventana
+from tabla_paginada import TablaPaginada
 
 
+@perfilar_ventana
 class ConfigCostosWindow:
     def __init__(self, root):
         self.root = root
@@ -20,6 +25,26 @@ class ConfigCostosWindow:
         # Crear interfaz
         self.create_widgets()
 
+        # Orden, filtro y paginación en SQL, una tabla por tipo de costo
+        self.tablas = {}
+        for tipo, frame, tree in [
+            (TipoCosto.FIJO, self.fijo_frame, self.tree_fijos),
+            (TipoCosto.VARIABLE, self.variable_frame, self.tree_variables),
+        ]:
+            tabla = TablaPaginada(
+                frame,
+                tree,
+                functools.partial(Costo.get_pagina, tipo),
+                {"ID": "id", "Nombre": "nombre", "Cantidad": "cantidad"},
+                lambda c: (c.id, c.nombre, f"{c.cantidad:.2f}"),
+                cargador=CargadorTreeview(tree),
+                etiqueta_filtro="Nombre:",
+            )
+            tabla.barra.grid(
+                row=1, column=0, columnspan=2, pady=(5, 0), sticky=(tk.W, tk.E)
+            )
+            self.tablas[tipo] = tabla
+
         # Cargar costos iniciales
         self.load_costos()
 
@@ -215,32 +240,14 @@ class ConfigCostosWindow:
         self.clear_form()
 
     def load_costos(self):
-        """Carga todos los costos en los Treeviews correspondientes"""
-        # Limpiar listas actuales
-        for tree in [self.tree_fijos, self.tree_variables]:
-            for item in tree.get_children():
-                tree.delete(item)
-
+        """Carga la página visible de cada tipo de costo y los totales"""
         try:
-            # Cargar costos fijos
-            costos_fijos = Costo.get_by_tipo(TipoCosto.FIJO)
-            total_fijos = 0.0
-
-            for costo in costos_fijos:
-                self.tree_fijos.insert(
-                    "", tk.END, values=(costo.id, costo.nombre, f"{costo.cantidad:.2f}")
-                )
-                total_fijos += costo.cantidad
-
-            # Cargar costos variables
-            costos_variables = Costo.get_by_tipo(TipoCosto.VARIABLE)
-            total_variables = 0.0
-
-            for costo in costos_variables:
-                self.tree_variables.insert(
-                    "", tk.END, values=(costo.id, costo.nombre, f"{costo.cantidad:.2f}")
-                )
-                total_variables += costo.cantidad
+            for tabla in self.tablas.values():
+                tabla.recargar()
+
+            # Los totales abarcan todos los costos, no solo la página visible
+            total_fijos = Costo.get_total_por_tipo(TipoCosto.FIJO)
+            total_variables = Costo.get_total_por_tipo(TipoCosto.VARIABLE)
 
             # Actualizar totales
             total_general = total_fijos + total_variables
@@ -5,9 +5,23 @@ Módulo para configuración de Semanas
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime, date, timedelta
+from carga_treeview import CargadorTreeview
 from database import Semana
+from instrumentacion import perfilar_ventana
+from tabla_paginada import TablaPaginada
 
+DIAS_SEMANA = [
+    "Lunes",
+    "Martes",
+    "Miércoles",
+    "Jueves",
+    "Viernes",
+    "Sábado",
+    "Domingo",
+]
 
+
+@perfilar_ventana
 class ConfigSemanasWindow:
     def __init__(self, root):
         self.root = root
@@ -19,6 +33,21 @@ class ConfigSemanasWindow:
 
         # Crear interfaz
         self.create_widgets()
+        self.cargador = CargadorTreeview(self.tree, self.estado_label)
+
+        # Orden, filtro y paginación en SQL
+        self.tabla = TablaPaginada(
+            self.lista_frame,
+            self.tree,
+            Semana.get_pagina,
+            {"Fecha Inicio": "fecha_inicio", "Fecha Fin": "fecha_fin", "Días": "dias"},
+            self.fila_semana,
+            cargador=self.cargador,
+            etiqueta_filtro="Inicio (AAAA-MM):",
+        )
+        self.tabla.barra.grid(
+            row=1, column=0, columnspan=2, pady=(5, 0), sticky=(tk.W, tk.E)
+        )
 
         # Cargar semanas iniciales
         self.load_semanas()
@@ -167,12 +196,37 @@ class ConfigSemanasWindow:
             side=tk.LEFT, padx=5
         )
 
+        # Generación del calendario completo para el rango de fechas
+        calendario_frame = ttk.Frame(form_frame)
+        calendario_frame.grid(row=3, column=0, columnspan=4, pady=(15, 0))
+
+        ttk.Label(
+            calendario_frame, text="Generar calendario del rango con inicio en:"
+        ).pack(side=tk.LEFT, padx=(0, 5))
+        self.dia_inicio_combo = ttk.Combobox(
+            calendario_frame, values=DIAS_SEMANA, width=10, state="readonly"
+        )
+        self.dia_inicio_combo.current(0)
+        self.dia_inicio_combo.pack(side=tk.LEFT)
+
+        ttk.Label(calendario_frame, text="Duración:").pack(side=tk.LEFT, padx=(10, 5))
+        self.duracion_var = tk.StringVar(value="7")
+        ttk.Spinbox(
+            calendario_frame, from_=1, to=31, textvariable=self.duracion_var, width=4
+        ).pack(side=tk.LEFT)
+        ttk.Label(calendario_frame, text="días").pack(side=tk.LEFT, padx=(5, 10))
+
+        ttk.Button(
+            calendario_frame, text="Generar Calendario", command=self.generar_calendario
+        ).pack(side=tk.LEFT)
+
         # ========== SECCIÓN DE LISTA ==========
         # Frame para la lista
         lista_frame = ttk.LabelFrame(
             main_frame, text="Semanas Registradas", padding="10"
         )
         lista_frame.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.lista_frame = lista_frame
 
         # Configurar expansión
         lista_frame.columnconfigure(0, weight=1)
@@ -223,6 +277,8 @@ class ConfigSemanasWindow:
         ttk.Button(action_frame, text="Cerrar", command=self.root.destroy).pack(
             side=tk.RIGHT, padx=5
         )
+        self.estado_label = ttk.Label(action_frame, text="", foreground="gray")
+        self.estado_label.pack(side=tk.LEFT, padx=10)
 
     def get_fecha_from_selectores(self, dia_var, mes_var, anio_var):
         """Obtiene la fecha desde los selectores y la valida"""
@@ -288,37 +344,9 @@ class ConfigSemanasWindow:
         self.fin_anio_var.set("")
 
     def load_semanas(self):
-        """Carga todas las semanas en el Treeview"""
-        # Limpiar lista actual
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
+        """Carga la página visible de semanas en el Treeview"""
         try:
-            semanas = Semana.get_all()
-
-            if not semanas:
-                return
-
-            for semana in semanas:
-                # Calcular número de días
-                dias = (semana.fecha_fin - semana.fecha_inicio).days + 1
-
-                # Formatear fechas
-                inicio_str = semana.fecha_inicio.strftime("%d/%m/%Y")
-                fin_str = semana.fecha_fin.strftime("%d/%m/%Y")
-
-                # CAMBIO AQUÍ: Solo mostrar fechas y días, no ID ni número
-                self.tree.insert(
-                    "",
-                    tk.END,
-                    values=(
-                        # semana.id,  # REMOVIDO
-                        # semana.numero,  # REMOVIDO
-                        inicio_str,  # Ahora es columna 0
-                        fin_str,  # Ahora es columna 1
-                        f"{dias} días",  # Ahora es columna 2
-                    ),
-                )
+            self.tabla.recargar()
 
         except Exception as e:
             print(f"Error al cargar semanas: {e}")
@@ -326,6 +354,24 @@ class ConfigSemanasWindow:
                 "Error", f"No se pudieron cargar las semanas: {str(e)}"
             )
 
+    def fila_semana(self, semana):
+        """Valores de la fila del Treeview para una semana"""
+        # Calcular número de días
+        dias = (semana.fecha_fin - semana.fecha_inicio).days + 1
+
+        # Formatear fechas
+        inicio_str = semana.fecha_inicio.strftime("%d/%m/%Y")
+        fin_str = semana.fecha_fin.strftime("%d/%m/%Y")
+
+        # CAMBIO AQUÍ: Solo mostrar fechas y días, no ID ni número
+        return (
+            # semana.id,  # REMOVIDO
+            # semana.numero,  # REMOVIDO
+            inicio_str,  # Ahora es columna 0
+            fin_str,  # Ahora es columna 1
+            f"{dias} días",  # Ahora es columna 2
+        )
+
     def on_semana_select(self, event):
         """Cuando se selecciona una semana en la lista"""
         selection = self.tree.selection()
@@ -396,6 +442,69 @@ class ConfigSemanasWindow:
         except Exception as e:
             messagebox.showerror("Error", f"No se pudo crear la semana: {str(e)}")
 
+    def generar_calendario(self):
+        """Crea todas las semanas del rango de fechas seleccionado"""
+        try:
+            fecha_inicio = self.get_fecha_from_selectores(
+                self.inicio_dia_var, self.inicio_mes_var, self.inicio_anio_var
+            )
+            fecha_fin = self.get_fecha_from_selectores(
+                self.fin_dia_var, self.fin_mes_var, self.fin_anio_var
+            )
+
+            if fecha_inicio is None or fecha_fin is None:
+                messagebox.showwarning(
+                    "Advertencia", "Por favor complete ambas fechas correctamente"
+                )
+                return
+
+            if fecha_inicio > fecha_fin:
+                messagebox.showwarning(
+                    "Advertencia",
+                    "La fecha de inicio debe ser anterior o igual a la fecha de fin",
+                )
+                return
+
+            try:
+                duracion = int(self.duracion_var.get())
+            except ValueError:
+                messagebox.showerror("Error", "La duración debe ser un número entero")
+                return
+
+            if duracion < 1:
+                messagebox.showwarning(
+                    "Advertencia", "La duración debe ser de al menos 1 día"
+                )
+                return
+
+            dia_inicio = self.dia_inicio_combo.current()
+
+            if not messagebox.askyesno(
+                "Confirmar",
+                f"¿Generar semanas de {duracion} días que empiecen los "
+                f"{DIAS_SEMANA[dia_inicio].lower()} entre el "
+                f"{fecha_inicio.strftime('%d/%m/%Y')} y el {fecha_fin.strftime('%d/%m/%Y')}?",
+            ):
+                return
+
+            creadas, omitidas = Semana.generar_calendario(
+                fecha_inicio, fecha_fin, dia_inicio, duracion
+            )
+
+            mensaje = f"Se crearon {len(creadas)} semana(s)."
+            if omitidas:
+                mensaje += (
+                    f"\n{len(omitidas)} semana(s) se omitieron por solaparse "
+                    f"con semanas existentes."
+                )
+            messagebox.showinfo("Éxito", mensaje)
+
+            self.clear_form()
+            self.load_semanas()
+
+        except Exception as e:
+            messagebox.showerror("Error", f"No se pudo generar el calendario: {str(e)}")
+
     def delete_semana(self):
         """Elimina la semana seleccionada"""
         if not self.current_semana:
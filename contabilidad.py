@@ -2,17 +2,38 @@
 Módulo de Contabilidad - Gestión de cuentas y estadísticas
 """
 
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime, date, timedelta
+from carga_treeview import CargadorTreeview
 from database import (
     CuentaCobrar,
     CuentaPagar,
+    copia_reportes,
     get_total_compras_rango,
     get_total_ventas_rango,
 )
+from ejecutor_db import EjecutorDB
+from instrumentacion import perfilar_ventana
+from modelo_combo import ModeloCombo
+from tabla_paginada import TablaPaginada
 
+# Cada cuánto se refresca la copia de solo lectura de los reportes
+INTERVALO_REFRESCO_COPIA_MS = 5 * 60 * 1000
 
+
+def totales_rango(fecha_inicio, fecha_fin):
+    """Totales de compras y ventas del rango (se ejecuta en el hilo de datos)"""
+    return (
+        fecha_inicio,
+        fecha_fin,
+        get_total_compras_rango(fecha_inicio, fecha_fin),
+        get_total_ventas_rango(fecha_inicio, fecha_fin),
+    )
+
+
+@perfilar_ventana
 class ContabilidadWindow:
     def __init__(self, root):
         self.root = root
@@ -27,9 +48,64 @@ class ContabilidadWindow:
         self.fecha_inicio = None
         self.fecha_fin = None
 
+        # Estado de la copia de solo lectura para reportes
+        self.refresco_copia_id = None
+        self.refresco_en_curso = False
+        self.error_refresco = None
+
         # Crear interfaz
         self.create_widgets()
 
+        # Consultas en segundo plano; un nuevo clic en "Calcular" reemplaza al
+        # cálculo anterior que aún no terminó
+        self.ejecutor = EjecutorDB(self.root, self.estado_label)
+
+        # Inserción por lotes en las listas
+        self.cargador_cobrar = CargadorTreeview(self.tree_cobrar, self.estado_label)
+        self.cargador_pagar = CargadorTreeview(self.tree_pagar, self.estado_label)
+        self.cargador_serie = CargadorTreeview(self.tree_serie, self.estado_label)
+
+        # Orden, filtro y paginación en SQL para las listas de cuentas
+        columnas_cuentas = {
+            "ID": "id",
+            "Cantidad": "cantidad",
+            "Descripción": "descripcion",
+        }
+        self.tabla_cobrar = TablaPaginada(
+            self.cobrar_list_frame,
+            self.tree_cobrar,
+            CuentaCobrar.get_pagina,
+            {**columnas_cuentas, "Persona": "nombre"},
+            lambda c: (
+                c.id,
+                c.nombre_persona,
+                f"{c.cantidad:.2f}",
+                c.descripcion or "",
+            ),
+            self.ejecutor,
+            self.cargador_cobrar,
+            etiqueta_filtro="Persona:",
+        )
+        self.tabla_pagar = TablaPaginada(
+            self.pagar_list_frame,
+            self.tree_pagar,
+            CuentaPagar.get_pagina,
+            {**columnas_cuentas, "Proveedor": "nombre"},
+            lambda c: (
+                c.id,
+                c.nombre_proveedor,
+                f"{c.cantidad:.2f}",
+                c.descripcion or "",
+            ),
+            self.ejecutor,
+            self.cargador_pagar,
+            etiqueta_filtro="Proveedor:",
+        )
+        for tabla in (self.tabla_cobrar, self.tabla_pagar):
+            tabla.barra.grid(
+                row=1, column=0, columnspan=2, pady=(5, 0), sticky=(tk.W, tk.E)
+            )
+
         # Cargar datos iniciales
         self.load_cuentas_cobrar()
         self.load_cuentas_pagar()
@@ -109,6 +185,7 @@ class ContabilidadWindow:
 
         # Lista de cuentas por cobrar
         cobrar_list_frame = ttk.Frame(cobrar_frame)
+        self.cobrar_list_frame = cobrar_list_frame
         cobrar_list_frame.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         cobrar_list_frame.columnconfigure(0, weight=1)
         cobrar_list_frame.rowconfigure(0, weight=1)
@@ -196,6 +273,7 @@ class ContabilidadWindow:
 
         # Lista de cuentas por pagar
         pagar_list_frame = ttk.Frame(pagar_frame)
+        self.pagar_list_frame = pagar_list_frame
         pagar_list_frame.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         pagar_list_frame.columnconfigure(0, weight=1)
         pagar_list_frame.rowconfigure(0, weight=1)
@@ -490,12 +568,28 @@ class ContabilidadWindow:
         )
         self.semana_fin_combo.pack(side=tk.LEFT)
 
-        # Botón para calcular
+        # Las tres listas comparten las mismas semanas
+        self.modelo_semanas = ModeloCombo(
+            lambda s: f"Semana: {s.fecha_inicio.strftime('%d/%m/%Y')} - {s.fecha_fin.strftime('%d/%m/%Y')}",
+            self.semana_unica_combo,
+            self.semana_inicio_combo,
+            self.semana_fin_combo,
+        )
+
+        # Botones para calcular
+        margen_buttons_frame = ttk.Frame(selector_frame)
+        margen_buttons_frame.grid(row=2, column=0, columnspan=2, pady=(15, 0))
+
         ttk.Button(
-            selector_frame,
+            margen_buttons_frame,
             text="Calcular Margen Neto",
             command=self.calcular_margen_neto,
-        ).grid(row=2, column=0, columnspan=2, pady=(15, 0))
+        ).pack(side=tk.LEFT, padx=5)
+        ttk.Button(
+            margen_buttons_frame,
+            text="Ver Serie Semanal",
+            command=self.calcular_serie_margen,
+        ).pack(side=tk.LEFT, padx=5)
 
         # ===== RESULTADOS =====
         resultados_frame = ttk.LabelFrame(
@@ -566,6 +660,51 @@ class ContabilidadWindow:
         )
         nota_label.pack(pady=10)
 
+        # ===== SERIE SEMANAL =====
+        serie_frame = ttk.LabelFrame(
+            margen_frame, text="Serie Semanal del Margen Neto", padding="10"
+        )
+        serie_frame.grid(row=2, column=0, pady=(10, 0), sticky=(tk.W, tk.E, tk.N, tk.S))
+        serie_frame.columnconfigure(0, weight=1)
+        serie_frame.columnconfigure(2, weight=1)
+        serie_frame.rowconfigure(0, weight=1)
+
+        columns = ("Semana", "Ventas", "Costos Fijos", "Costos Variables", "Margen")
+        self.tree_serie = ttk.Treeview(
+            serie_frame, columns=columns, show="headings", height=6
+        )
+
+        column_configs = [
+            ("Semana", 170, "center"),
+            ("Ventas", 90, "e"),
+            ("Costos Fijos", 90, "e"),
+            ("Costos Variables", 110, "e"),
+            ("Margen", 90, "e"),
+        ]
+
+        for col_name, width, anchor in column_configs:
+            self.tree_serie.heading(col_name, text=col_name)
+            self.tree_serie.column(col_name, width=width, anchor=anchor)
+
+        scrollbar_serie = ttk.Scrollbar(
+            serie_frame, orient=tk.VERTICAL, command=self.tree_serie.yview
+        )
+        self.tree_serie.configure(yscrollcommand=scrollbar_serie.set)
+
+        self.tree_serie.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        scrollbar_serie.grid(row=0, column=1, sticky=(tk.N, tk.S))
+
+        # Gráfico de barras del margen neto por semana
+        self.serie_canvas = tk.Canvas(
+            serie_frame, height=150, background="white", highlightthickness=0
+        )
+        self.serie_canvas.grid(
+            row=0, column=2, padx=(10, 0), sticky=(tk.W, tk.E, tk.N, tk.S)
+        )
+        self.serie_canvas.bind("<Configure>", lambda e: self.dibujar_grafico_serie())
+
+        self.serie_datos = []
+
         # Cargar semanas en los comboboxes
         self.cargar_semanas_comboboxes()
 
@@ -573,7 +712,79 @@ class ContabilidadWindow:
         close_frame = ttk.Frame(main_frame)
         close_frame.grid(row=1, column=0, pady=(10, 0))
 
-        ttk.Button(close_frame, text="Cerrar", command=self.root.destroy).pack()
+        # Reportes desde una copia de solo lectura (no bloquea a Ventas/Compras)
+        self.usar_copia_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            close_frame,
+            text="Calcular reportes sobre una copia de solo lectura",
+            variable=self.usar_copia_var,
+            command=self.cambiar_copia_reportes,
+        ).pack(side=tk.LEFT, padx=5)
+        self.copia_label = ttk.Label(close_frame, text="", font=("Arial", 9))
+        self.copia_label.pack(side=tk.LEFT, padx=(0, 20))
+        self.estado_label = ttk.Label(close_frame, text="", foreground="gray")
+        self.estado_label.pack(side=tk.LEFT, padx=(0, 20))
+
+        ttk.Button(close_frame, text="Cerrar", command=self.root.destroy).pack(
+            side=tk.LEFT
+        )
+
+    # ========== COPIA DE SOLO LECTURA PARA REPORTES ==========
+
+    def cambiar_copia_reportes(self):
+        """Activa o desactiva los reportes sobre la copia de solo lectura"""
+        if self.usar_copia_var.get():
+            self.refrescar_copia_reportes()
+        else:
+            copia_reportes.desactivar()
+            if self.refresco_copia_id:
+                self.root.after_cancel(self.refresco_copia_id)
+                self.refresco_copia_id = None
+            self.copia_label.config(text="")
+
+    def refrescar_copia_reportes(self):
+        """Refresca la copia en segundo plano y programa el próximo refresco"""
+        self.refresco_copia_id = None
+        if self.refresco_en_curso:
+            return
+
+        self.refresco_en_curso = True
+        self.error_refresco = None
+        self.copia_label.config(text="Actualizando copia...")
+
+        def trabajo():
+            try:
+                copia_reportes.refrescar()
+            except Exception as e:
+                self.error_refresco = e
+            finally:
+                self.refresco_en_curso = False
+
+        threading.Thread(target=trabajo, daemon=True).start()
+        self.root.after(200, self.esperar_refresco_copia)
+
+    def esperar_refresco_copia(self):
+        """Comprueba desde el hilo de Tk si terminó el refresco de la copia"""
+        if self.refresco_en_curso:
+            self.root.after(200, self.esperar_refresco_copia)
+            return
+
+        if not self.usar_copia_var.get():
+            return
+
+        if self.error_refresco:
+            copia_reportes.desactivar()
+            self.usar_copia_var.set(False)
+            self.copia_label.config(text="")
+            messagebox.showerror("Error", str(self.error_refresco))
+            return
+
+        copia_reportes.activar()
+        hora = copia_reportes.ultima_actualizacion.strftime("%H:%M:%S")
+        self.copia_label.config(text=f"Copia de las {hora}")
+        self.refresco_copia_id = self.root.after(
+            INTERVALO_REFRESCO_COPIA_MS, self.refrescar_copia_reportes
+        )
 
     # ========== MÉTODOS PARA CUENTAS POR COBRAR ==========
 
@@ -591,26 +802,10 @@ class ContabilidadWindow:
 
     def load_cuentas_cobrar(self):
         """Carga todas las cuentas por cobrar en el Treeview"""
-        # Limpiar lista actual
-        for item in self.tree_cobrar.get_children():
-            self.tree_cobrar.delete(item)
-
         try:
-            cuentas = CuentaCobrar.get_all()
-            total = 0.0
-
-            for cuenta in cuentas:
-                self.tree_cobrar.insert(
-                    "",
-                    tk.END,
-                    values=(
-                        cuenta.id,
-                        cuenta.nombre_persona,
-                        f"{cuenta.cantidad:.2f}",
-                        cuenta.descripcion or "",
-                    ),
-                )
-                total += cuenta.cantidad
+            self.tabla_cobrar.recargar()
+            # El total abarca todas las cuentas, no solo la página visible
+            total = CuentaCobrar.get_total()
 
             self.total_cobrar_label.config(text=f"Total por Cobrar: ${total:.2f}")
 
@@ -749,26 +944,10 @@ class ContabilidadWindow:
 
     def load_cuentas_pagar(self):
         """Carga todas las cuentas por pagar en el Treeview"""
-        # Limpiar lista actual
-        for item in self.tree_pagar.get_children():
-            self.tree_pagar.delete(item)
-
         try:
-            cuentas = CuentaPagar.get_all()
-            total = 0.0
-
-            for cuenta in cuentas:
-                self.tree_pagar.insert(
-                    "",
-                    tk.END,
-                    values=(
-                        cuenta.id,
-                        cuenta.nombre_proveedor,
-                        f"{cuenta.cantidad:.2f}",
-                        cuenta.descripcion or "",
-                    ),
-                )
-                total += cuenta.cantidad
+            self.tabla_pagar.recargar()
+            # El total abarca todas las cuentas, no solo la página visible
+            total = CuentaPagar.get_total()
 
             self.total_pagar_label.config(text=f"Total por Pagar: ${total:.2f}")
 
@@ -933,32 +1112,45 @@ class ContabilidadWindow:
                 )
                 return
 
-            # Calcular totales
-            total_compras = get_total_compras_rango(fecha_inicio, fecha_fin)
-            total_ventas = get_total_ventas_rango(fecha_inicio, fecha_fin)
-            balance = total_ventas - total_compras
-
-            # Actualizar etiquetas
-            self.total_compras_label.config(text=f"Total Compras: ${total_compras:.2f}")
-            self.total_ventas_label.config(text=f"Total Ventas: ${total_ventas:.2f}")
-
-            # Determinar color del balance
-            balance_color = "green" if balance >= 0 else "red"
-            self.balance_label.config(
-                text=f"Balance (Ventas - Compras): ${balance:.2f}",
-                foreground=balance_color,
-            )
-
-            # Mostrar rango de fechas en el título
-            self.notebook.tab(
-                1,
-                text=f"Estadísticas ({fecha_inicio.strftime('%d/%m/%Y')} - {fecha_fin.strftime('%d/%m/%Y')})",
+            # Calcular totales en segundo plano
+            self.ejecutor.enviar(
+                totales_rango,
+                fecha_inicio,
+                fecha_fin,
+                al_terminar=self.mostrar_estadisticas,
+                al_fallar=self.error_estadisticas,
+                clave="estadisticas",
             )
 
         except Exception as e:
-            messagebox.showerror(
-                "Error", f"No se pudieron calcular las estadísticas: {str(e)}"
-            )
+            self.error_estadisticas(e)
+
+    def mostrar_estadisticas(self, resultado):
+        """Muestra los totales calculados por calcular_estadisticas"""
+        fecha_inicio, fecha_fin, total_compras, total_ventas = resultado
+        balance = total_ventas - total_compras
+
+        # Actualizar etiquetas
+        self.total_compras_label.config(text=f"Total Compras: ${total_compras:.2f}")
+        self.total_ventas_label.config(text=f"Total Ventas: ${total_ventas:.2f}")
+
+        # Determinar color del balance
+        balance_color = "green" if balance >= 0 else "red"
+        self.balance_label.config(
+            text=f"Balance (Ventas - Compras): ${balance:.2f}",
+            foreground=balance_color,
+        )
+
+        # Mostrar rango de fechas en el título
+        self.notebook.tab(
+            1,
+            text=f"Estadísticas ({fecha_inicio.strftime('%d/%m/%Y')} - {fecha_fin.strftime('%d/%m/%Y')})",
+        )
+
+    def error_estadisticas(self, e):
+        messagebox.showerror(
+            "Error", f"No se pudieron calcular las estadísticas: {str(e)}"
+        )
 
     # ========== MÉTODOS ADICIONALES ==========
 
@@ -967,26 +1159,12 @@ class ContabilidadWindow:
         try:
             from database import Semana
 
-            semanas = Semana.get_all()
-
-            if semanas:
-                semanas_info = []
-                for semana in semanas:
-                    # CAMBIO AQUÍ: Formato "Semana: DD/MM/YYYY - DD/MM/YYYY"
-                    info = f"Semana: {semana.fecha_inicio.strftime('%d/%m/%Y')} - {semana.fecha_fin.strftime('%d/%m/%Y')}"  # CAMBIADO
-                    semanas_info.append((semana.id, info))
-
-                semanas_values = [info for _, info in semanas_info]
-
-                # Cargar en ambos comboboxes
-                self.semana_unica_combo["values"] = semanas_values
-                self.semana_inicio_combo["values"] = semanas_values
-                self.semana_fin_combo["values"] = semanas_values
+            self.modelo_semanas.cargar(Semana.get_all())
 
-                if semanas_values:
-                    self.semana_unica_combo.current(0)
-                    self.semana_inicio_combo.current(0)
-                    self.semana_fin_combo.current(min(1, len(semanas_values) - 1))
+            self.modelo_semanas.seleccionar_indice(self.semana_unica_combo, 0)
+            # Las semanas vienen de la más reciente a la más antigua
+            self.modelo_semanas.seleccionar_indice(self.semana_inicio_combo, 1)
+            self.modelo_semanas.seleccionar_indice(self.semana_fin_combo, 0)
 
         except Exception as e:
             print(f"Error al cargar semanas: {e}")
@@ -1002,19 +1180,8 @@ class ContabilidadWindow:
 
     def get_semana_id_from_combo_text(self, combo_text):
         """Obtiene el ID de semana desde el texto del combobox"""
-        try:
-            from database import Semana
-
-            semanas = Semana.get_all()
-
-            for semana in semanas:
-                # CAMBIO AQUÍ: Coincidir con el nuevo formato
-                info = f"Semana: {semana.fecha_inicio.strftime('%d/%m/%Y')} - {semana.fecha_fin.strftime('%d/%m/%Y')}"  # CAMBIADO
-                if info == combo_text:
-                    return semana.id
-            return None
-        except:
-            return None
+        semana = self.modelo_semanas.registro_de_texto(combo_text)
+        return semana.id if semana else None
 
     def calcular_margen_neto(self):
         """Calcula el margen neto según la selección"""
@@ -1023,8 +1190,7 @@ class ContabilidadWindow:
 
             if self.tipo_periodo_var.get() == "semana":
                 # Una semana
-                semana_text = self.semana_unica_combo.get()
-                semana_id = self.get_semana_id_from_combo_text(semana_text)
+                semana_id = self.modelo_semanas.get_id(self.semana_unica_combo)
 
                 if not semana_id:
                     messagebox.showwarning(
@@ -1032,48 +1198,56 @@ class ContabilidadWindow:
                     )
                     return
 
-                resultado = get_margen_neto_semana(semana_id)
-
-                if resultado:
-                    self.mostrar_resultados_margen(resultado)
-                else:
-                    messagebox.showwarning(
-                        "Información", "No hay datos para calcular el margen neto"
-                    )
+                self.ejecutor.enviar(
+                    get_margen_neto_semana,
+                    semana_id,
+                    al_terminar=self.mostrar_margen_calculado,
+                    al_fallar=self.error_margen_neto,
+                    clave="margen",
+                )
 
             else:
                 # Rango de semanas
-                inicio_text = self.semana_inicio_combo.get()
-                fin_text = self.semana_fin_combo.get()
-
-                semana_inicio_id = self.get_semana_id_from_combo_text(inicio_text)
-                semana_fin_id = self.get_semana_id_from_combo_text(fin_text)
+                semana_inicio = self.modelo_semanas.registro(self.semana_inicio_combo)
+                semana_fin = self.modelo_semanas.registro(self.semana_fin_combo)
 
-                if not semana_inicio_id or not semana_fin_id:
+                if not semana_inicio or not semana_fin:
                     messagebox.showwarning("Advertencia", "Seleccione semanas válidas")
                     return
 
-                if semana_inicio_id > semana_fin_id:
+                # Comparar por fechas: los IDs no siguen el orden cronológico
+                # si las semanas se crearon fuera de orden
+                if semana_inicio.fecha_inicio > semana_fin.fecha_fin:
                     messagebox.showwarning(
                         "Advertencia",
                         "La semana inicio debe ser anterior a la semana fin",
                     )
                     return
 
-                resultado = get_margen_neto_rango(semana_inicio_id, semana_fin_id)
-
-                if resultado:
-                    self.mostrar_resultados_margen(resultado)
-                else:
-                    messagebox.showwarning(
-                        "Información", "No hay datos para calcular el margen neto"
-                    )
+                self.ejecutor.enviar(
+                    get_margen_neto_rango,
+                    semana_inicio.fecha_inicio,
+                    semana_fin.fecha_fin,
+                    al_terminar=self.mostrar_margen_calculado,
+                    al_fallar=self.error_margen_neto,
+                    clave="margen",
+                )
 
         except Exception as e:
-            messagebox.showerror(
-                "Error", f"No se pudo calcular el margen neto: {str(e)}"
+            self.error_margen_neto(e)
+
+    def mostrar_margen_calculado(self, resultado):
+        """Recibe el resultado de calcular_margen_neto"""
+        if resultado:
+            self.mostrar_resultados_margen(resultado)
+        else:
+            messagebox.showwarning(
+                "Información", "No hay datos para calcular el margen neto"
             )
 
+    def error_margen_neto(self, e):
+        messagebox.showerror("Error", f"No se pudo calcular el margen neto: {str(e)}")
+
     def mostrar_resultados_margen(self, resultado):
         """Muestra los resultados del cálculo de margen neto"""
         try:
@@ -1121,6 +1295,108 @@ class ContabilidadWindow:
         except Exception as e:
             print(f"Error al mostrar resultados: {e}")
 
+    def calcular_serie_margen(self):
+        """Calcula el margen neto semana a semana para el período seleccionado"""
+        try:
+            from database import get_margen_neto_serie
+
+            if self.tipo_periodo_var.get() == "semana":
+                semana_inicio = semana_fin = self.modelo_semanas.registro(
+                    self.semana_unica_combo
+                )
+            else:
+                semana_inicio = self.modelo_semanas.registro(self.semana_inicio_combo)
+                semana_fin = self.modelo_semanas.registro(self.semana_fin_combo)
+
+            if not semana_inicio or not semana_fin:
+                messagebox.showwarning("Advertencia", "Seleccione semanas válidas")
+                return
+
+            if semana_inicio.fecha_inicio > semana_fin.fecha_fin:
+                messagebox.showwarning(
+                    "Advertencia",
+                    "La semana inicio debe ser anterior a la semana fin",
+                )
+                return
+
+            self.ejecutor.enviar(
+                get_margen_neto_serie,
+                semana_inicio.fecha_inicio,
+                semana_fin.fecha_fin,
+                al_terminar=self.mostrar_serie_calculada,
+                al_fallar=self.error_serie_margen,
+                clave="serie",
+            )
+
+        except Exception as e:
+            self.error_serie_margen(e)
+
+    def mostrar_serie_calculada(self, serie):
+        """Recibe el resultado de calcular_serie_margen"""
+        self.serie_datos = serie
+        self.mostrar_serie_margen()
+
+        if not self.serie_datos:
+            messagebox.showwarning(
+                "Información", "No hay semanas en el período seleccionado"
+            )
+
+    def error_serie_margen(self, e):
+        messagebox.showerror("Error", f"No se pudo calcular la serie semanal: {str(e)}")
+
+    def mostrar_serie_margen(self):
+        """Muestra la serie semanal en la tabla y en el gráfico"""
+        self.cargador_serie.cargar(
+            [
+                (
+                    f"{semana['fecha_inicio'].strftime('%d/%m/%Y')} - {semana['fecha_fin'].strftime('%d/%m/%Y')}",
+                    f"{semana['total_ventas']:.2f}",
+                    f"{semana['costos_fijos_semanales']:.2f}",
+                    f"{semana['costos_variables']:.2f}",
+                    f"{semana['margen_neto']:.2f}",
+                )
+                for semana in self.serie_datos
+            ]
+        )
+
+        self.dibujar_grafico_serie()
+
+    def dibujar_grafico_serie(self):
+        """Dibuja un gráfico de barras con el margen neto de cada semana"""
+        canvas = self.serie_canvas
+        canvas.delete("all")
+
+        if not self.serie_datos:
+            return
+
+        ancho = canvas.winfo_width()
+        alto = canvas.winfo_height()
+        margen = 10
+
+        valores = [semana["margen_neto"] for semana in self.serie_datos]
+        maximo = max(max(valores), 0)
+        minimo = min(min(valores), 0)
+        rango = (maximo - minimo) or 1
+
+        # Línea del cero
+        escala = (alto - 2 * margen) / rango
+        y_cero = margen + maximo * escala
+        canvas.create_line(margen, y_cero, ancho - margen, y_cero, fill="gray")
+
+        ancho_barra = (ancho - 2 * margen) / len(valores)
+        for i, valor in enumerate(valores):
+            x0 = margen + i * ancho_barra
+            x1 = x0 + max(ancho_barra - 2, 1)
+            y = y_cero - valor * escala
+            canvas.create_rectangle(
+                x0,
+                min(y, y_cero),
+                x1,
+                max(y, y_cero),
+                fill="green" if valor >= 0 else "red",
+                outline="",
+            )
+
 
 def main():
     root = tk.Tk()
@@ -2,23 +2,188 @@
 Configuración de la base de datos y modelos de la aplicación
 """
 
+import asyncio
+import bisect
+import functools
+import os
+import queue
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from enum import Enum
 from typing import List, Optional, Tuple
 from dataclasses import dataclass
 
+import instrumentacion
+
+# Entidades del índice de búsqueda: (tabla, código, entidad, columnas titulo,
+# descripcion y fecha). El rowid de cada entrada es id * 4 + código, de modo
+# que los triggers modifican la entrada de una fila por rowid.
+ENTIDADES_BUSQUEDA = [
+    ("productos", 0, "producto", "nombre", None, None),
+    ("compras", 1, "compra", "producto_nombre", None, "fecha_compra"),
+    ("cuentas_cobrar", 2, "cobrar", "nombre_persona", "descripcion", "fecha_creacion"),
+    ("cuentas_pagar", 3, "pagar", "nombre_proveedor", "descripcion", "fecha_creacion"),
+]
+
+
+def _sentencias_busqueda():
+    """Tabla FTS5 de búsqueda global, su carga inicial y los triggers de cada tabla"""
+    sentencias = [
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS busqueda USING fts5(
+            entidad UNINDEXED,
+            titulo,
+            descripcion,
+            fecha UNINDEXED,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+        """
+    ]
+    for tabla, codigo, entidad, *columnas in ENTIDADES_BUSQUEDA:
+        rowid = f"id * 4 + {codigo}"
+        valores = ", ".join(c or "NULL" for c in columnas)
+        nuevos = ", ".join(f"new.{c}" if c else "NULL" for c in columnas)
+        asignaciones = ", ".join(
+            f"{campo} = new.{c}"
+            for campo, c in zip(("titulo", "descripcion", "fecha"), columnas)
+            if c
+        )
+        sentencias += [
+            f"""
+            INSERT INTO busqueda(rowid, entidad, titulo, descripcion, fecha)
+            SELECT {rowid}, '{entidad}', {valores} FROM {tabla}
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {tabla}_busqueda_ai AFTER INSERT ON {tabla}
+            BEGIN
+                INSERT INTO busqueda(rowid, entidad, titulo, descripcion, fecha)
+                VALUES (new.{rowid}, '{entidad}', {nuevos});
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {tabla}_busqueda_ad AFTER DELETE ON {tabla}
+            BEGIN
+                DELETE FROM busqueda WHERE rowid = old.{rowid};
+            END
+            """,
+            # Solo las columnas indexadas: actualizar el inventario no toca el índice
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {tabla}_busqueda_au
+            AFTER UPDATE OF {", ".join(c for c in columnas if c)} ON {tabla}
+            BEGIN
+                UPDATE busqueda SET {asignaciones} WHERE rowid = old.{rowid};
+            END
+            """,
+        ]
+    return sentencias
+
+
+# Migraciones del esquema: (versión, sentencias). Se aplican en orden, una sola
+# vez por base de datos, y cada una deja PRAGMA user_version en su versión.
+MIGRACIONES = [
+    (
+        1,
+        [
+            # Redundantes: prefijos de otros índices o de UNIQUE(fecha_inicio, fecha_fin)
+            "DROP INDEX IF EXISTS idx_semanas_inicio",
+            "DROP INDEX IF EXISTS idx_semanas_fechas",
+            "DROP INDEX IF EXISTS idx_ventas_semana",
+            "DROP INDEX IF EXISTS idx_costos_tipo",
+            # Cubrientes para las sumas por rango de fechas, semana y tipo
+            "CREATE INDEX IF NOT EXISTS idx_compras_fecha_costo ON compras(fecha_compra, costo_total)",
+            "CREATE INDEX IF NOT EXISTS idx_ventas_semana_monto ON ventas(semana_id, monto)",
+            "CREATE INDEX IF NOT EXISTS idx_costos_tipo_cantidad ON costos(tipo, cantidad)",
+        ],
+    ),
+    # Búsqueda de texto completo en productos, compras y cuentas
+    (2, _sentencias_busqueda()),
+    (
+        3,
+        [
+            # Búsqueda por prefijo del nombre (sin distinguir mayúsculas) y
+            # orden alfabético de la lista de productos
+            "CREATE INDEX IF NOT EXISTS idx_productos_nombre ON productos(nombre COLLATE NOCASE)",
+        ],
+    ),
+    (
+        4,
+        [
+            # Código de barras o SKU: búsqueda exacta al vender por escaneo.
+            # Índice parcial: los productos sin código no ocupan entradas.
+            "ALTER TABLE productos ADD COLUMN codigo TEXT",
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_productos_codigo ON productos(codigo) WHERE codigo IS NOT NULL",
+        ],
+    ),
+    (
+        5,
+        [
+            # Ventas individuales del mostrador: solo se agregan filas al final
+            # (sin índices secundarios ni claves foráneas que verificar)
+            """
+            CREATE TABLE IF NOT EXISTS transacciones_venta (
+                id INTEGER PRIMARY KEY,
+                fecha_hora TEXT NOT NULL,
+                producto_id INTEGER NOT NULL,
+                cantidad INTEGER NOT NULL,
+                monto REAL NOT NULL
+            )
+            """,
+            # Último id procesado por cada proceso por lotes (marca de agua)
+            """
+            CREATE TABLE IF NOT EXISTS marcas_procesamiento (
+                proceso TEXT PRIMARY KEY,
+                ultimo_id INTEGER NOT NULL
+            )
+            """,
+        ],
+    ),
+]
+
+# Bases de datos ya inicializadas en este proceso (se omite init_database)
+_bases_inicializadas = set()
+
 
 class Database:
-    def __init__(self):
-        self.db_path = Path(__file__).parent / "app_database.db"
-        self.init_database()
-        self.ensure_default_categoria()
+    # Ruta por defecto del archivo de base de datos. Puede cambiarse con la
+    # variable de entorno SISTEMA_GESTION_DB (útil para benchmarks y pruebas).
+    db_path_por_defecto = Path(
+        os.environ.get("SISTEMA_GESTION_DB", Path(__file__).parent / "app_database.db")
+    )
+
+    def __init__(self, db_path=None):
+        self.db_path = Path(db_path or Database.db_path_por_defecto)
+        # Crear tablas y migrar solo la primera vez por proceso
+        clave = self.db_path.resolve()
+        if clave not in _bases_inicializadas or not self.db_path.exists():
+            self.init_database()
+            self.ensure_default_categoria()
+            _bases_inicializadas.add(clave)
 
     def get_connection(self):
         """Obtiene una conexión a la base de datos"""
-        conn = sqlite3.connect(self.db_path)
+        # En un hilo del acceso asíncrono se reutiliza la conexión prestada por
+        # el pool, salvo que tenga una transacción abierta (llamada anidada)
+        prestada = getattr(_prestamo, "conn", None)
+        if (
+            prestada is not None
+            and _prestamo.ruta == self.db_path.resolve()
+            and not prestada.in_transaction
+        ):
+            return prestada
+        return self.nueva_conexion()
+
+    def nueva_conexion(self, clase=None, check_same_thread=True):
+        """Abre una conexión nueva con la configuración de la aplicación"""
+        # La fábrica es una conexión instrumentada si el perfilado SQL está activo
+        conn = sqlite3.connect(
+            self.db_path,
+            factory=clase or instrumentacion.fabrica_conexion(),
+            check_same_thread=check_same_thread,
+        )
         # Habilitar foreign keys
         conn.execute("PRAGMA foreign_keys = ON")
         return conn
@@ -28,6 +193,9 @@ class Database:
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
+            # Solo tiene efecto en una base de datos nueva (ver mantenimiento.py)
+            cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
             # Tabla de categorías
             cursor.execute(
                 """
@@ -141,19 +309,12 @@ class Database:
             cursor.execute(
                 "CREATE INDEX IF NOT EXISTS idx_compras_producto ON compras(producto_nombre)"
             )
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_semanas_inicio ON semanas(fecha_inicio)"
-            )
             cursor.execute(
                 "CREATE INDEX IF NOT EXISTS idx_semanas_fin ON semanas(fecha_fin)"
             )
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_costos_tipo ON costos(tipo)")
             cursor.execute(
                 "CREATE INDEX IF NOT EXISTS idx_costos_nombre ON costos(nombre)"
             )
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_ventas_semana ON ventas(semana_id)"
-            )
             cursor.execute(
                 "CREATE INDEX IF NOT EXISTS idx_ventas_producto ON ventas(producto_id)"
             )
@@ -166,15 +327,43 @@ class Database:
             cursor.execute(
                 "CREATE INDEX IF NOT EXISTS idx_pagar_nombre ON cuentas_pagar(nombre_proveedor)"
             )
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_compras_fecha ON compras(fecha_compra)"
-            )
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_semanas_fechas ON semanas(fecha_inicio, fecha_fin)"
-            )
+
+            self.aplicar_migraciones(conn)
 
             conn.commit()
 
+    def aplicar_migraciones(self, conn):
+        """
+        Aplica las migraciones pendientes según PRAGMA user_version
+
+        Varios procesos pueden abrir a la vez una base de datos sin migrar
+        (main.py abre cada módulo como un proceso): cada migración toma el
+        bloqueo de escritura y vuelve a leer la versión, de modo que solo un
+        proceso la aplica.
+        """
+        if conn.in_transaction:
+            conn.commit()
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for numero, sentencias in MIGRACIONES:
+            if numero <= version:
+                continue
+            try:
+                # Cada migración es atómica (el DDL no abre transacción solo)
+                conn.execute("BEGIN IMMEDIATE")
+                version = conn.execute("PRAGMA user_version").fetchone()[0]
+                if numero <= version:
+                    # Otro proceso la aplicó mientras se esperaba el bloqueo
+                    conn.rollback()
+                    continue
+                for sentencia in sentencias:
+                    conn.execute(sentencia)
+                # PRAGMA no admite parámetros; numero es una constante del módulo
+                conn.execute(f"PRAGMA user_version = {numero}")
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                raise Exception(f"Error al aplicar la migración {numero}: {str(e)}")
+
     def ensure_default_categoria(self):
         """Asegura que exista una categoría por defecto 'Sin Categoría'"""
         try:
@@ -209,6 +398,130 @@ class Database:
             return None
 
 
+# Filas por página de las listas paginadas
+TAMANO_PAGINA = 200
+
+
+class ConsultaPaginada:
+    """
+    Consulta de una lista con orden, filtro y paginación resueltos en SQL
+
+    La ventana pide solo la página visible (LIMIT/OFFSET) en el orden de la
+    columna elegida, en lugar de traer todas las filas y ordenarlas en Tk. El
+    filtro es un prefijo sin distinguir mayúsculas (LIKE 'texto%') sobre una
+    columna; cuando se ordena por esa misma columna indexada, SQLite recorre
+    el índice en orden y se detiene al completar la página.
+
+    Las columnas de orden se eligen de un diccionario fijo, por lo que nunca
+    se concatena texto del usuario en el SQL.
+
+    Los get_pagina de los modelos propagan los errores en lugar de devolver
+    una página vacía: TablaPaginada los muestra (ver su al_fallar).
+    """
+
+    def __init__(
+        self,
+        desde: str,
+        columnas: str,
+        ordenables: dict,
+        orden: str,
+        descendente: bool = False,
+        filtro: str = None,
+        desempate: str = "id",
+        desde_sin_filtro: str = None,
+    ):
+        """
+        Args:
+            desde: tabla (o JOIN) de la cláusula FROM
+            columnas: lista de columnas del SELECT
+            ordenables: clave de orden -> expresión SQL
+            orden: clave de orden por defecto
+            filtro: expresión SQL sobre la que se aplica el prefijo
+            desempate: columna única que completa el orden (páginas estables)
+            desde_sin_filtro: FROM para contar cuando no hay filtro; evita
+                recorrer los JOIN que las claves foráneas ya garantizan
+        """
+        self.desde = desde
+        self.desde_sin_filtro = desde_sin_filtro or desde
+        self.columnas = columnas
+        self.ordenables = ordenables
+        self.orden = orden
+        self.descendente = descendente
+        self.filtro = filtro
+        self.desempate = desempate
+
+    def construir(self, orden=None, descendente=None, filtro="", condicion=None):
+        """
+        Sentencias de la página y del total, y los parámetros del WHERE
+
+        Returns:
+            tuple: (sql_pagina, sql_total, parametros); sql_pagina espera además
+            LIMIT y OFFSET al final de los parámetros
+        """
+        orden = orden if orden in self.ordenables else self.orden
+        if descendente is None:
+            descendente = self.descendente
+        direccion = "DESC" if descendente else "ASC"
+
+        condiciones, parametros = [], []
+        if condicion:
+            condiciones.append(condicion)
+        if filtro and self.filtro:
+            escapado = (
+                filtro.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            )
+            condiciones.append(f"{self.filtro} LIKE ? ESCAPE '\\'")
+            parametros.append(f"{escapado}%")
+        where = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+
+        sql_pagina = (
+            f"SELECT {self.columnas} FROM {self.desde} {where} "
+            f"ORDER BY {self.ordenables[orden]} {direccion}, "
+            f"{self.desempate} {direccion} LIMIT ? OFFSET ?"
+        )
+        desde_total = self.desde if condiciones else self.desde_sin_filtro
+        sql_total = f"SELECT COUNT(*) FROM {desde_total} {where}"
+        return sql_pagina, sql_total, parametros
+
+    def pagina(
+        self,
+        orden=None,
+        descendente=None,
+        filtro="",
+        limite=TAMANO_PAGINA,
+        offset=0,
+        condicion=None,
+        parametros_condicion=(),
+    ) -> Tuple[list, int]:
+        """
+        Ejecuta la consulta de una página
+
+        Returns:
+            tuple: (filas de la página, total de filas que cumplen el filtro)
+        """
+        sql_pagina, sql_total, parametros = self.construir(
+            orden, descendente, filtro, condicion
+        )
+        parametros = list(parametros_condicion) + parametros
+        with Database().get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql_total, parametros)
+            total = cursor.fetchone()[0]
+            cursor.execute(sql_pagina, parametros + [limite, offset])
+            return cursor.fetchall(), total
+
+
+def _siguiente_prefijo(prefijo: str) -> str:
+    """
+    Menor texto mayor que todos los que empiezan con el prefijo según NOCASE
+
+    NOCASE solo iguala mayúsculas y minúsculas ASCII: se pasa el prefijo a
+    minúsculas ASCII y se incrementa su último carácter.
+    """
+    minusculas = "".join(c.lower() if "A" <= c <= "Z" else c for c in prefijo)
+    return minusculas[:-1] + chr(ord(minusculas[-1]) + 1)
+
+
 class Categoria:
     """Modelo para la tabla Categorias"""
 
@@ -352,7 +665,9 @@ class Categoria:
 class Producto:
     """Modelo para la tabla Productos"""
 
-    def __init__(self, nombre, categoria_id, costo, precio_venta, cantidad, id=None):
+    def __init__(
+        self, nombre, categoria_id, costo, precio_venta, cantidad, id=None, codigo=None
+    ):
         self.id = id
         self.nombre = nombre
         self.categoria_id = categoria_id
@@ -360,6 +675,8 @@ class Producto:
         self.precio_venta = precio_venta
         self.cantidad = cantidad
         self.margen_bruto = precio_venta - costo
+        # Código de barras o SKU (opcional, único entre los productos)
+        self.codigo = codigo or None
 
     @staticmethod
     def calcular_margen(costo, precio_venta):
@@ -379,8 +696,8 @@ class Producto:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
-                    SELECT id, nombre, categoria_id, costo, precio_venta, cantidad 
-                    FROM productos ORDER BY nombre
+                    SELECT id, nombre, categoria_id, costo, precio_venta, cantidad, codigo
+                    FROM productos ORDER BY nombre COLLATE NOCASE
                 """
                 )
                 rows = cursor.fetchall()
@@ -391,6 +708,7 @@ class Producto:
                         costo=row[3],
                         precio_venta=row[4],
                         cantidad=row[5],
+                        codigo=row[6],
                         id=row[0],
                     )
                     for row in rows
@@ -407,7 +725,7 @@ class Producto:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
-                    SELECT id, nombre, categoria_id, costo, precio_venta, cantidad 
+                    SELECT id, nombre, categoria_id, costo, precio_venta, cantidad, codigo
                     FROM productos 
                     WHERE categoria_id = ? 
                     ORDER BY nombre
@@ -422,6 +740,7 @@ class Producto:
                         costo=row[3],
                         precio_venta=row[4],
                         cantidad=row[5],
+                        codigo=row[6],
                         id=row[0],
                     )
                     for row in rows
@@ -438,7 +757,7 @@ class Producto:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
-                    SELECT id, nombre, categoria_id, costo, precio_venta, cantidad 
+                    SELECT id, nombre, categoria_id, costo, precio_venta, cantidad, codigo
                     FROM productos WHERE id = ?
                 """,
                     (producto_id,),
@@ -451,6 +770,7 @@ class Producto:
                         costo=row[3],
                         precio_venta=row[4],
                         cantidad=row[5],
+                        codigo=row[6],
                         id=row[0],
                     )
                 return None
@@ -458,6 +778,88 @@ class Producto:
             print(f"Error en get_by_id: {e}")
             return None
 
+    @staticmethod
+    def get_by_codigo(codigo):
+        """Obtiene el producto con ese código de barras o SKU"""
+        codigo = (codigo or "").strip()
+        if not codigo:
+            return None
+        try:
+            with Database().get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    SELECT id, nombre, categoria_id, costo, precio_venta, cantidad, codigo
+                    FROM productos WHERE codigo = ?
+                """,
+                    (codigo,),
+                )
+                row = cursor.fetchone()
+                if row:
+                    return Producto(
+                        nombre=row[1],
+                        categoria_id=row[2],
+                        costo=row[3],
+                        precio_venta=row[4],
+                        cantidad=row[5],
+                        codigo=row[6],
+                        id=row[0],
+                    )
+                return None
+        except Exception as e:
+            print(f"Error en get_by_codigo: {e}")
+            return None
+
+    @staticmethod
+    def buscar_por_prefijo(prefijo: str, limite: int = 20) -> List["Producto"]:
+        """
+        Obtiene los productos cuyo nombre empieza con el prefijo (sin distinguir
+        mayúsculas), en orden alfabético
+
+        Usa un rango sobre idx_productos_nombre en lugar de LIKE, por lo que
+        solo lee las filas que devuelve.
+        """
+        prefijo = prefijo.strip()
+        try:
+            with Database().get_connection() as conn:
+                cursor = conn.cursor()
+                if prefijo:
+                    cursor.execute(
+                        """
+                        SELECT id, nombre, categoria_id, costo, precio_venta, cantidad, codigo
+                        FROM productos
+                        WHERE nombre >= ? COLLATE NOCASE AND nombre < ? COLLATE NOCASE
+                        ORDER BY nombre COLLATE NOCASE, id
+                        LIMIT ?
+                    """,
+                        (prefijo, _siguiente_prefijo(prefijo), limite),
+                    )
+                else:
+                    cursor.execute(
+                        """
+                        SELECT id, nombre, categoria_id, costo, precio_venta, cantidad, codigo
+                        FROM productos
+                        ORDER BY nombre COLLATE NOCASE, id
+                        LIMIT ?
+                    """,
+                        (limite,),
+                    )
+                return [
+                    Producto(
+                        nombre=row[1],
+                        categoria_id=row[2],
+                        costo=row[3],
+                        precio_venta=row[4],
+                        cantidad=row[5],
+                        codigo=row[6],
+                        id=row[0],
+                    )
+                    for row in cursor.fetchall()
+                ]
+        except Exception as e:
+            print(f"Error en buscar_por_prefijo: {e}")
+            return []
+
     @staticmethod
     def get_productos_agrupados_por_categoria():
         """Obtiene todos los productos agrupados por categoría"""
@@ -494,7 +896,8 @@ class Producto:
                         """
                         UPDATE productos 
                         SET nombre = ?, categoria_id = ?, costo = ?, 
-                            precio_venta = ?, cantidad = ?, margen_bruto = ?
+                            precio_venta = ?, cantidad = ?, margen_bruto = ?,
+                            codigo = ?
                         WHERE id = ?
                     """,
                         (
@@ -504,6 +907,7 @@ class Producto:
                             self.precio_venta,
                             self.cantidad,
                             self.margen_bruto,
+                            self.codigo or None,
                             self.id,
                         ),
                     )
@@ -511,8 +915,9 @@ class Producto:
                     cursor.execute(
                         """
                         INSERT INTO productos 
-                        (nombre, categoria_id, costo, precio_venta, cantidad, margen_bruto) 
-                        VALUES (?, ?, ?, ?, ?, ?)
+                        (nombre, categoria_id, costo, precio_venta, cantidad, margen_bruto,
+                         codigo)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
                     """,
                         (
                             self.nombre,
@@ -521,11 +926,19 @@ class Producto:
                             self.precio_venta,
                             self.cantidad,
                             self.margen_bruto,
+                            self.codigo or None,
                         ),
                     )
                     self.id = cursor.lastrowid
                 conn.commit()
                 return True
+        except sqlite3.IntegrityError as e:
+            if "productos.codigo" in str(e):
+                raise Exception(
+                    f"Error al guardar producto: el código '{self.codigo}' ya está "
+                    "asignado a otro producto"
+                )
+            raise Exception(f"Error al guardar producto: {str(e)}")
         except Exception as e:
             raise Exception(f"Error al guardar producto: {str(e)}")
 
@@ -599,6 +1012,53 @@ class Compra:
             print(f"Error en get_all: {e}")
             return []
 
+    # Orden y filtro de la lista de compras (ver ConsultaPaginada)
+    PAGINACION = ConsultaPaginada(
+        desde="compras",
+        columnas="id, producto_nombre, costo_total, cantidad_elementos, merma, fecha_compra",
+        ordenables={
+            "id": "id",
+            "producto": "producto_nombre",
+            "costo_total": "costo_total",
+            "cantidad": "cantidad_elementos",
+            "costo_unitario": "costo_unitario",
+            "merma": "merma",
+            "perdidas": "perdidas",
+            "fecha": "fecha_compra",
+        },
+        orden="fecha",
+        descendente=True,
+        filtro="producto_nombre",
+    )
+
+    @staticmethod
+    def get_pagina(
+        orden=None, descendente=None, filtro="", limite=TAMANO_PAGINA, offset=0
+    ):
+        """
+        Obtiene una página de compras ordenada y filtrada por nombre de producto
+
+        Returns:
+            tuple: (lista de Compra, total de compras que cumplen el filtro)
+        """
+        try:
+            rows, total = Compra.PAGINACION.pagina(
+                orden, descendente, filtro, limite, offset
+            )
+            return [
+                Compra(
+                    producto_nombre=row[1],
+                    costo_total=row[2],
+                    cantidad_elementos=row[3],
+                    merma=row[4],
+                    fecha_compra=row[5],
+                    id=row[0],
+                )
+                for row in rows
+            ], total
+        except Exception as e:
+            raise Exception(f"Error al cargar la página: {str(e)}")
+
     @staticmethod
     def get_by_id(compra_id):
         """Obtiene una compra por su ID"""
@@ -728,7 +1188,7 @@ class Semana:
                 """
                 )
                 rows = cursor.fetchall()
-                return [
+                semanas = [
                     Semana(
                         fecha_inicio=datetime.strptime(row[1], "%Y-%m-%d").date(),
                         fecha_fin=datetime.strptime(row[2], "%Y-%m-%d").date(),
@@ -736,10 +1196,53 @@ class Semana:
                     )
                     for row in rows
                 ]
+                # Aprovechar la lectura completa para refrescar el índice en memoria
+                indice_semanas.cargar(semanas)
+                return semanas
         except Exception as e:
             print(f"Error en get_all: {e}")
             return []
 
+    # Orden y filtro de la lista de semanas; el filtro es un prefijo de la
+    # fecha de inicio en formato AAAA-MM-DD (por ejemplo "2025" o "2025-03")
+    PAGINACION = ConsultaPaginada(
+        desde="semanas",
+        columnas="id, fecha_inicio, fecha_fin",
+        ordenables={
+            "fecha_inicio": "fecha_inicio",
+            "fecha_fin": "fecha_fin",
+            "dias": "julianday(fecha_fin) - julianday(fecha_inicio)",
+        },
+        orden="fecha_inicio",
+        descendente=True,
+        filtro="fecha_inicio",
+    )
+
+    @staticmethod
+    def get_pagina(
+        orden=None, descendente=None, filtro="", limite=TAMANO_PAGINA, offset=0
+    ) -> Tuple[List["Semana"], int]:
+        """
+        Obtiene una página de semanas ordenada y filtrada por fecha de inicio
+
+        Returns:
+            tuple: (lista de Semana, total de semanas que cumplen el filtro)
+        """
+        try:
+            rows, total = Semana.PAGINACION.pagina(
+                orden, descendente, filtro, limite, offset
+            )
+            return [
+                Semana(
+                    fecha_inicio=datetime.strptime(row[1], "%Y-%m-%d").date(),
+                    fecha_fin=datetime.strptime(row[2], "%Y-%m-%d").date(),
+                    id=row[0],
+                )
+                for row in rows
+            ], total
+        except Exception as e:
+            raise Exception(f"Error al cargar la página: {str(e)}")
+
     @staticmethod
     def get_by_id(semana_id: int) -> Optional["Semana"]:
         """Obtiene una semana por su ID"""
@@ -772,57 +1275,30 @@ class Semana:
         """
         Verifica si hay solapamiento con semanas existentes
 
+        Dos intervalos se solapan si cada uno empieza antes de que termine el
+        otro, por lo que basta un único predicado sobre el índice de
+        UNIQUE(fecha_inicio, fecha_fin).
+
         Returns:
             Tuple[bool, Optional[Semana]]: (hay_solapamiento, semana_solapada)
         """
         try:
             with Database().get_connection() as conn:
                 cursor = conn.cursor()
-
-                # Query para verificar solapamiento
-                if excluir_id:
-                    cursor.execute(
-                        """
-                        SELECT id, fecha_inicio, fecha_fin 
-                        FROM semanas 
-                        WHERE id != ? AND (
-                            (fecha_inicio <= ? AND fecha_fin >= ?) OR  -- Nueva semana dentro de existente
-                            (fecha_inicio >= ? AND fecha_inicio <= ?) OR  -- Inicio en rango existente
-                            (fecha_fin >= ? AND fecha_fin <= ?)  -- Fin en rango existente
-                        )
-                        LIMIT 1
-                    """,
-                        (
-                            excluir_id,
-                            fecha_fin,
-                            fecha_inicio,
-                            fecha_inicio,
-                            fecha_fin,
-                            fecha_inicio,
-                            fecha_fin,
-                        ),
-                    )
-                else:
-                    cursor.execute(
-                        """
-                        SELECT id, fecha_inicio, fecha_fin 
-                        FROM semanas 
-                        WHERE (
-                            (fecha_inicio <= ? AND fecha_fin >= ?) OR
-                            (fecha_inicio >= ? AND fecha_inicio <= ?) OR
-                            (fecha_fin >= ? AND fecha_fin <= ?)
-                        )
-                        LIMIT 1
-                    """,
-                        (
-                            fecha_fin,
-                            fecha_inicio,
-                            fecha_inicio,
-                            fecha_fin,
-                            fecha_inicio,
-                            fecha_fin,
-                        ),
-                    )
+                cursor.execute(
+                    """
+                    SELECT id, fecha_inicio, fecha_fin 
+                    FROM semanas 
+                    WHERE fecha_inicio <= ? AND fecha_fin >= ? AND id != ?
+                    ORDER BY fecha_inicio DESC
+                    LIMIT 1
+                """,
+                    (
+                        fecha_fin.strftime("%Y-%m-%d"),
+                        fecha_inicio.strftime("%Y-%m-%d"),
+                        excluir_id or 0,
+                    ),
+                )
 
                 row = cursor.fetchone()
                 if row:
@@ -841,6 +1317,98 @@ class Semana:
                 None,
             )  # Por seguridad, asumir que hay solapamiento en caso de error
 
+    @staticmethod
+    def generar_calendario(
+        desde: date, hasta: date, dia_inicio: int = 0, duracion: int = 7
+    ) -> Tuple[List["Semana"], List["Semana"]]:
+        """
+        Crea todas las semanas de un rango de fechas en una sola transacción
+
+        Args:
+            desde, hasta: rango en el que deben empezar las semanas generadas
+            dia_inicio: día de la semana en que empieza cada semana (0 = lunes)
+            duracion: cantidad de días de cada semana
+
+        Returns:
+            Tuple[List[Semana], List[Semana]]: (semanas_creadas, semanas_omitidas)
+            Las creadas tienen su id; las omitidas (sin id) son las que se
+            solapan con semanas ya existentes.
+        """
+        if desde > hasta:
+            raise Exception(
+                "La fecha de inicio debe ser anterior o igual a la fecha de fin"
+            )
+        if duracion < 1:
+            raise Exception("La duración de la semana debe ser de al menos 1 día")
+
+        conn = None
+        try:
+            conn = Database().get_connection()
+            cursor = conn.cursor()
+
+            # Bloquear escrituras de otros procesos mientras se comparan intervalos
+            conn.execute("BEGIN IMMEDIATE")
+
+            cursor.execute("SELECT id, fecha_inicio, fecha_fin FROM semanas")
+            indice = IndiceSemanas()
+            indice.cargar(
+                [
+                    Semana(
+                        fecha_inicio=datetime.strptime(row[1], "%Y-%m-%d").date(),
+                        fecha_fin=datetime.strptime(row[2], "%Y-%m-%d").date(),
+                        id=row[0],
+                    )
+                    for row in cursor.fetchall()
+                ]
+            )
+
+            creadas, omitidas = [], []
+            fecha = desde + timedelta(days=(dia_inicio - desde.weekday()) % 7)
+            while fecha <= hasta:
+                semana = Semana(
+                    fecha_inicio=fecha, fecha_fin=fecha + timedelta(days=duracion - 1)
+                )
+                if indice.solapamiento(semana.fecha_inicio, semana.fecha_fin):
+                    omitidas.append(semana)
+                else:
+                    indice.agregar(semana)
+                    creadas.append(semana)
+                fecha += timedelta(days=duracion)
+
+            # Una fila por vez (en la misma transacción) para devolver las
+            # semanas creadas con su id
+            for semana in creadas:
+                cursor.execute(
+                    "INSERT INTO semanas (fecha_inicio, fecha_fin) VALUES (?, ?)",
+                    (
+                        semana.fecha_inicio.strftime("%Y-%m-%d"),
+                        semana.fecha_fin.strftime("%Y-%m-%d"),
+                    ),
+                )
+                semana.id = cursor.lastrowid
+
+            conn.commit()
+            indice_semanas.invalidar()
+            return creadas, omitidas
+
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            raise Exception(f"Error al generar calendario: {str(e)}")
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def find_by_fecha(fecha: date) -> Optional["Semana"]:
+        """Obtiene la semana que contiene la fecha dada (búsqueda O(log n))"""
+        return indice_semanas.buscar(fecha)
+
+    @staticmethod
+    def invalidar_indice():
+        """Marca el índice de semanas en memoria para recargarlo en el próximo uso"""
+        indice_semanas.invalidar()
+
     def save(self) -> bool:
         """Guarda la semana en la base de datos"""
         try:
@@ -890,6 +1458,7 @@ class Semana:
                     self.id = cursor.lastrowid
 
                 conn.commit()
+                indice_semanas.invalidar()
                 return True
 
         except Exception as e:
@@ -902,6 +1471,7 @@ class Semana:
                 cursor = conn.cursor()
                 cursor.execute("DELETE FROM semanas WHERE id = ?", (self.id,))
                 conn.commit()
+                indice_semanas.invalidar()
                 return True
         except Exception as e:
             raise Exception(f"Error al eliminar semana: {str(e)}")
@@ -910,6 +1480,79 @@ class Semana:
         return f"Semana(id={self.id}, inicio={self.fecha_inicio}, fin={self.fecha_fin}, num={self.numero})"
 
 
+class IndiceSemanas:
+    """
+    Índice en memoria de los intervalos de semanas, ordenado por fecha de inicio
+
+    Como las semanas no se solapan, al ordenarlas por fecha de inicio también
+    quedan ordenadas por fecha de fin, y tanto la búsqueda de la semana que
+    contiene una fecha como la detección de solapamientos se resuelven con
+    bisect en O(log n). El índice se recarga de forma perezosa después de
+    invalidar() y cada vez que Semana.get_all() lee la tabla completa.
+    """
+
+    def __init__(self):
+        self._inicios: List[date] = []
+        self._semanas: List[Semana] = []
+        self._vigente = False
+        # El acceso asíncrono puede usar el índice desde varios hilos
+        self._lock = threading.RLock()
+
+    def invalidar(self):
+        """Marca el índice como desactualizado"""
+        self._vigente = False
+
+    def cargar(self, semanas: List[Semana]):
+        """Reconstruye el índice a partir de una lista de semanas"""
+        ordenadas = sorted(semanas, key=lambda s: s.fecha_inicio)
+        with self._lock:
+            self._semanas = ordenadas
+            self._inicios = [s.fecha_inicio for s in ordenadas]
+            self._vigente = True
+
+    def _asegurar_vigente(self):
+        if not self._vigente:
+            Semana.get_all()  # get_all() recarga el índice
+
+    def agregar(self, semana: Semana):
+        """Inserta una semana en el índice manteniendo el orden"""
+        with self._lock:
+            self._asegurar_vigente()
+            posicion = bisect.bisect_right(self._inicios, semana.fecha_inicio)
+            self._inicios.insert(posicion, semana.fecha_inicio)
+            self._semanas.insert(posicion, semana)
+
+    def buscar(self, fecha: date) -> Optional[Semana]:
+        """Obtiene la semana que contiene la fecha, o None"""
+        with self._lock:
+            self._asegurar_vigente()
+            posicion = bisect.bisect_right(self._inicios, fecha) - 1
+            if posicion >= 0 and self._semanas[posicion].fecha_fin >= fecha:
+                return self._semanas[posicion]
+            return None
+
+    def solapamiento(
+        self, fecha_inicio: date, fecha_fin: date, excluir_id: int = None
+    ) -> Optional[Semana]:
+        """Obtiene una semana que se solape con el intervalo dado, o None"""
+        with self._lock:
+            self._asegurar_vigente()
+            # Última semana que empieza antes o el mismo día que termina el intervalo
+            posicion = bisect.bisect_right(self._inicios, fecha_fin) - 1
+            while posicion >= 0:
+                semana = self._semanas[posicion]
+                if semana.fecha_fin < fecha_inicio:
+                    return None
+                if semana.id != excluir_id:
+                    return semana
+                posicion -= 1
+            return None
+
+
+# Índice compartido de semanas del proceso
+indice_semanas = IndiceSemanas()
+
+
 class TipoCosto(Enum):
     """Enum para los tipos de costo"""
 
@@ -1015,6 +1658,47 @@ class Costo:
             print(f"Error en get_total_general: {e}")
             return 0.0
 
+    # Orden y filtro de las listas de costos (una por tipo)
+    PAGINACION = ConsultaPaginada(
+        desde="costos",
+        columnas="id, nombre, cantidad, tipo",
+        ordenables={"id": "id", "nombre": "nombre", "cantidad": "cantidad"},
+        orden="nombre",
+        filtro="nombre",
+    )
+
+    @staticmethod
+    def get_pagina(
+        tipo: TipoCosto,
+        orden=None,
+        descendente=None,
+        filtro="",
+        limite=TAMANO_PAGINA,
+        offset=0,
+    ) -> Tuple[List["Costo"], int]:
+        """
+        Obtiene una página de costos de un tipo, ordenada y filtrada por nombre
+
+        Returns:
+            tuple: (lista de Costo, total de costos que cumplen el filtro)
+        """
+        try:
+            rows, total = Costo.PAGINACION.pagina(
+                orden,
+                descendente,
+                filtro,
+                limite,
+                offset,
+                condicion="tipo = ?",
+                parametros_condicion=(tipo.value,),
+            )
+            return [
+                Costo(id=row[0], nombre=row[1], cantidad=row[2], tipo=TipoCosto(row[3]))
+                for row in rows
+            ], total
+        except Exception as e:
+            raise Exception(f"Error al cargar la página: {str(e)}")
+
     @staticmethod
     def get_by_id(costo_id: int) -> Optional["Costo"]:
         """Obtiene un costo por su ID"""
@@ -1201,6 +1885,59 @@ class Venta:
             print(f"Error en get_by_producto: {e}")
             return []
 
+    # Orden y filtro de la lista de ventas (con semana y producto)
+    PAGINACION = ConsultaPaginada(
+        desde="""ventas v
+            JOIN semanas s ON s.id = v.semana_id
+            JOIN productos p ON p.id = v.producto_id""",
+        columnas="""v.id, s.fecha_inicio, s.fecha_fin, p.nombre,
+            v.cantidad_vendida, v.monto, p.cantidad""",
+        ordenables={
+            "id": "v.id",
+            "semana": "s.fecha_inicio",
+            "producto": "p.nombre",
+            "cantidad": "v.cantidad_vendida",
+            "monto": "v.monto",
+            "inventario": "p.cantidad",
+        },
+        orden="semana",
+        descendente=True,
+        filtro="p.nombre",
+        desempate="v.id",
+        desde_sin_filtro="ventas v",
+    )
+
+    @staticmethod
+    def get_pagina(
+        orden=None, descendente=None, filtro="", limite=TAMANO_PAGINA, offset=0
+    ) -> Tuple[List[tuple], int]:
+        """
+        Obtiene una página de ventas ordenada y filtrada por nombre de producto
+
+        Returns:
+            tuple: (tuplas (id, fecha_inicio, fecha_fin, producto_nombre,
+            cantidad_vendida, monto, inventario_producto), total de ventas que
+            cumplen el filtro)
+        """
+        try:
+            rows, total = Venta.PAGINACION.pagina(
+                orden, descendente, filtro, limite, offset
+            )
+            return [
+                (
+                    row[0],
+                    datetime.strptime(row[1], "%Y-%m-%d").date(),
+                    datetime.strptime(row[2], "%Y-%m-%d").date(),
+                    row[3],
+                    row[4],
+                    row[5],
+                    row[6],
+                )
+                for row in rows
+            ], total
+        except Exception as e:
+            raise Exception(f"Error al cargar la página: {str(e)}")
+
     @staticmethod
     def get_by_id(venta_id: int) -> Optional["Venta"]:
         """Obtiene una venta por su ID"""
@@ -1440,13 +2177,91 @@ class Venta:
             if conn:
                 conn.close()
 
-    def delete(self) -> bool:
-        """Elimina la venta de la base de datos y devuelve el inventario"""
-        conn = None
-        try:
-            # Usar UNA sola conexión
-            conn = Database().get_connection()
-            cursor = conn.cursor()
+    @staticmethod
+    def guardar_lote(ventas: List["Venta"], marca: Tuple[str, int] = None) -> int:
+        """
+        Inserta varias ventas nuevas y descuenta el inventario en una sola
+        transacción (un UPDATE por producto en lugar de uno por venta)
+
+        No verifica el inventario: las ventas del lote ya fueron aceptadas
+        descontando las pendientes del diario (ver
+        DiarioVentas.pendiente_de). Las de productos o semanas que ya no
+        existen se descartan y quedan sin id.
+
+        Args:
+            ventas: ventas nuevas (sin id)
+            marca: (proceso, último id) a guardar en marcas_procesamiento en la
+                misma transacción
+
+        Returns:
+            int: cantidad de ventas insertadas
+        """
+        conn = None
+        try:
+            conn = Database().get_connection()
+            cursor = conn.cursor()
+            conn.execute("BEGIN IMMEDIATE")
+
+            insertadas = 0
+            por_producto = {}  # producto_id -> cantidad
+            for venta in ventas:
+                cursor.execute(
+                    """
+                    INSERT INTO ventas (semana_id, producto_id, cantidad_vendida, monto)
+                    SELECT ?, ?, ?, ?
+                    WHERE EXISTS (SELECT 1 FROM productos WHERE id = ?)
+                      AND EXISTS (SELECT 1 FROM semanas WHERE id = ?)
+                """,
+                    (
+                        venta.semana_id,
+                        venta.producto_id,
+                        venta.cantidad_vendida,
+                        venta.monto,
+                        venta.producto_id,
+                        venta.semana_id,
+                    ),
+                )
+                if cursor.rowcount:
+                    venta.id = cursor.lastrowid
+                    insertadas += 1
+                    por_producto[venta.producto_id] = (
+                        por_producto.get(venta.producto_id, 0) + venta.cantidad_vendida
+                    )
+
+            cursor.executemany(
+                "UPDATE productos SET cantidad = cantidad - ? WHERE id = ?",
+                [
+                    (cantidad, producto_id)
+                    for producto_id, cantidad in por_producto.items()
+                ],
+            )
+
+            if marca:
+                cursor.execute(
+                    """
+                    INSERT INTO marcas_procesamiento (proceso, ultimo_id) VALUES (?, ?)
+                    ON CONFLICT(proceso) DO UPDATE SET ultimo_id = excluded.ultimo_id
+                """,
+                    marca,
+                )
+            conn.commit()
+            return insertadas
+
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            raise Exception(f"Error al guardar ventas: {str(e)}")
+        finally:
+            if conn:
+                conn.close()
+
+    def delete(self) -> bool:
+        """Elimina la venta de la base de datos y devuelve el inventario"""
+        conn = None
+        try:
+            # Usar UNA sola conexión
+            conn = Database().get_connection()
+            cursor = conn.cursor()
 
             # Iniciar transacción
             conn.execute("BEGIN TRANSACTION")
@@ -1478,6 +2293,339 @@ class Venta:
         return f"Venta(id={self.id}, semana={semana_info}, producto='{producto_info}', cantidad={self.cantidad_vendida}, monto={self.monto})"
 
 
+def get_marca_procesamiento(proceso: str) -> int:
+    """
+    Último id procesado por un proceso por lotes (0 si nunca se ejecutó)
+
+    A diferencia de otras lecturas, un error se propaga: suponer 0 haría que
+    el proceso repita lo ya aplicado.
+    """
+    try:
+        with Database().get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT ultimo_id FROM marcas_procesamiento WHERE proceso = ?",
+                (proceso,),
+            )
+            row = cursor.fetchone()
+            return row[0] if row else 0
+    except Exception as e:
+        raise Exception(f"Error al leer la marca de {proceso}: {str(e)}")
+
+
+# Transacciones consolidadas como máximo por cada ejecución del job
+LOTE_CONSOLIDACION = 10_000
+
+
+@dataclass
+class TransaccionVenta:
+    """
+    Venta individual registrada en el mostrador (tabla transacciones_venta)
+
+    Registrar una transacción es un único INSERT al final de la tabla, sin
+    verificar ni descontar inventario. consolidar() suma periódicamente las
+    transacciones nuevas en las filas semanales de ventas y descuenta el
+    inventario con un UPDATE por producto y lote.
+    """
+
+    producto_id: int = None
+    cantidad: int = 0
+    monto: float = 0.0
+    fecha_hora: datetime = None
+    id: int = None
+
+    # Nombre del proceso en marcas_procesamiento
+    PROCESO = "consolidacion_ventas"
+
+    def _validar(self):
+        if not self.producto_id:
+            raise Exception("Debe seleccionar un producto")
+        if self.cantidad <= 0:
+            raise Exception("La cantidad vendida debe ser mayor a 0")
+        if self.monto <= 0:
+            raise Exception("El monto debe ser mayor a 0")
+        if self.fecha_hora is None:
+            self.fecha_hora = datetime.now()
+
+    def _fila(self) -> tuple:
+        fecha_hora = self.fecha_hora.strftime("%Y-%m-%d %H:%M:%S")
+        return (
+            fecha_hora,
+            self.producto_id,
+            self.cantidad,
+            self.monto,
+            fecha_hora,
+            fecha_hora,
+        )
+
+    # La semana se busca en la base de datos (y no en indice_semanas, que es
+    # propio de cada proceso) para ver las semanas creadas en otra ventana
+    _INSERTAR = """
+        INSERT INTO transacciones_venta (fecha_hora, producto_id, cantidad, monto)
+        SELECT ?, ?, ?, ?
+        WHERE (
+            SELECT fecha_inicio FROM semanas
+            WHERE fecha_fin >= substr(?, 1, 10)
+            ORDER BY fecha_fin LIMIT 1
+        ) <= substr(?, 1, 10)
+    """
+
+    def _sin_semana(self) -> Exception:
+        return Exception(
+            "No hay semana configurada para el "
+            f"{self.fecha_hora.strftime('%d/%m/%Y')}"
+        )
+
+    def registrar(self) -> bool:
+        """
+        Agrega la transacción (sin tocar ventas ni inventario)
+
+        Raises:
+            Exception: si ninguna semana contiene la fecha de la transacción
+        """
+        try:
+            self._validar()
+            with Database().get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(TransaccionVenta._INSERTAR, self._fila())
+                if cursor.rowcount == 0:
+                    raise self._sin_semana()
+                self.id = cursor.lastrowid
+                conn.commit()
+                return True
+        except Exception as e:
+            raise Exception(f"Error al registrar transacción: {str(e)}")
+
+    @staticmethod
+    def registrar_lote(transacciones: List["TransaccionVenta"]) -> int:
+        """
+        Agrega varias transacciones en una sola transacción de SQLite
+
+        Raises:
+            Exception: si alguna fecha no tiene semana (no se agrega ninguna)
+        """
+        try:
+            for transaccion in transacciones:
+                transaccion._validar()
+            with Database().get_connection() as conn:
+                cursor = conn.cursor()
+                for transaccion in transacciones:
+                    cursor.execute(TransaccionVenta._INSERTAR, transaccion._fila())
+                    if cursor.rowcount == 0:
+                        conn.rollback()
+                        raise transaccion._sin_semana()
+                conn.commit()
+                return len(transacciones)
+        except Exception as e:
+            raise Exception(f"Error al registrar transacciones: {str(e)}")
+
+    @staticmethod
+    def get_pendientes() -> int:
+        """Cantidad de transacciones todavía no consolidadas en ventas"""
+        try:
+            with Database().get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    SELECT COUNT(*) FROM transacciones_venta
+                    WHERE id > COALESCE(
+                        (SELECT ultimo_id FROM marcas_procesamiento WHERE proceso = ?), 0
+                    )
+                """,
+                    (TransaccionVenta.PROCESO,),
+                )
+                return cursor.fetchone()[0]
+        except Exception as e:
+            print(f"Error en get_pendientes: {e}")
+            return 0
+
+    @staticmethod
+    def get_pendiente_producto(producto_id: int) -> int:
+        """
+        Unidades del producto vendidas en el mostrador y todavía no
+        descontadas del inventario (transacciones sin consolidar)
+        """
+        try:
+            with Database().get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    SELECT COALESCE(SUM(cantidad), 0) FROM transacciones_venta
+                    WHERE id > COALESCE(
+                        (SELECT ultimo_id FROM marcas_procesamiento WHERE proceso = ?), 0
+                    )
+                    AND producto_id = ?
+                """,
+                    (TransaccionVenta.PROCESO, producto_id),
+                )
+                return cursor.fetchone()[0]
+        except Exception as e:
+            print(f"Error en get_pendiente_producto: {e}")
+            return 0
+
+    @staticmethod
+    def consolidar(limite: int = LOTE_CONSOLIDACION) -> dict:
+        """
+        Suma las transacciones posteriores a la marca de agua en ventas
+
+        Agrupa el lote por día y producto, asigna cada día a su semana (en
+        SQL, dentro de la misma transacción), suma
+        cantidad y monto en la fila de ventas de (semana, producto) (o la
+        crea) y descuenta el inventario de cada producto una sola vez. Todo
+        ocurre en una transacción junto con el avance de la marca, por lo que
+        una transacción nunca se suma dos veces.
+
+        El inventario puede quedar negativo: la venta ya ocurrió en el
+        mostrador y el faltante indica que hay que recontar el producto.
+
+        Returns:
+            dict: transacciones consolidadas, filas de ventas modificadas y
+            productos actualizados
+
+        Raises:
+            Exception: si la primera transacción pendiente no tiene semana
+            configurada (queda pendiente, junto con las siguientes, hasta que
+            se cree la semana); si aparece más adelante en el lote, se
+            consolidan las anteriores
+        """
+        conn = None
+        try:
+            conn = Database().get_connection()
+            cursor = conn.cursor()
+            # Bloqueo de escritura desde el inicio: dos procesos no pueden
+            # consolidar el mismo lote
+            conn.execute("BEGIN IMMEDIATE")
+
+            cursor.execute(
+                "SELECT ultimo_id FROM marcas_procesamiento WHERE proceso = ?",
+                (TransaccionVenta.PROCESO,),
+            )
+            row = cursor.fetchone()
+            desde = row[0] if row else 0
+            cursor.execute(
+                "SELECT MAX(id) FROM transacciones_venta WHERE id <= ?",
+                (desde + limite,),
+            )
+            hasta = cursor.fetchone()[0]
+            if hasta is None or hasta <= desde:
+                conn.rollback()
+                return {"transacciones": 0, "ventas": 0, "productos": 0}
+
+            # La semana se resuelve aquí y no con indice_semanas: este proceso
+            # no se entera de las semanas creadas o editadas en otra ventana.
+            # Como las semanas no se solapan, la de una fecha es la primera que
+            # termina en o después de ella, si empieza antes. Se consolida solo
+            # hasta antes de la primera transacción cuya fecha no tiene semana;
+            # esa y las siguientes quedan pendientes
+            cursor.execute(
+                """
+                SELECT MIN(t.id), substr(MIN(t.fecha_hora), 1, 10)
+                FROM transacciones_venta t
+                JOIN productos p ON p.id = t.producto_id
+                WHERE t.id > ? AND t.id <= ?
+                AND NOT IFNULL(
+                    (
+                        SELECT s.fecha_inicio FROM semanas s
+                        WHERE s.fecha_fin >= substr(t.fecha_hora, 1, 10)
+                        ORDER BY s.fecha_fin LIMIT 1
+                    ) <= substr(t.fecha_hora, 1, 10),
+                    0
+                )
+            """,
+                (desde, hasta),
+            )
+            sin_semana, dia_sin_semana = cursor.fetchone()
+            if sin_semana is not None:
+                hasta = sin_semana - 1
+                if hasta <= desde:
+                    fecha = datetime.strptime(dia_sin_semana, "%Y-%m-%d").date()
+                    raise Exception(
+                        f"No hay semana configurada para el {fecha.strftime('%d/%m/%Y')}"
+                    )
+
+            # Productos eliminados después de la venta: se descartan
+            cursor.execute(
+                """
+                WITH dias AS (
+                    SELECT substr(t.fecha_hora, 1, 10) AS dia, t.producto_id,
+                           SUM(t.cantidad) AS cantidad, SUM(t.monto) AS monto,
+                           COUNT(*) AS cuenta
+                    FROM transacciones_venta t
+                    JOIN productos p ON p.id = t.producto_id
+                    WHERE t.id > ? AND t.id <= ?
+                    GROUP BY substr(t.fecha_hora, 1, 10), t.producto_id
+                )
+                SELECT (
+                           SELECT s.id FROM semanas s
+                           WHERE s.fecha_fin >= d.dia
+                           ORDER BY s.fecha_fin LIMIT 1
+                       ) AS semana_id,
+                       d.producto_id, SUM(d.cantidad), SUM(d.monto), SUM(d.cuenta)
+                FROM dias d
+                GROUP BY semana_id, d.producto_id
+            """,
+                (desde, hasta),
+            )
+
+            por_semana = {}  # (semana_id, producto_id) -> (cantidad, monto)
+            por_producto = {}  # producto_id -> cantidad
+            transacciones = 0
+            for semana_id, producto_id, cantidad, monto, cuenta in cursor.fetchall():
+                por_semana[(semana_id, producto_id)] = (cantidad, monto)
+                por_producto[producto_id] = por_producto.get(producto_id, 0) + cantidad
+                transacciones += cuenta
+
+            for (semana_id, producto_id), (cantidad, monto) in por_semana.items():
+                cursor.execute(
+                    """
+                    UPDATE ventas
+                    SET cantidad_vendida = cantidad_vendida + ?, monto = monto + ?
+                    WHERE id = (
+                        SELECT MIN(id) FROM ventas WHERE semana_id = ? AND producto_id = ?
+                    )
+                """,
+                    (cantidad, monto, semana_id, producto_id),
+                )
+                if cursor.rowcount == 0:
+                    cursor.execute(
+                        """
+                        INSERT INTO ventas (semana_id, producto_id, cantidad_vendida, monto)
+                        VALUES (?, ?, ?, ?)
+                    """,
+                        (semana_id, producto_id, cantidad, monto),
+                    )
+
+            cursor.executemany(
+                "UPDATE productos SET cantidad = cantidad - ? WHERE id = ?",
+                [
+                    (cantidad, producto_id)
+                    for producto_id, cantidad in por_producto.items()
+                ],
+            )
+
+            cursor.execute(
+                """
+                INSERT INTO marcas_procesamiento (proceso, ultimo_id) VALUES (?, ?)
+                ON CONFLICT(proceso) DO UPDATE SET ultimo_id = excluded.ultimo_id
+            """,
+                (TransaccionVenta.PROCESO, hasta),
+            )
+            conn.commit()
+            return {
+                "transacciones": transacciones,
+                "ventas": len(por_semana),
+                "productos": len(por_producto),
+            }
+
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            raise Exception(f"Error al consolidar transacciones: {str(e)}")
+        finally:
+            if conn:
+                conn.close()
+
+
 @dataclass
 class CuentaCobrar:
     """Modelo para la tabla Cuentas por Cobrar"""
@@ -1537,6 +2685,49 @@ class CuentaCobrar:
             print(f"Error en CuentaCobrar.get_total: {e}")
             return 0.0
 
+    # Orden y filtro de la lista de cuentas
+    PAGINACION = ConsultaPaginada(
+        desde="cuentas_cobrar",
+        columnas="id, nombre_persona, cantidad, descripcion, fecha_creacion",
+        ordenables={
+            "id": "id",
+            "nombre": "nombre_persona",
+            "cantidad": "cantidad",
+            "descripcion": "descripcion",
+        },
+        orden="nombre",
+        filtro="nombre_persona",
+    )
+
+    @staticmethod
+    def get_pagina(
+        orden=None, descendente=None, filtro="", limite=TAMANO_PAGINA, offset=0
+    ) -> Tuple[List["CuentaCobrar"], int]:
+        """
+        Obtiene una página de cuentas ordenada y filtrada por nombre
+
+        Returns:
+            tuple: (lista de CuentaCobrar, total de cuentas que cumplen el filtro)
+        """
+        try:
+            rows, total = CuentaCobrar.PAGINACION.pagina(
+                orden, descendente, filtro, limite, offset
+            )
+            return [
+                CuentaCobrar(
+                    id=row[0],
+                    nombre_persona=row[1],
+                    cantidad=row[2],
+                    descripcion=row[3],
+                    fecha_creacion=(
+                        datetime.strptime(row[4], "%Y-%m-%d").date() if row[4] else None
+                    ),
+                )
+                for row in rows
+            ], total
+        except Exception as e:
+            raise Exception(f"Error al cargar la página: {str(e)}")
+
     @staticmethod
     def get_by_id(cuenta_id: int) -> Optional["CuentaCobrar"]:
         """Obtiene una cuenta por cobrar por su ID"""
@@ -1695,6 +2886,49 @@ class CuentaPagar:
             print(f"Error en CuentaPagar.get_total: {e}")
             return 0.0
 
+    # Orden y filtro de la lista de cuentas
+    PAGINACION = ConsultaPaginada(
+        desde="cuentas_pagar",
+        columnas="id, nombre_proveedor, cantidad, descripcion, fecha_creacion",
+        ordenables={
+            "id": "id",
+            "nombre": "nombre_proveedor",
+            "cantidad": "cantidad",
+            "descripcion": "descripcion",
+        },
+        orden="nombre",
+        filtro="nombre_proveedor",
+    )
+
+    @staticmethod
+    def get_pagina(
+        orden=None, descendente=None, filtro="", limite=TAMANO_PAGINA, offset=0
+    ) -> Tuple[List["CuentaPagar"], int]:
+        """
+        Obtiene una página de cuentas ordenada y filtrada por nombre
+
+        Returns:
+            tuple: (lista de CuentaPagar, total de cuentas que cumplen el filtro)
+        """
+        try:
+            rows, total = CuentaPagar.PAGINACION.pagina(
+                orden, descendente, filtro, limite, offset
+            )
+            return [
+                CuentaPagar(
+                    id=row[0],
+                    nombre_proveedor=row[1],
+                    cantidad=row[2],
+                    descripcion=row[3],
+                    fecha_creacion=(
+                        datetime.strptime(row[4], "%Y-%m-%d").date() if row[4] else None
+                    ),
+                )
+                for row in rows
+            ], total
+        except Exception as e:
+            raise Exception(f"Error al cargar la página: {str(e)}")
+
     @staticmethod
     def get_by_id(cuenta_id: int) -> Optional["CuentaPagar"]:
         """Obtiene una cuenta por pagar por su ID"""
@@ -1794,11 +3028,84 @@ class CuentaPagar:
         return f"CuentaPagar(id={self.id}, proveedor='{self.nombre_proveedor}', cantidad={self.cantidad})"
 
 
+class CopiaReportes:
+    """
+    Copia de solo lectura de la base de datos para los reportes
+
+    Las estadísticas de Contabilidad pueden leer de una copia que se refresca
+    periódicamente con la API de backup, de modo que las consultas largas no
+    bloquean ni esperan a los módulos que registran compras y ventas. La copia
+    se abre con mode=ro y se reemplaza de forma atómica al refrescarla.
+    """
+
+    # Páginas por paso y pausa entre pasos al refrescar (como respaldo.py)
+    PAGINAS_POR_PASO = 256
+    PAUSA_ENTRE_PASOS = 0.01
+
+    def __init__(self):
+        self.activa = False
+        self.ultima_actualizacion: Optional[datetime] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def ruta() -> Path:
+        """Archivo de la copia, junto a la base de datos"""
+        origen = Path(Database.db_path_por_defecto)
+        return origen.with_name(f"{origen.stem}_reportes.db")
+
+    def activar(self):
+        """Usa la copia para los reportes, creándola si no existe"""
+        if not self.ruta().exists():
+            self.refrescar()
+        self.activa = True
+
+    def desactivar(self):
+        self.activa = False
+
+    def refrescar(self):
+        """Copia la base de datos actual sobre la copia de reportes"""
+        with self._lock:
+            destino_ruta = self.ruta()
+            temporal = destino_ruta.with_suffix(".tmp")
+            try:
+                origen = Database().get_connection()
+                destino = sqlite3.connect(temporal)
+                try:
+                    origen.backup(
+                        destino,
+                        pages=self.PAGINAS_POR_PASO,
+                        sleep=self.PAUSA_ENTRE_PASOS,
+                    )
+                finally:
+                    destino.close()
+                    origen.close()
+                # Las conexiones ya abiertas siguen leyendo la copia anterior
+                os.replace(temporal, destino_ruta)
+                self.ultima_actualizacion = datetime.now()
+            except Exception as e:
+                temporal.unlink(missing_ok=True)
+                raise Exception(f"Error al refrescar copia de reportes: {str(e)}")
+
+    def get_connection(self):
+        """Conexión de solo lectura a la copia, o a la base de datos si no está activa"""
+        if not self.activa or not self.ruta().exists():
+            return Database().get_connection()
+        return sqlite3.connect(
+            f"{self.ruta().resolve().as_uri()}?mode=ro",
+            uri=True,
+            factory=instrumentacion.fabrica_conexion(),
+        )
+
+
+# Copia de reportes compartida del proceso
+copia_reportes = CopiaReportes()
+
+
 # Métodos para estadísticas
 def get_total_compras_rango(fecha_inicio: date, fecha_fin: date) -> float:
     """Obtiene el total de compras en un rango de fechas"""
     try:
-        with Database().get_connection() as conn:
+        with copia_reportes.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -1818,34 +3125,20 @@ def get_total_compras_rango(fecha_inicio: date, fecha_fin: date) -> float:
 def get_total_ventas_rango(fecha_inicio: date, fecha_fin: date) -> float:
     """Obtiene el total de ventas en un rango de fechas (basado en semanas)"""
     try:
-        with Database().get_connection() as conn:
+        with copia_reportes.get_connection() as conn:
             cursor = conn.cursor()
 
-            # Primero obtener las semanas que están dentro del rango
+            # Ventas de las semanas que se solapan con el rango, en una sola consulta
             cursor.execute(
                 """
-                SELECT id FROM semanas 
-                WHERE fecha_inicio <= ? AND fecha_fin >= ?
+                SELECT SUM(v.monto)
+                FROM semanas s
+                JOIN ventas v ON v.semana_id = s.id
+                WHERE s.fecha_inicio <= ? AND s.fecha_fin >= ?
             """,
                 (fecha_fin.strftime("%Y-%m-%d"), fecha_inicio.strftime("%Y-%m-%d")),
             )
 
-            semanas_ids = [row[0] for row in cursor.fetchall()]
-
-            if not semanas_ids:
-                return 0.0
-
-            # Luego obtener total de ventas de esas semanas
-            placeholders = ",".join("?" * len(semanas_ids))
-            cursor.execute(
-                f"""
-                SELECT SUM(monto) 
-                FROM ventas 
-                WHERE semana_id IN ({placeholders})
-            """,
-                semanas_ids,
-            )
-
             result = cursor.fetchone()
             return result[0] if result[0] is not None else 0.0
 
@@ -1857,30 +3150,29 @@ def get_total_ventas_rango(fecha_inicio: date, fecha_fin: date) -> float:
 def get_margen_neto_semana(semana_id: int) -> dict:
     """Calcula el margen neto para una semana específica"""
     try:
-        with Database().get_connection() as conn:
+        with copia_reportes.get_connection() as conn:
             cursor = conn.cursor()
 
-            # 1. Obtener ventas de la semana
+            # Ventas de la semana y totales de costos en una sola consulta
             cursor.execute(
                 """
-                SELECT SUM(monto) FROM ventas WHERE semana_id = ?
+                SELECT
+                    (SELECT COALESCE(SUM(monto), 0.0) FROM ventas WHERE semana_id = ?),
+                    (SELECT COALESCE(SUM(cantidad), 0.0) FROM costos WHERE tipo = 'fijo'),
+                    (SELECT COALESCE(SUM(cantidad), 0.0) FROM costos WHERE tipo = 'variable')
             """,
                 (semana_id,),
             )
-            total_ventas = cursor.fetchone()[0] or 0.0
+            total_ventas, total_costos_fijos_mensual, total_costos_variables = (
+                cursor.fetchone()
+            )
 
-            # 2. Obtener costos fijos (se asumen mensuales, dividir entre 4.33 para semanales)
-            cursor.execute("SELECT SUM(cantidad) FROM costos WHERE tipo = 'fijo'")
-            total_costos_fijos_mensual = cursor.fetchone()[0] or 0.0
+            # Costos fijos (se asumen mensuales, dividir entre 4.33 para semanales)
             costos_fijos_semanales = (
                 total_costos_fijos_mensual / 4.33
             )  # Promedio semanal
 
-            # 3. Obtener costos variables TOTALES (NO como porcentaje)
-            cursor.execute("SELECT SUM(cantidad) FROM costos WHERE tipo = 'variable'")
-            total_costos_variables = cursor.fetchone()[0] or 0.0
-
-            # 4. Calcular margen neto (costos variables como valor absoluto)
+            # Calcular margen neto (costos variables como valor absoluto)
             margen_neto = total_ventas - costos_fijos_semanales - total_costos_variables
             porcentaje_margen = (
                 (margen_neto / total_ventas * 100) if total_ventas > 0 else 0
@@ -1900,59 +3192,60 @@ def get_margen_neto_semana(semana_id: int) -> dict:
         return None
 
 
-def get_margen_neto_rango(semana_inicio_id: int, semana_fin_id: int) -> dict:
-    """Calcula el margen neto para un rango de semanas"""
+def get_margen_neto_rango(fecha_inicio: date, fecha_fin: date) -> dict:
+    """
+    Calcula el margen neto para las semanas comprendidas entre dos fechas
+
+    Las semanas se seleccionan por sus fechas (no por su ID), por lo que el
+    resultado es correcto aunque las semanas se hayan creado fuera de orden.
+    """
     try:
-        with Database().get_connection() as conn:
+        with copia_reportes.get_connection() as conn:
             cursor = conn.cursor()
 
-            # 1. Obtener semanas en el rango
+            # Número de semanas, ventas del rango y totales de costos en una
+            # sola consulta. CROSS JOIN fija el orden: primero las semanas del
+            # rango y luego sus ventas por idx_ventas_semana_monto; con
+            # estadísticas el planificador prefería recorrer todas las ventas
+            # y crear un índice automático sobre la CTE
             cursor.execute(
                 """
-                SELECT id FROM semanas 
-                WHERE id BETWEEN ? AND ?
-                ORDER BY fecha_inicio
+                WITH semanas_rango AS (
+                    SELECT id FROM semanas
+                    WHERE fecha_inicio >= ? AND fecha_fin <= ?
+                )
+                SELECT
+                    (SELECT COUNT(*) FROM semanas_rango),
+                    (SELECT COALESCE(SUM(v.monto), 0.0)
+                     FROM semanas_rango s
+                     CROSS JOIN ventas v ON v.semana_id = s.id),
+                    (SELECT COALESCE(SUM(cantidad), 0.0) FROM costos WHERE tipo = 'fijo'),
+                    (SELECT COALESCE(SUM(cantidad), 0.0) FROM costos WHERE tipo = 'variable')
             """,
-                (semana_inicio_id, semana_fin_id),
+                (fecha_inicio.strftime("%Y-%m-%d"), fecha_fin.strftime("%Y-%m-%d")),
             )
-
-            semanas_ids = [row[0] for row in cursor.fetchall()]
-
-            if not semanas_ids:
+            (
+                num_semanas,
+                total_ventas,
+                total_costos_fijos_mensual,
+                total_costos_variables,
+            ) = cursor.fetchone()
+
+            if not num_semanas:
                 return None
 
-            # 2. Obtener ventas totales del rango
-            placeholders = ",".join("?" * len(semanas_ids))
-            cursor.execute(
-                f"""
-                SELECT SUM(monto) FROM ventas 
-                WHERE semana_id IN ({placeholders})
-            """,
-                semanas_ids,
-            )
-            total_ventas = cursor.fetchone()[0] or 0.0
-
-            # 3. Obtener costos fijos (para todo el período)
-            cursor.execute("SELECT SUM(cantidad) FROM costos WHERE tipo = 'fijo'")
-            total_costos_fijos_mensual = cursor.fetchone()[0] or 0.0
-
-            # Calcular número de semanas en el rango
-            num_semanas = len(semanas_ids)
+            # Costos fijos para todo el período
             costos_fijos_totales = (total_costos_fijos_mensual / 4.33) * num_semanas
 
-            # 4. Costos variables TOTALES (NO como porcentaje)
-            cursor.execute("SELECT SUM(cantidad) FROM costos WHERE tipo = 'variable'")
-            total_costos_variables = cursor.fetchone()[0] or 0.0
-
-            # 5. Calcular margen neto
+            # Calcular margen neto (costos variables como valor absoluto)
             margen_neto = total_ventas - costos_fijos_totales - total_costos_variables
             porcentaje_margen = (
                 (margen_neto / total_ventas * 100) if total_ventas > 0 else 0
             )
 
             return {
-                "semana_inicio_id": semana_inicio_id,
-                "semana_fin_id": semana_fin_id,
+                "fecha_inicio": fecha_inicio,
+                "fecha_fin": fecha_fin,
                 "num_semanas": num_semanas,
                 "total_ventas": total_ventas,
                 "costos_fijos_totales": costos_fijos_totales,
@@ -1966,5 +3259,339 @@ def get_margen_neto_rango(semana_inicio_id: int, semana_fin_id: int) -> dict:
         return None
 
 
+def get_margen_neto_serie(desde: date, hasta: date) -> List[dict]:
+    """
+    Calcula el margen neto semana a semana para todas las semanas del rango
+
+    Una sola consulta agrupada devuelve las ventas de cada semana junto con los
+    totales de costos, en lugar de llamar a get_margen_neto_semana por semana.
+
+    Returns:
+        List[dict]: un diccionario por semana, ordenado por fecha de inicio
+    """
+    try:
+        with copia_reportes.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT s.id, s.fecha_inicio, s.fecha_fin,
+                       COALESCE(SUM(v.monto), 0.0),
+                       (SELECT COALESCE(SUM(cantidad), 0.0) FROM costos WHERE tipo = 'fijo'),
+                       (SELECT COALESCE(SUM(cantidad), 0.0) FROM costos WHERE tipo = 'variable')
+                FROM semanas s
+                LEFT JOIN ventas v ON v.semana_id = s.id
+                WHERE s.fecha_inicio <= ? AND s.fecha_fin >= ?
+                GROUP BY s.id, s.fecha_inicio, s.fecha_fin
+                ORDER BY s.fecha_inicio
+            """,
+                (hasta.strftime("%Y-%m-%d"), desde.strftime("%Y-%m-%d")),
+            )
+
+            serie = []
+            for row in cursor.fetchall():
+                total_ventas = row[3]
+                # Costos fijos mensuales distribuidos por semana (mes/4.33)
+                costos_fijos_semanales = row[4] / 4.33
+                total_costos_variables = row[5]
+                margen_neto = (
+                    total_ventas - costos_fijos_semanales - total_costos_variables
+                )
+                porcentaje_margen = (
+                    (margen_neto / total_ventas * 100) if total_ventas > 0 else 0
+                )
+                serie.append(
+                    {
+                        "semana_id": row[0],
+                        "fecha_inicio": datetime.strptime(row[1], "%Y-%m-%d").date(),
+                        "fecha_fin": datetime.strptime(row[2], "%Y-%m-%d").date(),
+                        "total_ventas": total_ventas,
+                        "costos_fijos_semanales": costos_fijos_semanales,
+                        "costos_variables": total_costos_variables,
+                        "margen_neto": margen_neto,
+                        "porcentaje_margen": porcentaje_margen,
+                    }
+                )
+            return serie
+
+    except Exception as e:
+        print(f"Error en get_margen_neto_serie: {e}")
+        return []
+
+
+# ========== BÚSQUEDA GLOBAL ==========
+
+
+def _consulta_fts(texto: str) -> str:
+    """
+    Convierte el texto del usuario en una consulta FTS5: cada palabra entre
+    comillas (sin operadores ni sintaxis especial) y como prefijo
+    """
+    return " ".join(
+        '"' + palabra.replace('"', '""') + '"*' for palabra in texto.split()
+    )
+
+
+def buscar_global(texto: str, limite: int = 50) -> List[dict]:
+    """
+    Busca el texto en productos, compras y cuentas por cobrar y por pagar
+
+    Todas las palabras deben aparecer (como prefijo, sin distinguir mayúsculas
+    ni acentos). Los resultados se ordenan por relevancia (bm25), con más peso
+    para el nombre que para la descripción.
+
+    Returns:
+        List[dict]: entidad ("producto", "compra", "cobrar" o "pagar"), id de
+        la fila, titulo, descripcion y fecha
+    """
+    consulta = _consulta_fts(texto)
+    if not consulta:
+        return []
+    try:
+        with Database().get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT entidad, rowid / 4, titulo, descripcion, fecha
+                FROM busqueda
+                WHERE busqueda MATCH ?
+                ORDER BY bm25(busqueda, 0.0, 10.0, 1.0, 0.0)
+                LIMIT ?
+            """,
+                (consulta, limite),
+            )
+            return [
+                {
+                    "entidad": row[0],
+                    "id": row[1],
+                    "titulo": row[2],
+                    "descripcion": row[3],
+                    "fecha": row[4],
+                }
+                for row in cursor.fetchall()
+            ]
+    except Exception as e:
+        print(f"Error en buscar_global: {e}")
+        return []
+
+
+# ========== ACCESO ASÍNCRONO ==========
+
+# Conexiones (e hilos) compartidos por las tareas asíncronas de cada base de datos
+TAMANO_POOL_CONEXIONES = int(os.environ.get("SISTEMA_GESTION_POOL_CONEXIONES", 4))
+
+# Conexión del pool prestada al hilo actual (ver Database.get_connection)
+_prestamo = threading.local()
+
+_clases_conexion_pool = {}
+
+
+def _clase_conexion_pool(base):
+    """Subclase de la conexión cuyo close() no cierra: la conexión vuelve al pool"""
+    if base not in _clases_conexion_pool:
+
+        class ConexionDelPool(base):
+            def close(self):
+                pass
+
+            def cerrar_realmente(self):
+                super().close()
+
+        _clases_conexion_pool[base] = ConexionDelPool
+    return _clases_conexion_pool[base]
+
+
+class PoolConexiones:
+    """
+    Pool acotado de conexiones a una base de datos
+
+    Las conexiones se crean a medida que hacen falta, hasta el tamaño del
+    pool; cuando están todas prestadas, prestar() espera a que se devuelva
+    una. Mientras una conexión está prestada, Database.get_connection() la
+    devuelve en ese hilo, de modo que los métodos de los modelos la usan sin
+    cambios. Al devolverla se deshace cualquier transacción que haya quedado
+    abierta.
+    """
+
+    def __init__(self, db_path, tamano=TAMANO_POOL_CONEXIONES):
+        self.db_path = Path(db_path)
+        self.tamano = tamano
+        self._libres = queue.LifoQueue()
+        self._creadas = 0
+        self._lock = threading.Lock()
+
+    def _obtener(self):
+        with self._lock:
+            if self._libres.empty() and self._creadas < self.tamano:
+                self._creadas += 1
+                clase = _clase_conexion_pool(instrumentacion.fabrica_conexion())
+                return Database(self.db_path).nueva_conexion(
+                    clase=clase, check_same_thread=False
+                )
+        return self._libres.get()
+
+    @contextmanager
+    def prestar(self):
+        """Presta una conexión al hilo actual mientras dura el bloque"""
+        conn = self._obtener()
+        _prestamo.conn, _prestamo.ruta = conn, self.db_path.resolve()
+        try:
+            yield conn
+        finally:
+            _prestamo.conn = _prestamo.ruta = None
+            if conn.in_transaction:
+                conn.rollback()
+            self._libres.put(conn)
+
+    def cerrar(self):
+        """Cierra las conexiones libres del pool"""
+        while True:
+            try:
+                self._libres.get_nowait().cerrar_realmente()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._creadas -= 1
+
+
+_pools = {}
+_ejecutor_async = None
+_lock_async = threading.Lock()
+
+
+def get_pool(db_path=None) -> PoolConexiones:
+    """Pool de conexiones de la base de datos (por defecto la de la aplicación)"""
+    ruta = Path(db_path or Database.db_path_por_defecto).resolve()
+    with _lock_async:
+        if ruta not in _pools:
+            _pools[ruta] = PoolConexiones(ruta)
+        return _pools[ruta]
+
+
+def _get_ejecutor_async():
+    global _ejecutor_async
+    with _lock_async:
+        if _ejecutor_async is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            # Un hilo por conexión: las tareas esperan su turno en orden de
+            # llegada en lugar de competir por el bloqueo de SQLite
+            _ejecutor_async = ThreadPoolExecutor(
+                max_workers=TAMANO_POOL_CONEXIONES, thread_name_prefix="db-async"
+            )
+        return _ejecutor_async
+
+
+def _con_conexion_del_pool(funcion, args, kwargs):
+    Database()  # inicializa la base de datos si hace falta
+    with get_pool().prestar():
+        return funcion(*args, **kwargs)
+
+
+def asincrono(funcion):
+    """
+    Versión asíncrona de una función de acceso a datos
+
+    La función se ejecuta en un hilo del ejecutor con una conexión del pool,
+    sin bloquear el bucle de eventos.
+    """
+
+    @functools.wraps(funcion)
+    async def envoltura(*args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _get_ejecutor_async(),
+            functools.partial(_con_conexion_del_pool, funcion, args, kwargs),
+        )
+
+    return envoltura
+
+
+def _agregar_metodos_asincronos(clase, nombres):
+    """Agrega a<método> por cada método del modelo indicado (p. ej. aget_all)"""
+    for nombre in nombres:
+        atributo = vars(clase)[nombre]
+        if isinstance(atributo, staticmethod):
+            setattr(clase, f"a{nombre}", staticmethod(asincrono(atributo.__func__)))
+        else:
+            setattr(clase, f"a{nombre}", asincrono(atributo))
+
+
+# Métodos que consultan o guardan en la base de datos. Los cálculos en memoria
+# (calcular_margen, invalidar_indice, ...) no pasan por el pool.
+METODOS_ASINCRONOS = {
+    Categoria: (
+        "get_all",
+        "get_by_id",
+        "get_productos",
+        "get_total_productos",
+        "get_count_productos",
+        "mover_productos_a_categoria",
+        "save",
+        "delete",
+    ),
+    Producto: (
+        "get_all",
+        "get_by_id",
+        "get_by_codigo",
+        "get_by_categoria",
+        "buscar_por_prefijo",
+        "get_productos_agrupados_por_categoria",
+        "save",
+        "delete",
+    ),
+    Compra: ("get_all", "get_by_id", "get_pagina", "save", "delete"),
+    Semana: (
+        "get_all",
+        "get_by_id",
+        "get_pagina",
+        "verificar_solapamiento",
+        "generar_calendario",
+        "save",
+        "delete",
+    ),
+    Costo: (
+        "get_all",
+        "get_by_id",
+        "get_by_tipo",
+        "get_pagina",
+        "get_total_por_tipo",
+        "get_total_general",
+        "save",
+        "delete",
+    ),
+    Venta: (
+        "get_all",
+        "get_by_id",
+        "get_by_semana",
+        "get_by_producto",
+        "get_pagina",
+        "get_total_cantidad_producto",
+        "get_total_monto_semana",
+        "guardar_lote",
+        "save",
+        "delete",
+    ),
+    TransaccionVenta: (
+        "registrar",
+        "registrar_lote",
+        "get_pendientes",
+        "get_pendiente_producto",
+        "consolidar",
+    ),
+    CuentaCobrar: ("get_all", "get_by_id", "get_pagina", "get_total", "save", "delete"),
+    CuentaPagar: ("get_all", "get_by_id", "get_pagina", "get_total", "save", "delete"),
+}
+
+for _modelo, _metodos in METODOS_ASINCRONOS.items():
+    _agregar_metodos_asincronos(_modelo, _metodos)
+
+aget_total_compras_rango = asincrono(get_total_compras_rango)
+aget_total_ventas_rango = asincrono(get_total_ventas_rango)
+aget_margen_neto_semana = asincrono(get_margen_neto_semana)
+aget_margen_neto_rango = asincrono(get_margen_neto_rango)
+aget_margen_neto_serie = asincrono(get_margen_neto_serie)
+abuscar_global = asincrono(buscar_global)
+
+
 # Instancia global de la base de datos
 db = Database()
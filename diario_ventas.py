@@ -0,0 +1,334 @@
+"""
+Diario de ventas con escritura anticipada
+
+Guardar cada venta con Venta.save confirma una transacción de SQLite por
+venta. Con el diario activo, una venta nueva se agrega como un registro al
+final de un archivo local (una línea con su CRC32) y queda aceptada en ese
+momento; vaciar() la aplica después junto con las demás en una sola
+transacción (Venta.guardar_lote), que también guarda en marcas_procesamiento
+el número del último registro aplicado.
+
+Recuperación: al abrir el diario se leen los registros válidos, se descarta
+una última línea incompleta (escritura cortada por un corte de luz o un
+cierre forzado) y quedan pendientes los registros posteriores a la marca
+guardada en SQLite, de modo que ninguno se aplica dos veces ni se pierde.
+Cuando todo está aplicado el archivo se vacía.
+
+Una venta aceptada cuya semana o producto se eliminó antes de aplicarla no se
+puede guardar: queda registrada en <ruta>.descartadas (una línea JSON por
+venta) para revisarla a mano.
+
+Se activa con la variable de entorno SISTEMA_GESTION_DIARIO_VENTAS (ruta del
+archivo). Solo un proceso a la vez puede usar el mismo diario (se bloquea
+el archivo <ruta>.lock, que queda junto al diario).
+
+Uso (aplicar los registros pendientes sin abrir la ventana de ventas):
+    python diario_ventas.py [ruta]
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import zlib
+from pathlib import Path
+
+from database import Venta, get_marca_procesamiento
+
+# Registros aplicados como máximo por transacción
+LOTE_VACIADO = 500
+
+# Proceso del diario en marcas_procesamiento
+PROCESO = "diario_ventas"
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class DiarioDanado(Exception):
+    """El diario tiene un registro inválido que no es la última línea"""
+
+
+class DiarioEnUso(Exception):
+    """Otro proceso tiene abierto el mismo diario"""
+
+
+def _codificar(registro: dict) -> bytes:
+    datos = json.dumps(registro, separators=(",", ":")).encode("utf-8")
+    return b"%08x %s\n" % (zlib.crc32(datos), datos)
+
+
+def _decodificar(linea: bytes):
+    """Registro de la línea, o None si está incompleta o no coincide su CRC"""
+    if not linea.endswith(b"\n"):
+        return None
+    try:
+        suma, datos = linea[:-1].split(b" ", 1)
+        if int(suma, 16) != zlib.crc32(datos):
+            return None
+        return json.loads(datos)
+    except ValueError:
+        return None
+
+
+def leer_registros(ruta: Path):
+    """
+    Lee los registros válidos del diario
+
+    Returns:
+        (registros, bytes válidos): si el archivo termina en una línea
+        inválida, los bytes válidos son menos que el tamaño del archivo
+
+    Raises:
+        DiarioDanado: si hay una línea inválida seguida de otras
+    """
+    registros = []
+    validos = 0
+    if not ruta.exists():
+        return registros, validos
+    with open(ruta, "rb") as archivo:
+        for linea in archivo:
+            registro = _decodificar(linea)
+            if registro is None:
+                if archivo.read(1):
+                    raise DiarioDanado(
+                        f"Registro inválido en el byte {validos} de {ruta}"
+                    )
+                break
+            registros.append(registro)
+            validos += len(linea)
+    return registros, validos
+
+
+class DiarioVentas:
+    """Archivo de ventas aceptadas pendientes de guardar en la base de datos"""
+
+    def __init__(self, ruta, sincronizar=True):
+        """
+        Args:
+            ruta: archivo del diario (se crea si no existe)
+            sincronizar: hacer fsync de cada registro (sin él, un corte de luz
+                puede perder los últimos registros, no así un cierre del
+                programa)
+
+        Raises:
+            DiarioEnUso, DiarioDanado
+        """
+        self.ruta = Path(ruta)
+        self.ruta_descartadas = self.ruta.with_name(self.ruta.name + ".descartadas")
+        self.sincronizar = sincronizar
+        # Ventas descartadas al aplicar desde que se abrió el diario
+        self.descartadas = 0
+        self._lock = threading.Lock()
+        self._lock_vaciado = threading.Lock()
+
+        # El bloqueo va en un archivo aparte: en Windows una región bloqueada
+        # con msvcrt no se puede leer desde otro descriptor, ni siquiera del
+        # mismo proceso, y leer_registros() abre el diario por separado
+        self._bloqueo = open(self.ruta.with_name(self.ruta.name + ".lock"), "ab")
+        try:
+            self._bloquear()
+        except Exception:
+            self._bloqueo.close()
+            raise
+
+        self._archivo = open(self.ruta, "ab")
+        try:
+            registros, validos = leer_registros(self.ruta)
+            if validos < self.ruta.stat().st_size:
+                # Última escritura incompleta: nunca se aceptó esa venta
+                print("Diario de ventas: se descarta una línea incompleta")
+                self._archivo.truncate(validos)
+
+            aplicado = get_marca_procesamiento(PROCESO)
+            self._pendientes = [r for r in registros if r["n"] > aplicado]
+            ultimo = registros[-1]["n"] if registros else 0
+            self._siguiente = max(ultimo, aplicado) + 1
+        except Exception:
+            self._archivo.close()
+            self._desbloquear()
+            raise
+
+    def _bloquear(self):
+        try:
+            if fcntl:
+                fcntl.flock(self._bloqueo.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                self._bloqueo.seek(0)
+                msvcrt.locking(self._bloqueo.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            raise DiarioEnUso(f"El diario {self.ruta} está en uso por otro proceso")
+
+    def _desbloquear(self):
+        """Libera el bloqueo y cierra su archivo"""
+        try:
+            if not fcntl:
+                self._bloqueo.seek(0)
+                msvcrt.locking(self._bloqueo.fileno(), msvcrt.LK_UNLCK, 1)
+        except OSError:
+            pass
+        self._bloqueo.close()
+
+    @property
+    def pendientes(self) -> int:
+        with self._lock:
+            return len(self._pendientes)
+
+    def pendiente_de(self, producto_id) -> int:
+        """
+        Unidades del producto aceptadas en el diario y todavía no descontadas
+        del inventario en la base de datos
+        """
+        with self._lock:
+            return sum(
+                r["cantidad"]
+                for r in self._pendientes
+                if r["producto_id"] == producto_id
+            )
+
+    def registrar(self, venta: Venta) -> int:
+        """
+        Acepta una venta nueva agregándola al diario
+
+        Returns:
+            int: número del registro
+        """
+        if not venta.semana_id:
+            raise Exception("Debe seleccionar una semana")
+        if not venta.producto_id:
+            raise Exception("Debe seleccionar un producto")
+        if venta.cantidad_vendida <= 0:
+            raise Exception("La cantidad vendida debe ser mayor a 0")
+        if venta.monto <= 0:
+            raise Exception("El monto debe ser mayor a 0")
+
+        with self._lock:
+            registro = {
+                "n": self._siguiente,
+                "semana_id": venta.semana_id,
+                "producto_id": venta.producto_id,
+                "cantidad": venta.cantidad_vendida,
+                "monto": venta.monto,
+            }
+            try:
+                self._archivo.write(_codificar(registro))
+                self._archivo.flush()
+                if self.sincronizar:
+                    os.fsync(self._archivo.fileno())
+            except Exception as e:
+                raise Exception(f"Error al registrar venta en el diario: {str(e)}")
+            self._siguiente += 1
+            self._pendientes.append(registro)
+            return registro["n"]
+
+    def vaciar(self) -> int:
+        """
+        Aplica en la base de datos todos los registros pendientes, en
+        transacciones de hasta LOTE_VACIADO registros
+
+        Returns:
+            int: ventas guardadas (sin contar las descartadas)
+        """
+        aplicados = 0
+        with self._lock_vaciado:
+            while True:
+                with self._lock:
+                    lote = self._pendientes[:LOTE_VACIADO]
+                if not lote:
+                    break
+
+                ventas = [
+                    Venta(
+                        semana_id=r["semana_id"],
+                        producto_id=r["producto_id"],
+                        cantidad_vendida=r["cantidad"],
+                        monto=r["monto"],
+                    )
+                    for r in lote
+                ]
+                Venta.guardar_lote(ventas, (PROCESO, lote[-1]["n"]))
+                # guardar_lote deja sin id las ventas que no pudo guardar
+                descartadas = [r for r, v in zip(lote, ventas) if v.id is None]
+                if descartadas:
+                    self._guardar_descartadas(descartadas)
+                aplicados += len(lote) - len(descartadas)
+
+                with self._lock:
+                    del self._pendientes[: len(lote)]
+                    if not self._pendientes:
+                        # Todo aplicado: el diario puede empezar de cero
+                        self._archivo.truncate(0)
+                        if self.sincronizar:
+                            os.fsync(self._archivo.fileno())
+        return aplicados
+
+    def _guardar_descartadas(self, registros):
+        print(
+            f"Diario de ventas: {len(registros)} ventas descartadas (semana o "
+            f"producto eliminado), ver {self.ruta_descartadas}"
+        )
+        try:
+            with open(self.ruta_descartadas, "a", encoding="utf-8") as archivo:
+                for registro in registros:
+                    archivo.write(json.dumps(registro) + "\n")
+        except OSError as e:
+            print(f"Error al guardar ventas descartadas: {e}")
+        self.descartadas += len(registros)
+
+    def cerrar(self):
+        """Cierra el archivo (los registros pendientes quedan en el diario)"""
+        with self._lock:
+            if not self._archivo.closed:
+                self._archivo.close()
+                self._desbloquear()
+
+
+def abrir_diario_configurado():
+    """
+    Abre el diario indicado en SISTEMA_GESTION_DIARIO_VENTAS
+
+    Returns:
+        DiarioVentas o None si no está configurado o no se pudo abrir (las
+        ventas se guardan entonces directamente)
+    """
+    ruta = os.environ.get("SISTEMA_GESTION_DIARIO_VENTAS")
+    if not ruta:
+        return None
+    try:
+        return DiarioVentas(ruta)
+    except Exception as e:
+        print(f"Diario de ventas desactivado: {e}")
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Aplica en la base de datos las ventas pendientes del diario"
+    )
+    parser.add_argument(
+        "ruta",
+        nargs="?",
+        default=os.environ.get("SISTEMA_GESTION_DIARIO_VENTAS"),
+        help="Archivo del diario (por defecto SISTEMA_GESTION_DIARIO_VENTAS)",
+    )
+    args = parser.parse_args()
+    if not args.ruta:
+        parser.error("indique la ruta del diario")
+
+    try:
+        diario = DiarioVentas(args.ruta)
+    except (DiarioEnUso, DiarioDanado) as e:
+        print(e)
+        sys.exit(1)
+    try:
+        print(f"Registros aplicados: {diario.vaciar()}")
+    finally:
+        diario.cerrar()
+
+
+if __name__ == "__main__":
+    main()
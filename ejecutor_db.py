@@ -0,0 +1,195 @@
+"""
+Ejecutor de consultas en segundo plano para las ventanas Tk
+
+Las ventanas envían funciones de acceso a datos a un hilo dedicado y reciben
+el resultado en el hilo de Tk mediante root.after, de modo que la interfaz no
+se congela mientras SQLite trabaja. Los modelos abren su propia conexión en
+cada llamada, por lo que el hilo trabaja siempre con conexiones propias.
+
+Cada envío puede llevar una clave: una nueva solicitud con la misma clave
+reemplaza a la anterior, que se descarta si aún no empezó y cuyo resultado se
+ignora si ya estaba en curso (por ejemplo, varios clics seguidos en
+"Calcular"). Mientras hay trabajo pendiente se muestra un indicador de
+ocupado (cursor de espera y, opcionalmente, un texto en una etiqueta).
+
+Con el perfilado de ventanas activo, el tiempo de cada solicitud en el hilo
+de datos y el de su callback se atribuyen a la acción que la envió.
+"""
+
+import itertools
+import queue
+import threading
+import time
+
+from instrumentacion import (
+    accion_en_curso,
+    en_accion,
+    registrar_trabajo_en_fondo,
+    registro,
+)
+
+# Cada cuánto revisa el hilo de Tk si hay resultados (ms)
+INTERVALO_SONDEO_MS = 30
+
+
+class Solicitud:
+    """Trabajo enviado al ejecutor"""
+
+    def __init__(self, numero, clave, funcion, args, al_terminar, al_fallar):
+        self.numero = numero
+        self.clave = clave
+        self.funcion = funcion
+        self.args = args
+        self.al_terminar = al_terminar
+        self.al_fallar = al_fallar
+        self.resultado = None
+        self.error = None
+        # Acción perfilada que la envió (None sin perfilado)
+        self.accion = accion_en_curso()
+        self.segundos_hilo = 0.0
+        self.segundos_sql = 0.0
+
+
+class EjecutorDB:
+    """Hilo de acceso a datos asociado a una ventana"""
+
+    def __init__(self, root, indicador=None, texto_ocupado="Cargando..."):
+        """
+        Args:
+            root: ventana Tk que recibe los resultados
+            indicador: etiqueta opcional donde mostrar el estado ocupado
+        """
+        self.root = root
+        self.indicador = indicador
+        self.texto_ocupado = texto_ocupado
+
+        self._pendientes = queue.Queue()
+        self._terminadas = queue.Queue()
+        self._numeros = itertools.count(1)
+        self._vigentes = {}  # clave -> número de la última solicitud
+        self._lock = threading.Lock()
+        self._en_vuelo = 0
+        self._sondeo_id = None
+        self._cerrado = False
+
+        self._hilo = threading.Thread(
+            target=self._trabajar, name="ejecutor-db", daemon=True
+        )
+        self._hilo.start()
+        self.root.bind("<Destroy>", self._al_destruir, add="+")
+
+    @property
+    def ocupado(self) -> bool:
+        return self._en_vuelo > 0
+
+    def enviar(self, funcion, *args, al_terminar=None, al_fallar=None, clave=None):
+        """
+        Ejecuta funcion(*args) en el hilo de datos
+
+        al_terminar(resultado) y al_fallar(excepción) se llaman en el hilo de
+        Tk. Si no se indica al_fallar, el error se imprime en la consola.
+        """
+        if self._cerrado:
+            return None
+
+        numero = next(self._numeros)
+        if clave is not None:
+            with self._lock:
+                self._vigentes[clave] = numero
+
+        solicitud = Solicitud(numero, clave, funcion, args, al_terminar, al_fallar)
+        self._en_vuelo += 1
+        self._actualizar_indicador()
+        self._pendientes.put(solicitud)
+        if self._sondeo_id is None:
+            self._sondeo_id = self.root.after(INTERVALO_SONDEO_MS, self._sondear)
+        return numero
+
+    def cancelar(self, clave):
+        """Descarta la solicitud pendiente o en curso con esa clave"""
+        with self._lock:
+            self._vigentes[clave] = None
+
+    def _es_vigente(self, solicitud) -> bool:
+        if solicitud.clave is None:
+            return True
+        with self._lock:
+            return self._vigentes.get(solicitud.clave) == solicitud.numero
+
+    def _trabajar(self):
+        """Bucle del hilo de datos"""
+        while True:
+            solicitud = self._pendientes.get()
+            if solicitud is None:
+                return
+            # Reemplazada antes de empezar: no consultar la base de datos
+            if self._es_vigente(solicitud):
+                sql_inicial = registro.segundos_hilo()
+                inicio = time.perf_counter()
+                try:
+                    solicitud.resultado = solicitud.funcion(*solicitud.args)
+                except Exception as e:
+                    solicitud.error = e
+                solicitud.segundos_hilo = time.perf_counter() - inicio
+                solicitud.segundos_sql = registro.segundos_hilo() - sql_inicial
+            self._terminadas.put(solicitud)
+
+    def _sondear(self):
+        """Entrega los resultados terminados en el hilo de Tk"""
+        self._sondeo_id = None
+        while True:
+            try:
+                solicitud = self._terminadas.get_nowait()
+            except queue.Empty:
+                break
+
+            self._en_vuelo -= 1
+            if not self._es_vigente(solicitud):
+                continue
+            inicio = time.perf_counter()
+            try:
+                # Lo que el callback vuelva a enviar también es de la acción
+                with en_accion(solicitud.accion):
+                    if solicitud.error is not None:
+                        if solicitud.al_fallar:
+                            solicitud.al_fallar(solicitud.error)
+                        else:
+                            print(
+                                f"Error en consulta en segundo plano: {solicitud.error}"
+                            )
+                    elif solicitud.al_terminar:
+                        solicitud.al_terminar(solicitud.resultado)
+            except Exception as e:
+                print(f"Error al mostrar resultado: {e}")
+            if solicitud.accion is not None:
+                registrar_trabajo_en_fondo(
+                    solicitud.accion,
+                    solicitud.segundos_sql,
+                    solicitud.segundos_hilo,
+                    time.perf_counter() - inicio,
+                )
+
+        self._actualizar_indicador()
+        if self._en_vuelo > 0 and not self._cerrado:
+            self._sondeo_id = self.root.after(INTERVALO_SONDEO_MS, self._sondear)
+
+    def _actualizar_indicador(self):
+        if self._cerrado:
+            return
+        try:
+            self.root.config(cursor="watch" if self.ocupado else "")
+            if self.indicador is not None:
+                self.indicador.config(text=self.texto_ocupado if self.ocupado else "")
+        except Exception:
+            pass
+
+    def _al_destruir(self, event):
+        # <Destroy> también llega por cada widget hijo
+        if event.widget is self.root:
+            self.cerrar()
+
+    def cerrar(self):
+        """Detiene el hilo de datos"""
+        if not self._cerrado:
+            self._cerrado = True
+            self._pendientes.put(None)
@@ -0,0 +1,303 @@
+"""
+Generador de datos sintéticos para pruebas de rendimiento
+
+Crea una base de datos nueva con categorías, productos, semanas, compras,
+ventas, costos y cuentas por cobrar/pagar a distintas escalas. Los datos son
+deterministas para una misma semilla, por lo que las mediciones se pueden
+repetir y comparar entre versiones.
+
+Se respetan las reglas de inventario de la aplicación: las ventas de cada
+producto nunca superan su inventario y la cantidad final de cada producto es
+el inventario inicial menos lo vendido (siempre >= 0).
+
+Uso:
+    python generador_datos.py --escala mediana --semilla 1 --salida datos.db
+"""
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from database import Database
+
+# Cantidades por escala
+ESCALAS = {
+    "pequena": {
+        "categorias": 10,
+        "productos": 200,
+        "anios": 1,
+        "ventas": 10_000,
+        "compras": 2_000,
+        "costos": 20,
+        "cuentas": 100,
+    },
+    "mediana": {
+        "categorias": 50,
+        "productos": 1_000,
+        "anios": 5,
+        "ventas": 100_000,
+        "compras": 20_000,
+        "costos": 50,
+        "cuentas": 1_000,
+    },
+    "grande": {
+        "categorias": 200,
+        "productos": 5_000,
+        "anios": 10,
+        "ventas": 1_000_000,
+        "compras": 200_000,
+        "costos": 100,
+        "cuentas": 5_000,
+    },
+}
+
+# Última fecha de los datos generados (fija para que sean deterministas)
+FECHA_FINAL = date(2025, 12, 28)
+
+TAMANO_LOTE = 50_000
+
+NOMBRES = ["Ana", "Luis", "María", "Jorge", "Carmen", "Pedro", "Rosa", "Carlos"]
+APELLIDOS = ["García", "Pérez", "López", "Díaz", "Martínez", "Gómez", "Ruiz"]
+PRODUCTOS_BASE = ["Arroz", "Frijol", "Aceite", "Azúcar", "Café", "Jabón", "Pan"]
+PROVEEDORES = ["Distribuidora", "Mayorista", "Almacén", "Importadora"]
+
+
+def _fecha(valor: date) -> str:
+    return valor.strftime("%Y-%m-%d")
+
+
+def _insertar_por_lotes(cursor, sql, filas):
+    """Inserta las filas con executemany en lotes para acotar la memoria"""
+    lote = []
+    for fila in filas:
+        lote.append(fila)
+        if len(lote) >= TAMANO_LOTE:
+            cursor.executemany(sql, lote)
+            lote = []
+    if lote:
+        cursor.executemany(sql, lote)
+
+
+def generar(ruta, escala: str = "pequena", semilla: int = 0) -> dict:
+    """
+    Genera una base de datos sintética en la ruta indicada
+
+    Returns:
+        dict: cantidad de filas creadas por tabla
+    """
+    ruta = Path(ruta)
+    if ruta.exists():
+        raise Exception(f"El archivo {ruta} ya existe")
+
+    config = ESCALAS[escala]
+    rnd = random.Random(semilla)
+
+    # Crear el esquema con la misma definición que usa la aplicación
+    db = Database(ruta)
+
+    conn = db.get_connection()
+    try:
+        # La base de datos es desechable: priorizar la velocidad de carga
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("PRAGMA journal_mode = MEMORY")
+        cursor = conn.cursor()
+        conn.execute("BEGIN")
+
+        # Categorías (la categoría por defecto ya existe)
+        categorias = [f"Categoría {i:03d}" for i in range(1, config["categorias"])]
+        cursor.executemany(
+            "INSERT INTO categorias (nombre) VALUES (?)",
+            [(nombre,) for nombre in categorias],
+        )
+        categorias_ids = [row[0] for row in cursor.execute("SELECT id FROM categorias")]
+
+        # Semanas consecutivas de lunes a domingo hasta FECHA_FINAL
+        num_semanas = config["anios"] * 52
+        primer_lunes = FECHA_FINAL - timedelta(weeks=num_semanas, days=-1)
+        semanas = [
+            (
+                i + 1,
+                _fecha(primer_lunes + timedelta(weeks=i)),
+                _fecha(primer_lunes + timedelta(weeks=i, days=6)),
+            )
+            for i in range(num_semanas)
+        ]
+        cursor.executemany(
+            "INSERT INTO semanas (id, fecha_inicio, fecha_fin) VALUES (?, ?, ?)",
+            semanas,
+        )
+
+        # Productos: primero se generan las ventas para conocer lo vendido
+        productos = []
+        for i in range(1, config["productos"] + 1):
+            costo = round(rnd.uniform(0.5, 50.0), 2)
+            precio = round(costo * rnd.uniform(1.1, 1.8), 2)
+            productos.append(
+                {
+                    "id": i,
+                    "nombre": f"{rnd.choice(PRODUCTOS_BASE)} {i:05d}",
+                    "categoria_id": rnd.choice(categorias_ids),
+                    "costo": costo,
+                    "precio": precio,
+                }
+            )
+
+        # Ventas: como máximo una fila por (semana, producto)
+        por_semana = min(config["productos"], -(-config["ventas"] // num_semanas))
+        ventas = []
+        restantes = config["ventas"]
+        for semana_id, _, _ in semanas:
+            cantidad_semana = min(por_semana, restantes)
+            for producto in rnd.sample(productos, cantidad_semana):
+                cantidad = rnd.randint(1, 20)
+                monto = round(cantidad * producto["precio"], 2)
+                ventas.append((semana_id, producto["id"], cantidad, monto))
+            restantes -= cantidad_semana
+            if restantes <= 0:
+                break
+
+        # El inventario inicial cubre todo lo vendido; la cantidad actual es lo
+        # que queda después de las ventas
+        _insertar_por_lotes(
+            cursor,
+            """
+            INSERT INTO productos
+            (id, nombre, categoria_id, costo, precio_venta, cantidad, margen_bruto,
+             codigo)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+            (
+                (
+                    p["id"],
+                    p["nombre"],
+                    p["categoria_id"],
+                    p["costo"],
+                    p["precio"],
+                    rnd.randint(0, 200),
+                    round(p["precio"] - p["costo"], 2),
+                    # Código de 13 dígitos con el formato de un EAN-13
+                    f"779{p['id']:010d}",
+                )
+                for p in productos
+            ),
+        )
+        _insertar_por_lotes(
+            cursor,
+            """
+            INSERT INTO ventas (semana_id, producto_id, cantidad_vendida, monto)
+            VALUES (?, ?, ?, ?)
+        """,
+            ventas,
+        )
+
+        # Compras distribuidas a lo largo de todo el período
+        dias_periodo = num_semanas * 7
+
+        def filas_compras():
+            for _ in range(config["compras"]):
+                producto = rnd.choice(productos)
+                cantidad = rnd.randint(10, 500)
+                merma = rnd.randint(0, cantidad // 20)
+                yield (
+                    producto["nombre"],
+                    round(cantidad * producto["costo"], 2),
+                    cantidad,
+                    merma,
+                    _fecha(primer_lunes + timedelta(days=rnd.randrange(dias_periodo))),
+                )
+
+        _insertar_por_lotes(
+            cursor,
+            """
+            INSERT INTO compras
+            (producto_nombre, costo_total, cantidad_elementos, merma, fecha_compra)
+            VALUES (?, ?, ?, ?, ?)
+        """,
+            filas_compras(),
+        )
+
+        # Costos fijos y variables
+        costos = [
+            (
+                f"Costo {i:03d}",
+                round(rnd.uniform(10, 2000), 2),
+                "fijo" if i % 2 else "variable",
+            )
+            for i in range(config["costos"])
+        ]
+        cursor.executemany(
+            "INSERT INTO costos (nombre, cantidad, tipo) VALUES (?, ?, ?)", costos
+        )
+
+        # Cuentas por cobrar y por pagar
+        def filas_cuentas(nombres):
+            for i in range(config["cuentas"]):
+                yield (
+                    f"{rnd.choice(nombres)} {rnd.choice(APELLIDOS)} {i:05d}",
+                    round(rnd.uniform(5, 5000), 2),
+                    f"Cuenta generada {i}",
+                    _fecha(primer_lunes + timedelta(days=rnd.randrange(dias_periodo))),
+                )
+
+        _insertar_por_lotes(
+            cursor,
+            """
+            INSERT INTO cuentas_cobrar
+            (nombre_persona, cantidad, descripcion, fecha_creacion)
+            VALUES (?, ?, ?, ?)
+        """,
+            filas_cuentas(NOMBRES),
+        )
+        _insertar_por_lotes(
+            cursor,
+            """
+            INSERT INTO cuentas_pagar
+            (nombre_proveedor, cantidad, descripcion, fecha_creacion)
+            VALUES (?, ?, ?, ?)
+        """,
+            filas_cuentas(PROVEEDORES),
+        )
+
+        conn.commit()
+        conn.execute("ANALYZE")
+
+        return {
+            "categorias": len(categorias) + 1,
+            "productos": len(productos),
+            "semanas": len(semanas),
+            "ventas": len(ventas),
+            "compras": config["compras"],
+            "costos": len(costos),
+            "cuentas_cobrar": config["cuentas"],
+            "cuentas_pagar": config["cuentas"],
+        }
+
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Genera una base de datos sintética para pruebas de rendimiento"
+    )
+    parser.add_argument("--escala", choices=sorted(ESCALAS), default="pequena")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--salida", required=True, help="Archivo .db a crear")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    totales = generar(args.salida, args.escala, args.semilla)
+    segundos = time.perf_counter() - inicio
+
+    for tabla, cantidad in totales.items():
+        print(f"{tabla:<16}{cantidad:>10}")
+    print(f"Generado en {segundos:.1f} s: {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,456 @@
+"""
+Instrumentación de las consultas SQL de la aplicación
+
+Cuando está activa, las conexiones creadas por Database.get_connection usan un
+cursor que mide cada sentencia: tiempo de ejecución (incluida la lectura de
+filas), cantidad de filas y método del modelo que la ejecutó. Las sentencias
+que superan el umbral se escriben en un log rotativo y al terminar el proceso
+se puede volcar un reporte con las sentencias más costosas.
+
+También ofrece perfilar_ventana, que mide las acciones de las ventanas
+(load_*, save_*, delete_*, ...) separando el tiempo en SQL, Python y layout de
+Tk, y opcionalmente guarda un perfil de cProfile por acción.
+
+Se configura con variables de entorno (los módulos se abren como procesos
+independientes desde main.py y las heredan):
+
+    SISTEMA_GESTION_PERFIL_SQL=1        activa la instrumentación
+    SISTEMA_GESTION_SQL_LENTO_MS=100    umbral del log de consultas lentas
+    SISTEMA_GESTION_SQL_REPORTE=20      sentencias del reporte al salir (0 = sin reporte)
+    SISTEMA_GESTION_PERFIL_UI=1         mide las acciones de las ventanas
+    SISTEMA_GESTION_PERFIL_UI_DIR=ruta  guarda un .prof de cProfile por acción
+"""
+
+import atexit
+import contextlib
+import cProfile
+import functools
+import logging
+import logging.handlers
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+DIRECTORIO_LOGS = Path(__file__).parent / "logs"
+
+
+class EstadisticaSentencia:
+    """Acumulado de ejecuciones de una sentencia desde un mismo método"""
+
+    def __init__(self):
+        self.ejecuciones = 0
+        self.errores = 0
+        self.total_segundos = 0.0
+        self.max_segundos = 0.0
+        self.filas = 0
+
+    def agregar(self, segundos, filas, error=False):
+        self.ejecuciones += 1
+        self.errores += 1 if error else 0
+        self.total_segundos += segundos
+        self.max_segundos = max(self.max_segundos, segundos)
+        self.filas += filas
+
+
+class RegistroConsultas:
+    """Registro de latencias por sentencia y log de consultas lentas"""
+
+    def __init__(self, umbral_lento_ms=100.0):
+        self.umbral_lento_ms = umbral_lento_ms
+        self.estadisticas = {}
+        self._lock = threading.Lock()
+        self._hilo = threading.local()
+        self._logger = None
+
+    def _get_logger(self):
+        if self._logger is None:
+            DIRECTORIO_LOGS.mkdir(exist_ok=True)
+            logger = logging.getLogger("sistema_gestion.sql_lento")
+            if not logger.handlers:
+                handler = logging.handlers.RotatingFileHandler(
+                    DIRECTORIO_LOGS / "consultas_lentas.log",
+                    maxBytes=1_000_000,
+                    backupCount=5,
+                    encoding="utf-8",
+                )
+                handler.setFormatter(
+                    logging.Formatter("%(asctime)s %(levelname)s %(message)s")
+                )
+                logger.addHandler(handler)
+                logger.setLevel(logging.INFO)
+                logger.propagate = False
+            self._logger = logger
+        return self._logger
+
+    def registrar(self, sql, segundos, filas, metodo, error=None):
+        """Registra una ejecución y la escribe en el log si es lenta o falló"""
+        self._hilo.segundos = self.segundos_hilo() + segundos
+        sql = normalizar_sql(sql)
+        with self._lock:
+            estadistica = self.estadisticas.get((metodo, sql))
+            if estadistica is None:
+                estadistica = self.estadisticas[(metodo, sql)] = EstadisticaSentencia()
+            estadistica.agregar(segundos, filas, error is not None)
+
+        milisegundos = segundos * 1000
+        if error is not None:
+            self._get_logger().warning(
+                f"{milisegundos:.1f} ms | {metodo} | {sql} | error: {error}"
+            )
+        elif milisegundos >= self.umbral_lento_ms:
+            self._get_logger().info(
+                f"{milisegundos:.1f} ms | filas={filas} | {metodo} | {sql}"
+            )
+
+    def segundos_hilo(self):
+        """Tiempo SQL acumulado por el hilo actual"""
+        return getattr(self._hilo, "segundos", 0.0)
+
+    def reporte(self, top_n=20):
+        """Devuelve un reporte de las sentencias con mayor tiempo total"""
+        with self._lock:
+            items = sorted(
+                self.estadisticas.items(),
+                key=lambda item: item[1].total_segundos,
+                reverse=True,
+            )[:top_n]
+
+        lineas = [
+            f"{'total ms':>10} {'llamadas':>9} {'prom ms':>9} {'máx ms':>9} "
+            f"{'filas':>9}  método / sentencia"
+        ]
+        for (metodo, sql), est in items:
+            lineas.append(
+                f"{est.total_segundos * 1000:>10.1f} {est.ejecuciones:>9} "
+                f"{est.total_segundos * 1000 / est.ejecuciones:>9.2f} "
+                f"{est.max_segundos * 1000:>9.2f} {est.filas:>9}  {metodo}"
+            )
+            lineas.append(f"{'':>51}{sql[:150]}")
+        return "\n".join(lineas)
+
+
+def normalizar_sql(sql):
+    """Compacta los espacios de una sentencia para agruparla y mostrarla"""
+    return re.sub(r"\s+", " ", sql).strip()
+
+
+def _metodo_llamador():
+    """Obtiene el método del modelo (database.py) que ejecutó la sentencia"""
+    frame = sys._getframe(2)
+    primero = None
+    while frame is not None:
+        codigo = frame.f_code
+        if codigo.co_filename != __file__:
+            nombre = getattr(codigo, "co_qualname", codigo.co_name)
+            if primero is None:
+                primero = f"{Path(codigo.co_filename).stem}:{nombre}"
+            if Path(codigo.co_filename).name == "database.py":
+                return nombre
+        frame = frame.f_back
+    return primero or "?"
+
+
+class CursorInstrumentado(sqlite3.Cursor):
+    """
+    Cursor que mide sus sentencias
+
+    Para las consultas el tiempo incluye la lectura de filas: la medición de
+    una sentencia se cierra al agotar los resultados, al ejecutar otra
+    sentencia o al cerrar/liberar el cursor.
+    """
+
+    _pendiente = None
+
+    def _cerrar_pendiente(self):
+        pendiente = self._pendiente
+        if pendiente is not None:
+            self._pendiente = None
+            sql, metodo, segundos, filas = pendiente
+            registro.registrar(sql, segundos, filas, metodo)
+
+    def _medir(self, metodo_cursor, sql, *args):
+        self._cerrar_pendiente()
+        metodo = _metodo_llamador()
+        inicio = time.perf_counter()
+        try:
+            resultado = metodo_cursor(sql, *args)
+        except Exception as e:
+            registro.registrar(sql, time.perf_counter() - inicio, 0, metodo, error=e)
+            raise
+        segundos = time.perf_counter() - inicio
+        if self.description is None:
+            registro.registrar(sql, segundos, max(self.rowcount, 0), metodo)
+        else:
+            self._pendiente = [sql, metodo, segundos, 0]
+        return resultado
+
+    def _leer(self, lectura, *args):
+        inicio = time.perf_counter()
+        filas = lectura(*args)
+        pendiente = self._pendiente
+        if pendiente is not None:
+            pendiente[2] += time.perf_counter() - inicio
+        return filas
+
+    def execute(self, sql, parameters=()):
+        return self._medir(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._medir(super().executemany, sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self._medir(super().executescript, sql_script)
+
+    def fetchone(self):
+        fila = self._leer(super().fetchone)
+        if fila is None:
+            self._cerrar_pendiente()
+        elif self._pendiente is not None:
+            self._pendiente[3] += 1
+        return fila
+
+    def fetchmany(self, size=None):
+        tamano = self.arraysize if size is None else size
+        filas = self._leer(super().fetchmany, tamano)
+        if self._pendiente is not None:
+            self._pendiente[3] += len(filas)
+        if len(filas) < tamano:
+            self._cerrar_pendiente()
+        return filas
+
+    def fetchall(self):
+        filas = self._leer(super().fetchall)
+        if self._pendiente is not None:
+            self._pendiente[3] += len(filas)
+        self._cerrar_pendiente()
+        return filas
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        fila = self.fetchone()
+        if fila is None:
+            raise StopIteration
+        return fila
+
+    def close(self):
+        self._cerrar_pendiente()
+        super().close()
+
+    def __del__(self):
+        self._cerrar_pendiente()
+
+
+class ConexionInstrumentada(sqlite3.Connection):
+    """Conexión cuyos cursores (incluidos los de execute()) son instrumentados"""
+
+    def cursor(self, factory=CursorInstrumentado):
+        return super().cursor(factory)
+
+
+registro = RegistroConsultas(
+    umbral_lento_ms=float(os.environ.get("SISTEMA_GESTION_SQL_LENTO_MS", 100))
+)
+_activa = False
+
+
+def activa():
+    """Indica si la instrumentación SQL está activa"""
+    return _activa
+
+
+def activar(umbral_lento_ms=None, top_n_reporte=None):
+    """Activa la instrumentación para las conexiones creadas desde ahora"""
+    global _activa
+    if umbral_lento_ms is not None:
+        registro.umbral_lento_ms = umbral_lento_ms
+    if not _activa:
+        _activa = True
+        if top_n_reporte is None:
+            top_n_reporte = int(os.environ.get("SISTEMA_GESTION_SQL_REPORTE", 20))
+        if top_n_reporte > 0:
+            atexit.register(volcar_reporte, top_n_reporte)
+
+
+def fabrica_conexion():
+    """Clase de conexión que debe usar sqlite3.connect"""
+    return ConexionInstrumentada if _activa else sqlite3.Connection
+
+
+def volcar_reporte(top_n=20):
+    """Escribe el reporte de sentencias en logs/reporte_sql_<script>.txt y en stderr"""
+    if not registro.estadisticas:
+        return
+    reporte = registro.reporte(top_n)
+    try:
+        DIRECTORIO_LOGS.mkdir(exist_ok=True)
+        nombre = f"reporte_sql_{Path(sys.argv[0]).stem or 'python'}.txt"
+        (DIRECTORIO_LOGS / nombre).write_text(reporte + "\n", encoding="utf-8")
+    except OSError as e:
+        print(f"Error al escribir el reporte SQL: {e}", file=sys.stderr)
+    print(reporte, file=sys.stderr)
+
+
+# ========== PERFILADO DE ACCIONES DE LA INTERFAZ ==========
+
+PREFIJOS_ACCIONES = (
+    "load_",
+    "save_",
+    "delete_",
+    "create_",
+    "cargar_",
+    "calcular_",
+    "refrescar_",
+    "generar_",
+)
+
+_perfil_ui = threading.local()
+
+
+class AccionPerfilada:
+    """Acción de una ventana en curso (ver perfilar_accion)"""
+
+    def __init__(self, nombre, profundidad):
+        self.nombre = nombre
+        self.profundidad = profundidad
+        self.inicio = time.perf_counter()
+
+
+def accion_en_curso():
+    """Acción perfilada que se ejecuta en este hilo, o None"""
+    return getattr(_perfil_ui, "accion", None)
+
+
+@contextlib.contextmanager
+def en_accion(accion):
+    """Atribuye a la acción lo que se envíe al hilo de datos en el bloque"""
+    anterior = accion_en_curso()
+    _perfil_ui.accion = accion
+    try:
+        yield
+    finally:
+        _perfil_ui.accion = anterior
+
+
+def registrar_trabajo_en_fondo(accion, segundos_sql, segundos_hilo, segundos_widgets):
+    """
+    Registra el trabajo que una acción envió al hilo de datos (EjecutorDB)
+
+    La acción ya se registró al volver al hilo de Tk, con el SQL de ese hilo;
+    esta línea agrega el SQL y el Python del hilo de datos y el tiempo del
+    callback que actualiza los widgets. El total va desde el inicio de la
+    acción hasta el final del callback, incluida la espera en la cola.
+    """
+    fin = time.perf_counter()
+    _get_logger_ui().info(
+        f"{'  ' * accion.profundidad}{accion.nombre} (segundo plano):"
+        f" total {(fin - accion.inicio) * 1000:.1f} ms"
+        f" | sql {segundos_sql * 1000:.1f} ms"
+        f" | python {(segundos_hilo - segundos_sql) * 1000:.1f} ms"
+        f" | widgets {segundos_widgets * 1000:.1f} ms"
+    )
+
+
+def _get_logger_ui():
+    logger = logging.getLogger("sistema_gestion.perfil_ui")
+    if not logger.handlers:
+        DIRECTORIO_LOGS.mkdir(exist_ok=True)
+        handler = logging.handlers.RotatingFileHandler(
+            DIRECTORIO_LOGS / "perfil_ui.log",
+            maxBytes=1_000_000,
+            backupCount=5,
+            encoding="utf-8",
+        )
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        logger.addHandler(handler)
+        logger.addHandler(logging.StreamHandler(sys.stderr))
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+def perfilar_accion(metodo, directorio_perfiles=None):
+    """
+    Envuelve un método de una ventana para medir su tiempo
+
+    El tiempo total se divide en SQL (medido por la instrumentación), Python
+    (el resto del método, incluida la creación de widgets) y layout de Tk
+    (update_idletasks posterior). Si el método abre diálogos modales, la
+    espera del usuario queda incluida en el tiempo de Python.
+
+    Las consultas que el método envía a un EjecutorDB se miden en el hilo de
+    datos y se registran aparte al terminar su callback (ver
+    registrar_trabajo_en_fondo).
+    """
+
+    @functools.wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        profundidad = getattr(_perfil_ui, "profundidad", 0)
+        perfil = None
+        if directorio_perfiles and profundidad == 0:
+            perfil = cProfile.Profile()
+
+        nombre = f"{type(self).__name__}.{metodo.__name__}"
+        _perfil_ui.profundidad = profundidad + 1
+        sql_inicial = registro.segundos_hilo()
+        inicio = time.perf_counter()
+        try:
+            if perfil:
+                perfil.enable()
+            try:
+                with en_accion(AccionPerfilada(nombre, profundidad)):
+                    return metodo(self, *args, **kwargs)
+            finally:
+                if perfil:
+                    perfil.disable()
+                fin_metodo = time.perf_counter()
+                root = getattr(self, "root", None)
+                if root is not None and profundidad == 0:
+                    try:
+                        root.update_idletasks()
+                    except Exception:
+                        pass  # La ventana pudo cerrarse durante la acción
+        finally:
+            _perfil_ui.profundidad = profundidad
+            fin = time.perf_counter()
+            segundos_sql = registro.segundos_hilo() - sql_inicial
+            _get_logger_ui().info(
+                f"{'  ' * profundidad}{nombre}: total {(fin - inicio) * 1000:.1f} ms"
+                f" | sql {segundos_sql * 1000:.1f} ms"
+                f" | python {(fin_metodo - inicio - segundos_sql) * 1000:.1f} ms"
+                f" | layout {(fin - fin_metodo) * 1000:.1f} ms"
+            )
+            if perfil:
+                directorio = Path(directorio_perfiles)
+                directorio.mkdir(parents=True, exist_ok=True)
+                marca = time.strftime("%Y%m%d-%H%M%S")
+                perfil.dump_stats(directorio / f"{nombre}-{marca}-{os.getpid()}.prof")
+
+    return envoltura
+
+
+def perfilar_ventana(clase):
+    """
+    Decorador de clase que perfila las acciones de una ventana
+
+    Solo tiene efecto con SISTEMA_GESTION_PERFIL_UI=1; en ese caso también
+    activa la instrumentación SQL para poder separar el tiempo de base de datos.
+    """
+    if os.environ.get("SISTEMA_GESTION_PERFIL_UI") != "1":
+        return clase
+
+    activar()
+    directorio_perfiles = os.environ.get("SISTEMA_GESTION_PERFIL_UI_DIR")
+    for nombre, atributo in list(vars(clase).items()):
+        if callable(atributo) and nombre.startswith(PREFIJOS_ACCIONES):
+            setattr(clase, nombre, perfilar_accion(atributo, directorio_perfiles))
+    return clase
+
+
+if os.environ.get("SISTEMA_GESTION_PERFIL_SQL") == "1":
+    activar()
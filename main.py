@@ -4,23 +4,56 @@ Ventana principal de la aplicación - Sistema de Gestión
 
 import tkinter as tk
 from tkinter import ttk
+import os
 import subprocess
 import sys
+import threading
+import time
 from pathlib import Path
 
+from database import buscar_global
+from ejecutor_db import EjecutorDB
+from tabla_paginada import ESPERA_FILTRO_MS
+
+# Minutos sin actividad en la ventana principal tras los que se ejecuta el
+# mantenimiento de la base de datos (0 = desactivado)
+MINUTOS_INACTIVIDAD_MANTENIMIENTO = float(
+    os.environ.get("SISTEMA_GESTION_MANTENIMIENTO_INACTIVO_MIN", 0)
+)
+
+# Entidad de la búsqueda global -> (tipo mostrado, módulo que la administra)
+ENTIDADES_BUSQUEDA = {
+    "producto": ("Producto", "productos.py"),
+    "compra": ("Compra", "compras.py"),
+    "cobrar": ("Cuenta por cobrar", "contabilidad.py"),
+    "pagar": ("Cuenta por pagar", "contabilidad.py"),
+}
+
 
 class MainWindow:
     def __init__(self, root):
         self.root = root
         self.root.title("Sistema de Gestión")
-        self.root.geometry("800x600")
+        self.root.geometry("800x750")
 
         # Configurar estilo
         self.setup_styles()
 
+        # Búsqueda global en segundo plano
+        self.ejecutor = EjecutorDB(self.root)
+        self._busqueda_id = None
+
         # Crear interfaz
         self.create_widgets()
 
+        # Mantenimiento de la base de datos cuando la aplicación está inactiva
+        if MINUTOS_INACTIVIDAD_MANTENIMIENTO > 0:
+            self.ultima_actividad = time.monotonic()
+            self.mantenimiento_estado = "pendiente"
+            for evento in ("<Any-KeyPress>", "<Any-ButtonPress>", "<Motion>"):
+                self.root.bind_all(evento, self.registrar_actividad, add="+")
+            self.root.after(60_000, self.verificar_inactividad)
+
     def setup_styles(self):
         """Configura los estilos de la aplicación"""
         style = ttk.Style()
@@ -52,9 +85,33 @@ class MainWindow:
         )
         title_label.grid(row=0, column=0, pady=(0, 30))
 
+        # Búsqueda global en productos, compras y cuentas
+        busqueda_frame = ttk.LabelFrame(main_frame, text="Buscar", padding="10")
+        busqueda_frame.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=(0, 20))
+        busqueda_frame.columnconfigure(0, weight=1)
+
+        self.busqueda_var = tk.StringVar()
+        ttk.Entry(busqueda_frame, textvariable=self.busqueda_var).grid(
+            row=0, column=0, columnspan=2, sticky=(tk.W, tk.E)
+        )
+        self.busqueda_var.trace_add("write", self.programar_busqueda)
+
+        columns = ("Tipo", "Nombre", "Descripción", "Fecha")
+        self.resultados_tree = ttk.Treeview(
+            busqueda_frame, columns=columns, show="headings", height=6
+        )
+        for col, ancho in zip(columns, (130, 250, 250, 100)):
+            self.resultados_tree.heading(col, text=col)
+            self.resultados_tree.column(col, width=ancho)
+        self.resultados_scrollbar = ttk.Scrollbar(
+            busqueda_frame, orient=tk.VERTICAL, command=self.resultados_tree.yview
+        )
+        self.resultados_tree.configure(yscrollcommand=self.resultados_scrollbar.set)
+        self.resultados_tree.bind("<Double-1>", self.abrir_resultado)
+
         # Frame para los botones principales
         buttons_frame = ttk.Frame(main_frame)
-        buttons_frame.grid(row=1, column=0, sticky=(tk.W, tk.E))
+        buttons_frame.grid(row=2, column=0, sticky=(tk.W, tk.E))
         buttons_frame.columnconfigure(0, weight=1)
 
         # Lista de módulos principales
@@ -104,6 +161,88 @@ class MainWindow:
             row=len(modulos_principales), column=0, pady=(20, 0), sticky=(tk.W, tk.E)
         )
 
+    def programar_busqueda(self, *args):
+        # Esperar a que el usuario deje de escribir antes de consultar
+        if self._busqueda_id is not None:
+            self.root.after_cancel(self._busqueda_id)
+        self._busqueda_id = self.root.after(ESPERA_FILTRO_MS, self.buscar)
+
+    def buscar(self):
+        """Busca el texto ingresado; sin texto, oculta los resultados"""
+        self._busqueda_id = None
+        texto = self.busqueda_var.get().strip()
+        if not texto:
+            self.ejecutor.cancelar("busqueda")
+            self.mostrar_resultados([])
+            return
+        self.ejecutor.enviar(
+            buscar_global, texto, al_terminar=self.mostrar_resultados, clave="busqueda"
+        )
+
+    def mostrar_resultados(self, resultados):
+        self.resultados_tree.delete(*self.resultados_tree.get_children())
+        if not resultados and not self.busqueda_var.get().strip():
+            self.resultados_tree.grid_remove()
+            self.resultados_scrollbar.grid_remove()
+            return
+
+        for resultado in resultados:
+            tipo, _ = ENTIDADES_BUSQUEDA[resultado["entidad"]]
+            self.resultados_tree.insert(
+                "",
+                tk.END,
+                iid=f"{resultado['entidad']}:{resultado['id']}",
+                values=(
+                    tipo,
+                    resultado["titulo"],
+                    resultado["descripcion"] or "",
+                    resultado["fecha"] or "",
+                ),
+            )
+        self.resultados_tree.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=(10, 0))
+        self.resultados_scrollbar.grid(
+            row=1, column=1, sticky=(tk.N, tk.S), pady=(10, 0)
+        )
+
+    def abrir_resultado(self, event=None):
+        """Abre el módulo que administra el resultado seleccionado"""
+        seleccion = self.resultados_tree.selection()
+        if seleccion:
+            entidad = seleccion[0].split(":")[0]
+            self.abrir_modulo(ENTIDADES_BUSQUEDA[entidad][1])
+
+    def registrar_actividad(self, event=None):
+        self.ultima_actividad = time.monotonic()
+
+    def verificar_inactividad(self):
+        """Lanza el mantenimiento una vez por sesión tras el tiempo inactivo"""
+        inactivo = time.monotonic() - self.ultima_actividad
+        if (
+            self.mantenimiento_estado == "pendiente"
+            and inactivo >= MINUTOS_INACTIVIDAD_MANTENIMIENTO * 60
+        ):
+            self.mantenimiento_estado = "en_curso"
+            threading.Thread(target=self.ejecutar_mantenimiento, daemon=True).start()
+
+        if self.mantenimiento_estado != "hecho":
+            self.root.after(60_000, self.verificar_inactividad)
+
+    def ejecutar_mantenimiento(self):
+        """Ejecuta el mantenimiento en segundo plano (el resultado va al log)"""
+        from mantenimiento import BaseDatosOcupada, ejecutar_mantenimiento
+
+        try:
+            ejecutar_mantenimiento()
+            self.mantenimiento_estado = "hecho"
+        except BaseDatosOcupada:
+            # Otro módulo bloqueó la base de datos en algún paso: reintentar
+            # en la próxima inactividad
+            self.ultima_actividad = time.monotonic()
+            self.mantenimiento_estado = "pendiente"
+        except Exception as e:
+            print(f"Error en mantenimiento: {e}")
+            self.mantenimiento_estado = "hecho"
+
     def abrir_modulo(self, archivo):
         """
         Abre una ventana de módulo específico
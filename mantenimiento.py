@@ -0,0 +1,218 @@
+"""
+Mantenimiento de la base de datos
+
+Ejecuta ANALYZE, PRAGMA optimize, la optimización del índice de búsqueda y
+PRAGMA incremental_vacuum en una sola transacción de escritura y, al final,
+PRAGMA quick_check, registrando la duración de cada paso y los bytes
+recuperados en logs/mantenimiento.log.
+
+No se ejecuta si otro proceso (por ejemplo, un módulo abierto desde main.py)
+está usando la base de datos: la conexión no espera los bloqueos, y si
+BEGIN IMMEDIATE o cualquier paso posterior (el COMMIT, el vacío o
+quick_check) encuentra la base de datos ocupada, se cancela con
+BaseDatosOcupada para reintentarlo más tarde.
+
+El vacío incremental requiere PRAGMA auto_vacuum = INCREMENTAL. Las bases de
+datos nuevas se crean así; las anteriores se convierten con un VACUUM completo
+solo si se pide (--convertir), porque puede tardar en bases de datos grandes.
+
+Uso:
+    python mantenimiento.py [--db ruta] [--convertir]
+"""
+
+import argparse
+import logging
+import logging.handlers
+import sqlite3
+import time
+from pathlib import Path
+
+from instrumentacion import DIRECTORIO_LOGS
+
+AUTO_VACUUM_INCREMENTAL = 2
+
+
+class BaseDatosOcupada(Exception):
+    """Otro proceso tiene bloqueada la base de datos"""
+
+
+def _get_logger():
+    logger = logging.getLogger("sistema_gestion.mantenimiento")
+    if not logger.handlers:
+        DIRECTORIO_LOGS.mkdir(exist_ok=True)
+        handler = logging.handlers.RotatingFileHandler(
+            DIRECTORIO_LOGS / "mantenimiento.log",
+            maxBytes=1_000_000,
+            backupCount=3,
+            encoding="utf-8",
+        )
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+def _pragma(conn, nombre):
+    return conn.execute(f"PRAGMA {nombre}").fetchone()[0]
+
+
+def _bytes_libres(conn):
+    return _pragma(conn, "freelist_count") * _pragma(conn, "page_size")
+
+
+def _vacio_incremental(conn):
+    """
+    Libera todas las páginas libres con PRAGMA incremental_vacuum
+
+    El módulo sqlite3 avanza la sentencia un solo paso y el pragma libera una
+    página por paso, así que se repite hasta que no quedan páginas libres.
+    """
+    libres = _pragma(conn, "freelist_count")
+    while libres:
+        conn.execute("PRAGMA incremental_vacuum").fetchall()
+        restantes = _pragma(conn, "freelist_count")
+        if restantes >= libres:
+            break  # Sin avance: no seguir intentando
+        libres = restantes
+
+
+def _es_bloqueo(error: sqlite3.OperationalError) -> bool:
+    """SQLITE_BUSY / SQLITE_LOCKED: otro proceso tiene el bloqueo"""
+    mensaje = str(error).lower()
+    return "locked" in mensaje or "busy" in mensaje
+
+
+def ejecutar_mantenimiento(db_path=None, convertir=False) -> dict:
+    """
+    Ejecuta el mantenimiento completo sobre la base de datos
+
+    Args:
+        db_path: ruta de la base de datos (por defecto la de la aplicación)
+        convertir: si la base de datos no usa auto_vacuum incremental, hacer
+            un VACUUM completo para activarlo
+
+    Returns:
+        dict: duración en ms de cada paso, bytes recuperados y resultado de
+        quick_check
+
+    Raises:
+        BaseDatosOcupada: si otro proceso tiene bloqueada la base de datos en
+            cualquiera de los pasos
+    """
+    from database import Database
+
+    db_path = Path(db_path or Database.db_path_por_defecto)
+    logger = _get_logger()
+    resultado = {"db": str(db_path), "pasos_ms": {}}
+
+    # timeout=0: no esperar al bloqueo de otro proceso
+    conn = sqlite3.connect(db_path, timeout=0, isolation_level=None)
+
+    def paso(nombre, sentencia):
+        inicio = time.perf_counter()
+        filas = conn.execute(sentencia).fetchall()
+        resultado["pasos_ms"][nombre] = (time.perf_counter() - inicio) * 1000
+        return filas
+
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+
+        # Estadísticas para el planificador y vacío, dentro del bloqueo de
+        # escritura
+        paso("analyze", "ANALYZE")
+        paso("optimize", "PRAGMA optimize")
+        # Fusionar los segmentos del índice de búsqueda (FTS5)
+        if conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'busqueda'"
+        ).fetchone():
+            paso("fts_optimize", "INSERT INTO busqueda(busqueda) VALUES ('optimize')")
+
+        # Espacio libre medido justo antes del vacío: los pasos anteriores
+        # (sobre todo el optimize de FTS5) también liberan páginas
+        libres_inicial = _bytes_libres(conn)
+        auto_vacuum = _pragma(conn, "auto_vacuum")
+        if auto_vacuum == AUTO_VACUUM_INCREMENTAL:
+            inicio = time.perf_counter()
+            _vacio_incremental(conn)
+            resultado["pasos_ms"]["incremental_vacuum"] = (
+                time.perf_counter() - inicio
+            ) * 1000
+        conn.execute("COMMIT")
+
+        if auto_vacuum != AUTO_VACUUM_INCREMENTAL:
+            if convertir:
+                # Cambiar el modo solo tiene efecto después de un VACUUM
+                # completo, que no puede ir dentro de una transacción (toma su
+                # propio bloqueo exclusivo)
+                conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                paso("vacuum_conversion", "VACUUM")
+            else:
+                logger.info(
+                    "auto_vacuum no es INCREMENTAL; se omite el vacío "
+                    "(ejecute mantenimiento.py --convertir)"
+                )
+
+        filas = paso("quick_check", "PRAGMA quick_check")
+        resultado["quick_check"] = "; ".join(fila[0] for fila in filas)
+
+        resultado["bytes_libres_antes"] = libres_inicial
+        resultado["bytes_libres_despues"] = _bytes_libres(conn)
+        resultado["bytes_recuperados"] = (
+            resultado["bytes_libres_antes"] - resultado["bytes_libres_despues"]
+        )
+
+    except sqlite3.OperationalError as e:
+        if not _es_bloqueo(e):
+            raise
+        logger.warning(f"Mantenimiento cancelado, base de datos ocupada: {e}")
+        raise BaseDatosOcupada(
+            "Otro proceso está usando la base de datos; "
+            "intente el mantenimiento más tarde"
+        )
+    finally:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        conn.close()
+
+    pasos = ", ".join(f"{k}={v:.1f} ms" for k, v in resultado["pasos_ms"].items())
+    mensaje = (
+        f"Mantenimiento {db_path.name}: {pasos}; "
+        f"recuperados {resultado['bytes_recuperados']} bytes; "
+        f"quick_check={resultado['quick_check']}"
+    )
+    if resultado["quick_check"] == "ok":
+        logger.info(mensaje)
+    else:
+        logger.error(mensaje)
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Ejecuta ANALYZE, optimize, vacío incremental y quick_check"
+    )
+    parser.add_argument("--db", help="Ruta de la base de datos")
+    parser.add_argument(
+        "--convertir",
+        action="store_true",
+        help="Activar auto_vacuum incremental con un VACUUM completo si hace falta",
+    )
+    args = parser.parse_args()
+
+    try:
+        resultado = ejecutar_mantenimiento(args.db, args.convertir)
+    except BaseDatosOcupada as e:
+        print(e)
+        raise SystemExit(1)
+
+    for nombre, ms in resultado["pasos_ms"].items():
+        print(f"{nombre:<20}{ms:>10.1f} ms")
+    print(f"{'bytes recuperados':<20}{resultado['bytes_recuperados']:>10}")
+    print(f"{'quick_check':<20}{resultado['quick_check']:>10}")
+    if resultado["quick_check"] != "ok":
+        raise SystemExit(2)
+
+
+if __name__ == "__main__":
+    main()
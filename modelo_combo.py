@@ -0,0 +1,73 @@
+"""
+Modelo de opciones para los Combobox que eligen un registro
+
+ModeloCombo arma una sola vez por carga el texto de cada opción y un
+diccionario texto -> registro, de modo que obtener el registro (o su id)
+elegido en un Combobox no vuelve a formatear la lista ni a consultar la base
+de datos. Un mismo modelo puede alimentar varios Combobox (por ejemplo, las
+semanas de inicio y de fin de un rango).
+"""
+
+
+class ModeloCombo:
+    """Textos de un Combobox y el registro que representa cada uno"""
+
+    def __init__(self, formatear, *combos, vacio=None):
+        """
+        Args:
+            formatear: función registro -> texto de la opción
+            combos: Combobox que muestran las opciones
+            vacio: texto a mostrar si no hay registros
+        """
+        self.formatear = formatear
+        self.combos = combos
+        self.vacio = vacio
+        self.registros = []
+        self.textos = []
+        self._por_texto = {}
+        self._indice_por_id = {}
+
+    def cargar(self, registros):
+        """Reemplaza las opciones de todos los Combobox por los registros"""
+        self.registros = list(registros)
+        self.textos = []
+        self._por_texto = {}
+        self._indice_por_id = {}
+        for indice, registro in enumerate(self.registros):
+            texto = self.formatear(registro)
+            # Dos registros con el mismo texto se distinguen por el id
+            if texto in self._por_texto:
+                texto = f"{texto} (#{registro.id})"
+            self.textos.append(texto)
+            self._por_texto[texto] = registro
+            self._indice_por_id[registro.id] = indice
+
+        valores = self.textos or ([self.vacio] if self.vacio else [])
+        for combo in self.combos:
+            combo["values"] = valores
+
+    def registro_de_texto(self, texto):
+        """Registro de la opción con ese texto, o None"""
+        return self._por_texto.get(texto)
+
+    def registro(self, combo):
+        """Registro elegido en el Combobox, o None"""
+        return self.registro_de_texto(combo.get())
+
+    def get_id(self, combo):
+        """Id del registro elegido en el Combobox, o None"""
+        registro = self.registro(combo)
+        return registro.id if registro is not None else None
+
+    def seleccionar_id(self, combo, registro_id) -> bool:
+        """Elige en el Combobox el registro con ese id (False si no está)"""
+        indice = self._indice_por_id.get(registro_id)
+        if indice is None:
+            return False
+        combo.current(indice)
+        return True
+
+    def seleccionar_indice(self, combo, indice):
+        """Elige la opción en esa posición (acotada a las existentes)"""
+        if self.textos:
+            combo.current(max(0, min(indice, len(self.textos) - 1)))
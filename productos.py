@@ -5,8 +5,12 @@ Módulo para gestión de Productos - CRUD completo
 import tkinter as tk
 from tkinter import ttk, messagebox
 from database import Producto, Categoria
+from ejecutor_db import EjecutorDB
+from instrumentacion import perfilar_ventana
+from modelo_combo import ModeloCombo
 
 
+@perfilar_ventana
 class ProductosWindow:
     def __init__(self, root):
         self.root = root
@@ -15,11 +19,13 @@ class ProductosWindow:
 
         # Variables
         self.current_producto = None
-        self.categorias = Categoria.get_all()
 
         # Crear interfaz
         self.create_widgets()
 
+        # Consultas en segundo plano para no congelar la ventana
+        self.ejecutor = EjecutorDB(self.root)
+
         # Cargar productos iniciales
         self.load_productos()
 
@@ -57,6 +63,7 @@ class ProductosWindow:
         )
         self.categoria_combo = ttk.Combobox(form_frame, state="readonly", width=27)
         self.categoria_combo.grid(row=1, column=1, pady=5, sticky=tk.W)
+        self.modelo_categorias = ModeloCombo(lambda c: c.nombre, self.categoria_combo)
         self.load_categorias_combo()
 
         # Campos: Costo, Precio de Venta y Cantidad en la misma línea
@@ -78,6 +85,13 @@ class ProductosWindow:
         self.cantidad_entry = ttk.Entry(form_frame, width=15)
         self.cantidad_entry.grid(row=3, column=1, pady=5, sticky=tk.W)
 
+        # Campo: Código de barras / SKU (opcional)
+        ttk.Label(form_frame, text="Código (SKU):").grid(
+            row=3, column=2, padx=(20, 10), pady=5, sticky=tk.W
+        )
+        self.codigo_entry = ttk.Entry(form_frame, width=20)
+        self.codigo_entry.grid(row=3, column=3, pady=5, sticky=tk.W)
+
         # Botones del formulario
         buttons_frame = ttk.Frame(form_frame)
         buttons_frame.grid(row=4, column=0, columnspan=4, pady=(15, 0))
@@ -123,10 +137,8 @@ class ProductosWindow:
 
     def load_categorias_combo(self):
         """Carga las categorías en el combobox"""
-        categorias_nombres = [cat.nombre for cat in self.categorias]
-        self.categoria_combo["values"] = categorias_nombres
-        if categorias_nombres:
-            self.categoria_combo.current(0)
+        self.modelo_categorias.cargar(Categoria.get_all())
+        self.modelo_categorias.seleccionar_indice(self.categoria_combo, 0)
 
     def clear_form(self):
         """Limpia solo los campos del formulario, mantiene current_producto si existe"""
@@ -135,8 +147,8 @@ class ProductosWindow:
         self.costo_entry.delete(0, tk.END)
         self.precio_entry.delete(0, tk.END)
         self.cantidad_entry.delete(0, tk.END)
-        if self.categorias:
-            self.categoria_combo.current(0)
+        self.codigo_entry.delete(0, tk.END)
+        self.modelo_categorias.seleccionar_indice(self.categoria_combo, 0)
 
     def new_producto(self):
         """Prepara el formulario para un nuevo producto"""
@@ -145,178 +157,179 @@ class ProductosWindow:
         self.nombre_entry.focus()
 
     def load_productos(self):
-        """Carga y muestra todos los productos agrupados por categoría"""
+        """Carga todos los productos agrupados por categoría (en segundo plano)"""
+        self.ejecutor.enviar(
+            Producto.get_productos_agrupados_por_categoria,
+            al_terminar=self.mostrar_productos,
+            al_fallar=self.error_cargar_productos,
+            clave="productos",
+        )
+
+    def mostrar_productos(self, productos_agrupados):
+        """Muestra los productos obtenidos por load_productos"""
 
         # Limpiar lista actual
         for widget in self.lista_frame.winfo_children():
             widget.destroy()
 
-        try:
-            # Obtener productos agrupados por categoría
-            productos_agrupados = Producto.get_productos_agrupados_por_categoria()
-
-            if not productos_agrupados:
-                ttk.Label(
-                    self.lista_frame,
-                    text="No hay productos registrados",
-                    font=("Arial", 12),
-                ).grid(row=0, column=0, pady=20)
-                return
+        if not productos_agrupados:
+            ttk.Label(
+                self.lista_frame,
+                text="No hay productos registrados",
+                font=("Arial", 12),
+            ).grid(row=0, column=0, pady=20)
+            return
 
-            row_index = 0
+        row_index = 0
 
-            for categoria, productos in productos_agrupados:
-                # Calcular total de productos en esta categoría
-                total_categoria = sum(p.cantidad for p in productos)
+        for categoria, productos in productos_agrupados:
+            # Calcular total de productos en esta categoría
+            total_categoria = sum(p.cantidad for p in productos)
 
-                # Frame para la categoría
-                cat_frame = ttk.LabelFrame(
-                    self.lista_frame,
-                    text=f"{categoria.nombre} - Total de Productos: {total_categoria}",
-                    padding="10",
+            # Frame para la categoría
+            cat_frame = ttk.LabelFrame(
+                self.lista_frame,
+                text=f"{categoria.nombre} - Total de Productos: {total_categoria}",
+                padding="10",
+            )
+            cat_frame.grid(row=row_index, column=0, sticky=(tk.W, tk.E), pady=(0, 15))
+            cat_frame.columnconfigure(0, weight=1)
+
+            # Encabezados de la tabla
+            headers_frame = ttk.Frame(cat_frame)
+            headers_frame.grid(row=0, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
+
+            # Configurar anchos de columnas y alineación
+            # Columna 0: Nombre (25 caracteres)
+            ttk.Label(
+                headers_frame,
+                text="Nombre",
+                font=("Arial", 10, "bold"),
+                width=25,
+                anchor="w",
+            ).grid(row=0, column=0, padx=5, sticky=tk.W)
+
+            # Columna 1: Costo (12 caracteres, centrado)
+            ttk.Label(
+                headers_frame,
+                text="Costo",
+                font=("Arial", 10, "bold"),
+                width=12,
+                anchor="center",
+            ).grid(row=0, column=1, padx=5, sticky=tk.EW)
+
+            # Columna 2: Precio Venta (12 caracteres, centrado)
+            ttk.Label(
+                headers_frame,
+                text="Precio Venta",
+                font=("Arial", 10, "bold"),
+                width=12,
+                anchor="center",
+            ).grid(row=0, column=2, padx=5, sticky=tk.EW)
+
+            # Columna 3: Margen Bruto (12 caracteres, centrado)
+            ttk.Label(
+                headers_frame,
+                text="Margen Bruto",
+                font=("Arial", 10, "bold"),
+                width=12,
+                anchor="center",
+            ).grid(row=0, column=3, padx=5, sticky=tk.EW)
+
+            # Columna 4: Cantidad (10 caracteres, centrado)
+            ttk.Label(
+                headers_frame,
+                text="Cantidad",
+                font=("Arial", 10, "bold"),
+                width=10,
+                anchor="center",
+            ).grid(row=0, column=4, padx=5, sticky=tk.EW)
+
+            # Columna 5: Acciones (20 caracteres, centrado)
+            ttk.Label(
+                headers_frame,
+                text="Acciones",
+                font=("Arial", 10, "bold"),
+                width=20,
+                anchor="center",
+            ).grid(row=0, column=5, padx=5, sticky=tk.EW)
+
+            # Configurar expansión uniforme de columnas
+            for i in range(6):
+                headers_frame.columnconfigure(i, weight=1, uniform="headers")
+
+            # Productos de esta categoría
+            for i, producto in enumerate(productos, 1):
+                prod_frame = ttk.Frame(cat_frame)
+                prod_frame.grid(row=i, column=0, sticky=(tk.W, tk.E), pady=2)
+
+                # Configurar expansión uniforme para las columnas del producto
+                for col in range(6):
+                    prod_frame.columnconfigure(col, weight=1, uniform="prod_cols")
+
+                # Nombre (alineado a la izquierda)
+                nombre_label = ttk.Label(
+                    prod_frame, text=producto.nombre, width=25, anchor="w"
                 )
-                cat_frame.grid(
-                    row=row_index, column=0, sticky=(tk.W, tk.E), pady=(0, 15)
+                nombre_label.grid(row=0, column=0, padx=5, sticky=tk.W)
+
+                # Costo (alineado a la derecha para números)
+                costo_text = f"{producto.costo:.2f}"
+                costo_label = ttk.Label(
+                    prod_frame, text=costo_text, width=12, anchor="e"
                 )
-                cat_frame.columnconfigure(0, weight=1)
-
-                # Encabezados de la tabla
-                headers_frame = ttk.Frame(cat_frame)
-                headers_frame.grid(row=0, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
-
-                # Configurar anchos de columnas y alineación
-                # Columna 0: Nombre (25 caracteres)
-                ttk.Label(
-                    headers_frame,
-                    text="Nombre",
-                    font=("Arial", 10, "bold"),
-                    width=25,
-                    anchor="w",
-                ).grid(row=0, column=0, padx=5, sticky=tk.W)
-
-                # Columna 1: Costo (12 caracteres, centrado)
-                ttk.Label(
-                    headers_frame,
-                    text="Costo",
-                    font=("Arial", 10, "bold"),
-                    width=12,
-                    anchor="center",
-                ).grid(row=0, column=1, padx=5, sticky=tk.EW)
-
-                # Columna 2: Precio Venta (12 caracteres, centrado)
-                ttk.Label(
-                    headers_frame,
-                    text="Precio Venta",
-                    font=("Arial", 10, "bold"),
-                    width=12,
-                    anchor="center",
-                ).grid(row=0, column=2, padx=5, sticky=tk.EW)
-
-                # Columna 3: Margen Bruto (12 caracteres, centrado)
-                ttk.Label(
-                    headers_frame,
-                    text="Margen Bruto",
-                    font=("Arial", 10, "bold"),
-                    width=12,
-                    anchor="center",
-                ).grid(row=0, column=3, padx=5, sticky=tk.EW)
-
-                # Columna 4: Cantidad (10 caracteres, centrado)
-                ttk.Label(
-                    headers_frame,
-                    text="Cantidad",
-                    font=("Arial", 10, "bold"),
-                    width=10,
-                    anchor="center",
-                ).grid(row=0, column=4, padx=5, sticky=tk.EW)
-
-                # Columna 5: Acciones (20 caracteres, centrado)
-                ttk.Label(
-                    headers_frame,
-                    text="Acciones",
-                    font=("Arial", 10, "bold"),
-                    width=20,
-                    anchor="center",
-                ).grid(row=0, column=5, padx=5, sticky=tk.EW)
-
-                # Configurar expansión uniforme de columnas
-                for i in range(6):
-                    headers_frame.columnconfigure(i, weight=1, uniform="headers")
-
-                # Productos de esta categoría
-                for i, producto in enumerate(productos, 1):
-                    prod_frame = ttk.Frame(cat_frame)
-                    prod_frame.grid(row=i, column=0, sticky=(tk.W, tk.E), pady=2)
-
-                    # Configurar expansión uniforme para las columnas del producto
-                    for col in range(6):
-                        prod_frame.columnconfigure(col, weight=1, uniform="prod_cols")
-
-                    # Nombre (alineado a la izquierda)
-                    nombre_label = ttk.Label(
-                        prod_frame, text=producto.nombre, width=25, anchor="w"
-                    )
-                    nombre_label.grid(row=0, column=0, padx=5, sticky=tk.W)
-
-                    # Costo (alineado a la derecha para números)
-                    costo_text = f"{producto.costo:.2f}"
-                    costo_label = ttk.Label(
-                        prod_frame, text=costo_text, width=12, anchor="e"
-                    )
-                    costo_label.grid(row=0, column=1, padx=5, sticky=tk.E)
-
-                    # Precio de venta (alineado a la derecha)
-                    precio_text = f"{producto.precio_venta:.2f}"
-                    precio_label = ttk.Label(
-                        prod_frame, text=precio_text, width=12, anchor="e"
-                    )
-                    precio_label.grid(row=0, column=2, padx=5, sticky=tk.E)
-
-                    # Margen bruto (alineado a la derecha)
-                    margen = producto.precio_venta - producto.costo
-                    margen_text = f"{margen:.2f}"
-                    margen_label = ttk.Label(
-                        prod_frame, text=margen_text, width=12, anchor="e"
-                    )
-                    margen_label.grid(row=0, column=3, padx=5, sticky=tk.E)
-
-                    # Cantidad (alineado a la derecha)
-                    cantidad_label = ttk.Label(
-                        prod_frame, text=str(producto.cantidad), width=10, anchor="e"
-                    )
-                    cantidad_label.grid(row=0, column=4, padx=5, sticky=tk.E)
-
-                    # Botones de acciones (centrados)
-                    actions_frame = ttk.Frame(prod_frame)
-                    actions_frame.grid(row=0, column=5, padx=5, sticky=tk.EW)
-
-                    # Centrar los botones en el frame
-                    actions_frame.columnconfigure(0, weight=1)
-                    actions_frame.columnconfigure(1, weight=1)
-
-                    edit_btn = ttk.Button(
-                        actions_frame,
-                        text="Editar",
-                        width=8,
-                        command=lambda p=producto: self.edit_producto_from_list(p),
-                    )
-                    edit_btn.grid(row=0, column=0, padx=2)
-
-                    delete_btn = ttk.Button(
-                        actions_frame,
-                        text="Eliminar",
-                        width=8,
-                        command=lambda p=producto: self.delete_producto_from_list(p),
-                    )
-                    delete_btn.grid(row=0, column=1, padx=2)
-
-                row_index += 1
+                costo_label.grid(row=0, column=1, padx=5, sticky=tk.E)
 
-        except Exception as e:
-            print(f"Error al cargar productos: {e}")
-            messagebox.showerror(
-                "Error", f"No se pudieron cargar los productos: {str(e)}"
-            )
+                # Precio de venta (alineado a la derecha)
+                precio_text = f"{producto.precio_venta:.2f}"
+                precio_label = ttk.Label(
+                    prod_frame, text=precio_text, width=12, anchor="e"
+                )
+                precio_label.grid(row=0, column=2, padx=5, sticky=tk.E)
+
+                # Margen bruto (alineado a la derecha)
+                margen = producto.precio_venta - producto.costo
+                margen_text = f"{margen:.2f}"
+                margen_label = ttk.Label(
+                    prod_frame, text=margen_text, width=12, anchor="e"
+                )
+                margen_label.grid(row=0, column=3, padx=5, sticky=tk.E)
+
+                # Cantidad (alineado a la derecha)
+                cantidad_label = ttk.Label(
+                    prod_frame, text=str(producto.cantidad), width=10, anchor="e"
+                )
+                cantidad_label.grid(row=0, column=4, padx=5, sticky=tk.E)
+
+                # Botones de acciones (centrados)
+                actions_frame = ttk.Frame(prod_frame)
+                actions_frame.grid(row=0, column=5, padx=5, sticky=tk.EW)
+
+                # Centrar los botones en el frame
+                actions_frame.columnconfigure(0, weight=1)
+                actions_frame.columnconfigure(1, weight=1)
+
+                edit_btn = ttk.Button(
+                    actions_frame,
+                    text="Editar",
+                    width=8,
+                    command=lambda p=producto: self.edit_producto_from_list(p),
+                )
+                edit_btn.grid(row=0, column=0, padx=2)
+
+                delete_btn = ttk.Button(
+                    actions_frame,
+                    text="Eliminar",
+                    width=8,
+                    command=lambda p=producto: self.delete_producto_from_list(p),
+                )
+                delete_btn.grid(row=0, column=1, padx=2)
+
+            row_index += 1
+
+    def error_cargar_productos(self, e):
+        print(f"Error al cargar productos: {e}")
+        messagebox.showerror("Error", f"No se pudieron cargar los productos: {str(e)}")
 
     def edit_producto_from_list(self, producto):
         """Carga un producto de la lista en el formulario para editar"""
@@ -328,20 +341,19 @@ class ProductosWindow:
         self.costo_entry.delete(0, tk.END)
         self.precio_entry.delete(0, tk.END)
         self.cantidad_entry.delete(0, tk.END)
+        self.codigo_entry.delete(0, tk.END)
 
         # Cargar datos del producto
         self.nombre_entry.insert(0, producto.nombre)
         self.costo_entry.insert(0, str(producto.costo))
         self.precio_entry.insert(0, str(producto.precio_venta))
         self.cantidad_entry.insert(0, str(producto.cantidad))
+        self.codigo_entry.insert(0, producto.codigo or "")
 
         # Seleccionar categoría en combobox
-        categoria = producto.categoria
-        if categoria:
-            for i, cat in enumerate(self.categorias):
-                if cat.id == categoria.id:
-                    self.categoria_combo.current(i)
-                    break
+        self.modelo_categorias.seleccionar_id(
+            self.categoria_combo, producto.categoria_id
+        )
 
         # Enfocar el campo de nombre
         self.nombre_entry.focus()
@@ -379,10 +391,7 @@ class ProductosWindow:
 
         try:
             # Obtener datos del formulario
-            categoria_nombre = self.categoria_combo.get()
-            categoria = next(
-                (c for c in self.categorias if c.nombre == categoria_nombre), None
-            )
+            categoria = self.modelo_categorias.registro(self.categoria_combo)
 
             if not categoria:
                 messagebox.showwarning("Advertencia", "Seleccione una categoría válida")
@@ -391,6 +400,7 @@ class ProductosWindow:
             costo = float(self.costo_entry.get() or 0)
             precio_venta = float(self.precio_entry.get() or 0)
             cantidad = int(self.cantidad_entry.get() or 0)
+            codigo = self.codigo_entry.get().strip() or None
 
             # Validaciones básicas
             if costo < 0 or precio_venta < 0 or cantidad < 0:
@@ -420,6 +430,7 @@ class ProductosWindow:
                 self.current_producto.costo = costo
                 self.current_producto.precio_venta = precio_venta
                 self.current_producto.cantidad = cantidad
+                self.current_producto.codigo = codigo
                 self.current_producto.save()
                 messagebox.showinfo("Éxito", "Producto actualizado correctamente")
             else:
@@ -431,6 +442,7 @@ class ProductosWindow:
                     costo=costo,
                     precio_venta=precio_venta,
                     cantidad=cantidad,
+                    codigo=codigo,
                 )
                 nuevo_producto.save()
                 messagebox.showinfo("Éxito", "Producto creado correctamente")
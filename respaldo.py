@@ -0,0 +1,287 @@
+"""
+Respaldo y restauración en línea de la base de datos
+
+Los respaldos usan la API de backup de SQLite (Connection.backup), que copia
+la base de datos de forma consistente aunque otros módulos estén escribiendo.
+La copia se hace por bloques de páginas con una pausa entre ellos para no
+retener el bloqueo y que las ventanas abiertas sigan respondiendo.
+
+Cada respaldo se guarda comprimido (gzip) en respaldos/ con la fecha y hora
+en el nombre, y después se aplican las reglas de retención: se conservan los
+últimos N respaldos, el más reciente de cada uno de los últimos días y el más
+reciente de cada una de las últimas semanas.
+
+La restauración valida el respaldo (PRAGMA integrity_check, tablas esperadas
+y versión del esquema), le aplica las migraciones que le falten, guarda un
+respaldo de la base de datos actual y copia el respaldo sobre ella también
+con la API de backup.
+
+Uso:
+    python respaldo.py crear [--db ruta]
+    python respaldo.py listar
+    python respaldo.py restaurar ARCHIVO [--db ruta]
+"""
+
+import argparse
+import gzip
+import shutil
+import sqlite3
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+DIRECTORIO_RESPALDOS = Path(__file__).parent / "respaldos"
+
+FORMATO_FECHA = "%Y%m%d-%H%M%S-%f"
+
+# Páginas copiadas por paso y pausa entre pasos (segundos)
+PAGINAS_POR_PASO = 256
+PAUSA_ENTRE_PASOS = 0.01
+
+# Reglas de retención por defecto
+RETENER_RECIENTES = 5
+RETENER_DIARIOS = 7
+RETENER_SEMANALES = 4
+
+TABLAS_ESPERADAS = {
+    "categorias",
+    "productos",
+    "compras",
+    "semanas",
+    "costos",
+    "ventas",
+    "cuentas_cobrar",
+    "cuentas_pagar",
+}
+
+
+def _ruta_db(db_path):
+    from database import Database
+
+    return Path(db_path or Database.db_path_por_defecto)
+
+
+def _copiar(origen: sqlite3.Connection, destino: sqlite3.Connection, progreso=None):
+    """Copia con la API de backup por bloques de páginas"""
+
+    def _progreso(estado, restantes, total):
+        if progreso:
+            progreso(total - restantes, total)
+
+    origen.backup(
+        destino,
+        pages=PAGINAS_POR_PASO,
+        progress=_progreso,
+        sleep=PAUSA_ENTRE_PASOS,
+    )
+
+
+def fecha_de_respaldo(archivo: Path) -> datetime:
+    """Fecha y hora codificadas en el nombre del respaldo"""
+    marca = archivo.name.split("-", 1)[1].removesuffix(".db.gz")
+    return datetime.strptime(marca, FORMATO_FECHA)
+
+
+def listar_respaldos(directorio=DIRECTORIO_RESPALDOS):
+    """Respaldos existentes, del más reciente al más antiguo"""
+    archivos = Path(directorio).glob("respaldo-*.db.gz")
+    return sorted(archivos, key=fecha_de_respaldo, reverse=True)
+
+
+def crear_respaldo(
+    db_path=None, directorio=DIRECTORIO_RESPALDOS, progreso=None, retener=True
+) -> Path:
+    """
+    Crea un respaldo comprimido de la base de datos
+
+    Args:
+        progreso: función opcional (copiadas, total) llamada en cada paso
+        retener: aplicar las reglas de retención después de crear el respaldo
+
+    Returns:
+        Path: archivo .db.gz creado
+    """
+    db_path = _ruta_db(db_path)
+    directorio = Path(directorio)
+    directorio.mkdir(parents=True, exist_ok=True)
+
+    marca = datetime.now().strftime(FORMATO_FECHA)
+    archivo = directorio / f"respaldo-{marca}.db.gz"
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            copia = Path(tmp) / "copia.db"
+            origen = sqlite3.connect(db_path)
+            destino = sqlite3.connect(copia)
+            try:
+                _copiar(origen, destino, progreso)
+            finally:
+                destino.close()
+                origen.close()
+
+            # Escribir en un temporal y renombrar para no dejar respaldos a medias
+            parcial = archivo.with_suffix(".parcial")
+            with open(copia, "rb") as entrada, gzip.open(parcial, "wb") as salida:
+                shutil.copyfileobj(entrada, salida)
+            parcial.replace(archivo)
+    except Exception as e:
+        raise Exception(f"Error al crear respaldo: {str(e)}")
+
+    if retener:
+        aplicar_retencion(directorio)
+    return archivo
+
+
+def aplicar_retencion(
+    directorio=DIRECTORIO_RESPALDOS,
+    recientes=RETENER_RECIENTES,
+    diarios=RETENER_DIARIOS,
+    semanales=RETENER_SEMANALES,
+):
+    """
+    Elimina los respaldos que no cumplen ninguna regla de retención
+
+    Returns:
+        list: archivos eliminados
+    """
+    respaldos = listar_respaldos(directorio)
+    conservar = set(respaldos[:recientes])
+
+    dias, semanas = [], []
+    for archivo in respaldos:
+        fecha = fecha_de_respaldo(archivo)
+        # Como están ordenados, el primero de cada día/semana es el más reciente
+        if fecha.date() not in dias and len(dias) < diarios:
+            dias.append(fecha.date())
+            conservar.add(archivo)
+        semana = fecha.isocalendar()[:2]
+        if semana not in semanas and len(semanas) < semanales:
+            semanas.append(semana)
+            conservar.add(archivo)
+
+    eliminados = [archivo for archivo in respaldos if archivo not in conservar]
+    for archivo in eliminados:
+        archivo.unlink()
+    return eliminados
+
+
+def validar_respaldo(copia: Path):
+    """Verifica la integridad y el esquema de una base de datos descomprimida"""
+    from database import MIGRACIONES
+
+    conn = sqlite3.connect(f"file:{copia}?mode=ro", uri=True)
+    try:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        version_actual = MIGRACIONES[-1][0]
+        if version > version_actual:
+            raise Exception(
+                f"El respaldo tiene la versión de esquema {version}, más nueva que "
+                f"la de la aplicación ({version_actual})"
+            )
+
+        resultado = conn.execute("PRAGMA integrity_check").fetchall()
+        if [fila[0] for fila in resultado] != ["ok"]:
+            raise Exception(
+                "El respaldo está dañado: "
+                + "; ".join(fila[0] for fila in resultado[:5])
+            )
+        tablas = {
+            fila[0]
+            for fila in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='table'"
+            )
+        }
+        faltantes = TABLAS_ESPERADAS - tablas
+        if faltantes:
+            raise Exception(
+                f"Al respaldo le faltan tablas: {', '.join(sorted(faltantes))}"
+            )
+    finally:
+        conn.close()
+
+
+def restaurar_respaldo(
+    archivo, db_path=None, directorio=DIRECTORIO_RESPALDOS, progreso=None
+) -> Path:
+    """
+    Restaura un respaldo sobre la base de datos
+
+    Antes de sobrescribir se valida el respaldo y se crea un respaldo de la
+    base de datos actual (sin aplicar retención).
+
+    Returns:
+        Path: respaldo de seguridad de la base de datos anterior
+    """
+    from database import Database
+
+    db_path = _ruta_db(db_path)
+    archivo = Path(archivo)
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            copia = Path(tmp) / "restaurar.db"
+            with gzip.open(archivo, "rb") as entrada, open(copia, "wb") as salida:
+                shutil.copyfileobj(entrada, salida)
+
+            validar_respaldo(copia)
+            # Llevar el respaldo al esquema actual antes de reemplazar la base
+            # de datos (p. ej. un respaldo anterior a productos.codigo)
+            Database(copia)
+
+            seguridad = None
+            if db_path.exists():
+                seguridad = crear_respaldo(db_path, directorio, retener=False)
+
+            # La API de backup toma el bloqueo de escritura del destino, por lo
+            # que los demás procesos ven la base de datos anterior o la nueva
+            origen = sqlite3.connect(copia)
+            destino = sqlite3.connect(db_path, timeout=30)
+            try:
+                _copiar(origen, destino, progreso)
+            finally:
+                destino.close()
+                origen.close()
+    except Exception as e:
+        raise Exception(f"Error al restaurar respaldo: {str(e)}")
+
+    # Las semanas en memoria de este proceso ya no son válidas, y la próxima
+    # Database() vuelve a verificar el esquema de la base restaurada
+    from database import _bases_inicializadas, indice_semanas
+
+    indice_semanas.invalidar()
+    _bases_inicializadas.discard(db_path.resolve())
+    return seguridad
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Respaldos en línea de la base de datos"
+    )
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    crear = subparsers.add_parser("crear", help="Crear un respaldo comprimido")
+    crear.add_argument("--db", help="Ruta de la base de datos")
+
+    subparsers.add_parser("listar", help="Listar los respaldos existentes")
+
+    restaurar = subparsers.add_parser("restaurar", help="Restaurar un respaldo")
+    restaurar.add_argument("archivo", help="Archivo .db.gz a restaurar")
+    restaurar.add_argument("--db", help="Ruta de la base de datos")
+
+    args = parser.parse_args()
+
+    if args.comando == "crear":
+        archivo = crear_respaldo(args.db)
+        print(f"Respaldo creado: {archivo}")
+    elif args.comando == "listar":
+        for archivo in listar_respaldos():
+            print(f"{archivo.name}  {archivo.stat().st_size:>12} bytes")
+    elif args.comando == "restaurar":
+        seguridad = restaurar_respaldo(args.archivo, args.db)
+        print(f"Respaldo restaurado: {args.archivo}")
+        if seguridad:
+            print(f"Base de datos anterior guardada en: {seguridad}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Orden por columnas, filtro y paginación para las listas Treeview
+
+TablaPaginada agrega a un Treeview encabezados que ordenan al hacer clic y
+una barra con un filtro y los controles de página. El orden, el filtro y la
+página se resuelven en SQL (ver ConsultaPaginada en database.py): la tabla
+solo pide y muestra las filas de la página visible.
+"""
+
+import tkinter as tk
+from tkinter import messagebox, ttk
+
+from database import TAMANO_PAGINA
+
+# Espera después de la última tecla antes de aplicar el filtro (ms)
+ESPERA_FILTRO_MS = 300
+
+FLECHA_ASC = " ▲"
+FLECHA_DESC = " ▼"
+
+
+class TablaPaginada:
+    """Lista paginada con orden y filtro del lado de la base de datos"""
+
+    def __init__(
+        self,
+        parent,
+        tree,
+        consulta,
+        columnas_orden,
+        formatear,
+        ejecutor=None,
+        cargador=None,
+        etiqueta_filtro="Filtrar:",
+        tamano_pagina=TAMANO_PAGINA,
+        al_fallar=None,
+    ):
+        """
+        Args:
+            parent: contenedor donde se crea la barra (self.barra)
+            tree: Treeview que muestra la página
+            consulta: función (orden, descendente, filtro, limite, offset)
+                que devuelve (registros, total), p. ej. Compra.get_pagina
+            columnas_orden: columna del Treeview -> clave de orden de la consulta
+            formatear: función registro -> tupla de valores de la fila
+            ejecutor: EjecutorDB opcional para consultar en segundo plano
+            cargador: CargadorTreeview opcional para insertar las filas
+            al_fallar: función opcional llamada con la excepción si falla la
+                consulta de una página (por defecto, un mensaje de error)
+        """
+        self.tree = tree
+        self.consulta = consulta
+        self.columnas_orden = columnas_orden
+        self.formatear = formatear
+        self.ejecutor = ejecutor
+        self.cargador = cargador
+        self.tamano_pagina = tamano_pagina
+        self.al_fallar = al_fallar
+
+        self.orden = None  # None: orden por defecto de la consulta
+        self.columna_orden = None
+        self.descendente = None
+        self.offset = 0
+        self.total = 0
+        self._filtro_id = None
+
+        # Encabezados que ordenan al hacer clic
+        self._titulos = {}
+        for columna in columnas_orden:
+            self._titulos[columna] = tree.heading(columna, "text")
+            tree.heading(columna, command=lambda c=columna: self.ordenar_por(c))
+
+        # Barra de filtro y paginación
+        self.barra = ttk.Frame(parent)
+        ttk.Label(self.barra, text=etiqueta_filtro).pack(side=tk.LEFT)
+        self.filtro_var = tk.StringVar()
+        ttk.Entry(self.barra, textvariable=self.filtro_var, width=25).pack(
+            side=tk.LEFT, padx=(5, 15)
+        )
+        self.filtro_var.trace_add("write", self._programar_filtro)
+
+        self.siguiente_btn = ttk.Button(
+            self.barra, text="Siguiente ▶", command=self.pagina_siguiente
+        )
+        self.siguiente_btn.pack(side=tk.RIGHT)
+        self.pagina_label = ttk.Label(self.barra, text="")
+        self.pagina_label.pack(side=tk.RIGHT, padx=10)
+        self.anterior_btn = ttk.Button(
+            self.barra, text="◀ Anterior", command=self.pagina_anterior
+        )
+        self.anterior_btn.pack(side=tk.RIGHT)
+
+    @property
+    def filtro(self) -> str:
+        return self.filtro_var.get().strip()
+
+    def recargar(self):
+        """Vuelve a consultar la página actual"""
+        argumentos = (
+            self.orden,
+            self.descendente,
+            self.filtro,
+            self.tamano_pagina,
+            self.offset,
+        )
+        if self.ejecutor is None:
+            try:
+                resultado = self._consultar(*argumentos)
+            except Exception as e:
+                self._fallar(e)
+                return
+            self._mostrar(resultado)
+        else:
+            self.ejecutor.enviar(
+                self._consultar,
+                *argumentos,
+                al_terminar=self._mostrar,
+                al_fallar=self._fallar,
+                clave=("tabla", id(self)),
+            )
+
+    def _consultar(self, orden, descendente, filtro, limite, offset):
+        registros, total = self.consulta(orden, descendente, filtro, limite, offset)
+        return [self.formatear(registro) for registro in registros], total, offset
+
+    def _fallar(self, e):
+        # Se conservan las filas anteriores: la lista no aparece vacía
+        self.pagina_label.config(text="Error al cargar")
+        if self.al_fallar:
+            self.al_fallar(e)
+        else:
+            print(f"Error al cargar la página: {e}")
+            messagebox.showerror("Error", f"No se pudo cargar la lista: {str(e)}")
+
+    def _mostrar(self, resultado):
+        filas, self.total, offset = resultado
+
+        # La página quedó vacía (por ejemplo, tras eliminar su última fila)
+        if not filas and offset > 0 and self.total > 0:
+            ultima = (self.total - 1) // self.tamano_pagina
+            self.offset = ultima * self.tamano_pagina
+            self.recargar()
+            return
+
+        if self.cargador is not None:
+            self.cargador.cargar(filas)
+        else:
+            self.tree.delete(*self.tree.get_children())
+            for fila in filas:
+                self.tree.insert("", tk.END, values=fila)
+
+        paginas = max(1, -(-self.total // self.tamano_pagina))
+        pagina = offset // self.tamano_pagina + 1
+        self.pagina_label.config(
+            text=f"Página {pagina} de {paginas} ({self.total} filas)"
+        )
+        self.anterior_btn.config(state=tk.NORMAL if offset > 0 else tk.DISABLED)
+        self.siguiente_btn.config(
+            state=(
+                tk.NORMAL if offset + self.tamano_pagina < self.total else tk.DISABLED
+            )
+        )
+
+    def ordenar_por(self, columna):
+        """Ordena por la columna; un segundo clic invierte el sentido"""
+        if columna == self.columna_orden:
+            self.descendente = not self.descendente
+        else:
+            self.columna_orden = columna
+            self.orden = self.columnas_orden[columna]
+            self.descendente = False
+
+        for otra, titulo in self._titulos.items():
+            if otra == columna:
+                titulo += FLECHA_DESC if self.descendente else FLECHA_ASC
+            self.tree.heading(otra, text=titulo)
+
+        self.offset = 0
+        self.recargar()
+
+    def pagina_anterior(self):
+        if self.offset > 0:
+            self.offset = max(0, self.offset - self.tamano_pagina)
+            self.recargar()
+
+    def pagina_siguiente(self):
+        if self.offset + self.tamano_pagina < self.total:
+            self.offset += self.tamano_pagina
+            self.recargar()
+
+    def _programar_filtro(self, *args):
+        # Esperar a que el usuario deje de escribir antes de consultar
+        if self._filtro_id is not None:
+            self.tree.after_cancel(self._filtro_id)
+        self._filtro_id = self.tree.after(ESPERA_FILTRO_MS, self._aplicar_filtro)
+
+    def _aplicar_filtro(self):
+        self._filtro_id = None
+        self.offset = 0
+        self.recargar()
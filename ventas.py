@@ -2,12 +2,29 @@
 Módulo para gestión de Ventas
 """
 
+import os
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
-from database import Venta, Semana, Producto
+from autocompletar import Autocompletar
+from carga_treeview import CargadorTreeview
+from database import Venta, Semana, Producto, TransaccionVenta
+from diario_ventas import abrir_diario_configurado
+from ejecutor_db import EjecutorDB
+from instrumentacion import perfilar_ventana
+from modelo_combo import ModeloCombo
+from tabla_paginada import TablaPaginada
 
+# Cada cuánto se consolidan las transacciones del mostrador en ventas (segundos)
+INTERVALO_CONSOLIDACION_SEG = float(
+    os.environ.get("SISTEMA_GESTION_CONSOLIDACION_SEG", 60)
+)
 
+# Cada cuánto se aplican en la base de datos las ventas del diario (ms)
+INTERVALO_VACIADO_DIARIO_MS = 1000
+
+
+@perfilar_ventana
 class VentasWindow:
     def __init__(self, root):
         self.root = root
@@ -17,8 +34,6 @@ class VentasWindow:
         # Variables
         self.current_venta = None
         self.cantidad_anterior = 0  # Para manejar actualizaciones de inventario
-        self.semanas = Semana.get_all()
-        self.productos = Producto.get_all()
 
         # Inicializar widgets primero
         self.info_label = None
@@ -27,9 +42,46 @@ class VentasWindow:
         # Crear interfaz
         self.create_widgets()
 
+        # Consultas en segundo plano para no congelar la ventana
+        self.ejecutor = EjecutorDB(self.root, self.estado_label)
+        self.cargador = CargadorTreeview(self.tree, self.estado_label)
+
+        # Orden, filtro y paginación en SQL
+        self.tabla = TablaPaginada(
+            self.lista_frame,
+            self.tree,
+            Venta.get_pagina,
+            {
+                "ID": "id",
+                "Semana": "semana",
+                "Producto": "producto",
+                "Cantidad": "cantidad",
+                "Monto": "monto",
+                "Inventario Restante": "inventario",
+            },
+            self.fila_venta,
+            self.ejecutor,
+            self.cargador,
+            etiqueta_filtro="Producto:",
+            al_fallar=self.error_cargar_ventas,
+        )
+        self.tabla.barra.grid(
+            row=1, column=0, columnspan=2, pady=(5, 0), sticky=(tk.W, tk.E)
+        )
+
         # Cargar ventas iniciales
         self.load_ventas()
 
+        # Consolidar ahora y luego periódicamente las ventas del mostrador
+        self.consolidar_transacciones()
+
+        # Diario de ventas opcional: al abrir se aplican los registros que
+        # quedaron pendientes (por ejemplo, tras un cierre inesperado)
+        self.diario = abrir_diario_configurado()
+        self.descartadas_avisadas = 0
+        if self.diario:
+            self.vaciar_diario()
+
     def create_widgets(self):
         """Crea todos los widgets de la ventana"""
 
@@ -56,18 +108,30 @@ class VentasWindow:
 
         self.semana_combo = ttk.Combobox(form_frame, state="readonly", width=30)
         self.semana_combo.grid(row=0, column=1, pady=5, sticky=tk.W)
+        self.modelo_semanas = ModeloCombo(
+            lambda s: f"{s.fecha_inicio.strftime('%d/%m/%Y')} - {s.fecha_fin.strftime('%d/%m/%Y')}",
+            self.semana_combo,
+            vacio="No hay semanas configuradas",
+        )
 
         # Campo: Producto
         ttk.Label(form_frame, text="Producto:").grid(
             row=0, column=2, padx=(20, 10), pady=5, sticky=tk.W
         )
 
-        self.producto_combo = ttk.Combobox(form_frame, state="readonly", width=30)
-        self.producto_combo.grid(row=0, column=3, pady=5, sticky=tk.W)
+        # Sugerencias por prefijo del nombre a medida que se escribe
+        self.producto_selector = Autocompletar(
+            form_frame,
+            Producto.buscar_por_prefijo,
+            texto=lambda p: p.nombre,
+            detalle=lambda p: f"{p.nombre}  (#{p.id}, disponible: {p.cantidad})",
+            al_seleccionar=self.on_producto_selected,
+            width=30,
+        )
+        self.producto_selector.grid(row=0, column=3, pady=5, sticky=tk.W)
 
         # Cargar datos en comboboxes
         self.load_semanas_combo()
-        self.load_productos_combo()
 
         # Campo: Cantidad Vendida
         ttk.Label(form_frame, text="Cantidad Vendida:").grid(
@@ -110,12 +174,31 @@ class VentasWindow:
         )
         self.info_label.pack()
 
-        # Bind para cambio de producto
-        self.producto_combo.bind("<<ComboboxSelected>>", self.on_producto_selected)
+        # Venta por código de barras / SKU
+        escaneo_frame = ttk.Frame(form_frame)
+        escaneo_frame.grid(
+            row=3, column=0, columnspan=4, pady=(10, 0), sticky=(tk.W, tk.E)
+        )
+        ttk.Label(escaneo_frame, text="Código:").pack(side=tk.LEFT, padx=(0, 10))
+        self.codigo_entry = ttk.Entry(escaneo_frame, width=20)
+        self.codigo_entry.pack(side=tk.LEFT)
+        self.codigo_entry.bind("<Return>", self.on_codigo_ingresado)
+
+        # Con el modo escaneo activo, cada código registra la venta de una
+        # unidad en el momento; si no, solo elige el producto en el formulario
+        self.modo_escaneo_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            escaneo_frame,
+            text="Agregar al escanear",
+            variable=self.modo_escaneo_var,
+            command=lambda: self.codigo_entry.focus(),
+        ).pack(side=tk.LEFT, padx=(10, 0))
+        self.escaneo_label = ttk.Label(escaneo_frame, text="", foreground="gray")
+        self.escaneo_label.pack(side=tk.LEFT, padx=(10, 0))
 
         # Botones del formulario
         buttons_frame = ttk.Frame(form_frame)
-        buttons_frame.grid(row=3, column=0, columnspan=4, pady=(15, 0))
+        buttons_frame.grid(row=4, column=0, columnspan=4, pady=(15, 0))
 
         ttk.Button(buttons_frame, text="Guardar", command=self.save_venta).pack(
             side=tk.LEFT, padx=5
@@ -133,6 +216,7 @@ class VentasWindow:
             main_frame, text="Ventas Registradas", padding="10"
         )
         lista_frame.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.lista_frame = lista_frame
 
         # Configurar expansión
         lista_frame.columnconfigure(0, weight=1)
@@ -195,72 +279,92 @@ class VentasWindow:
         ttk.Button(action_frame, text="Cerrar", command=self.root.destroy).pack(
             side=tk.RIGHT, padx=5
         )
+        self.estado_label = ttk.Label(action_frame, text="", foreground="gray")
+        self.estado_label.pack(side=tk.LEFT, padx=10)
 
     def load_semanas_combo(self):
         """Carga las semanas en el combobox"""
-        if self.semanas:
-            semanas_info = []
-            for semana in self.semanas:
-                # CAMBIO AQUÍ: Mostrar solo fechas, no "Semana X:"
-                info = f"{semana.fecha_inicio.strftime('%d/%m/%Y')} - {semana.fecha_fin.strftime('%d/%m/%Y')}"  # CAMBIADO
-                semanas_info.append((semana.id, info))
-
-            self.semana_combo["values"] = [info for _, info in semanas_info]
-            if semanas_info:
-                self.semana_combo.current(0)
-        else:
-            self.semana_combo["values"] = ["No hay semanas configuradas"]
-
-    def load_productos_combo(self):
-        """Carga los productos en el combobox"""
-        if self.productos:
-            productos_info = []
-            for producto in self.productos:
-                # CAMBIO AQUÍ: Mostrar solo el nombre, no stock ni precio
-                info = f"{producto.nombre}"  # CAMBIADO: solo nombre
-                productos_info.append((producto.id, info))
-
-            self.producto_combo["values"] = [info for _, info in productos_info]
-            if productos_info:
-                self.producto_combo.current(0)
-                # Actualizar información del primer producto
-                self.actualizar_info_producto(self.productos[0])
+        self.modelo_semanas.cargar(Semana.get_all())
+        self.modelo_semanas.seleccionar_indice(self.semana_combo, 0)
+
+    def on_producto_selected(self, producto):
+        """Cuando se elige un producto de las sugerencias"""
+        self.actualizar_info_producto(producto)
+
+    def on_codigo_ingresado(self, event=None):
+        """Busca el producto por código (Enter en el campo o lector de barras)"""
+        codigo = self.codigo_entry.get().strip()
+        self.codigo_entry.delete(0, tk.END)
+        if not codigo:
+            return
+
+        producto = Producto.get_by_codigo(codigo)
+        if not producto:
+            self.root.bell()
+            self.escaneo_label.config(text=f"Código no encontrado: {codigo}")
+            return
+
+        if self.modo_escaneo_var.get():
+            self.agregar_por_codigo(producto)
         else:
-            self.producto_combo["values"] = ["No hay productos registrados"]
+            self.producto_selector.seleccionar(producto)
+            self.actualizar_info_producto(producto)
+            self.escaneo_label.config(text="")
+            self.cantidad_entry.focus()
 
-    def on_producto_selected(self, event):
-        """Cuando se selecciona un producto en el combobox"""
-        producto_id = self.get_producto_id_from_combo()
-        if producto_id:
-            producto = Producto.get_by_id(producto_id)
-            if producto:
-                self.actualizar_info_producto(producto)
+    def agregar_por_codigo(self, producto):
+        """
+        Registra enseguida la venta de una unidad del producto
+
+        Solo agrega la transacción (se rechaza si ninguna semana contiene la
+        fecha de hoy); la venta semanal y el inventario se actualizan al
+        consolidar (ver consolidar_transacciones).
+        """
+        try:
+            TransaccionVenta(
+                producto_id=producto.id,
+                cantidad=1,
+                monto=producto.precio_venta,
+            ).registrar()
+        except Exception as e:
+            # Sin ventanas modales para no interrumpir el escaneo
+            self.root.bell()
+            self.escaneo_label.config(text=str(e))
+            return
+
+        self.escaneo_label.config(
+            text=f"Registrado: {producto.nombre} ${producto.precio_venta:.2f}"
+        )
+
+    def consolidar_transacciones(self):
+        """Suma en ventas las transacciones del mostrador (en segundo plano)"""
+        self.ejecutor.enviar(
+            TransaccionVenta.consolidar,
+            al_terminar=self.transacciones_consolidadas,
+            al_fallar=self.error_consolidacion,
+            clave="consolidacion",
+        )
+
+    def transacciones_consolidadas(self, resultado):
+        if resultado["transacciones"]:
+            self.load_ventas()
+        self.programar_consolidacion()
+
+    def error_consolidacion(self, e):
+        # Las transacciones quedan pendientes hasta el próximo intento
+        print(f"Error al consolidar ventas: {e}")
+        self.escaneo_label.config(text=str(e))
+        self.programar_consolidacion()
+
+    def programar_consolidacion(self):
+        if INTERVALO_CONSOLIDACION_SEG > 0:
+            self.root.after(
+                int(INTERVALO_CONSOLIDACION_SEG * 1000), self.consolidar_transacciones
+            )
 
     def get_semana_id_from_combo(self):
         """Obtiene el ID de la semana seleccionada en el combobox"""
-        try:
-            selected_text = self.semana_combo.get()
-            for semana in self.semanas:
-                # CAMBIO AQUÍ: Coincidir con el nuevo formato
-                info = f"{semana.fecha_inicio.strftime('%d/%m/%Y')} - {semana.fecha_fin.strftime('%d/%m/%Y')}"  # CAMBIADO
-                if info == selected_text:
-                    return semana.id
-            return None
-        except:
-            return None
-
-    def get_producto_id_from_combo(self):
-        """Obtiene el ID del producto seleccionado en el combobox"""
-        try:
-            selected_text = self.producto_combo.get()
-            for producto in self.productos:
-                # CAMBIO AQUÍ: Coincidir con el nuevo formato (solo nombre)
-                info = f"{producto.nombre}"  # CAMBIADO: solo nombre
-                if info == selected_text:
-                    return producto.id
-            return None
-        except:
-            return None
+        return self.modelo_semanas.get_id(self.semana_combo)
 
     def actualizar_info_producto(self, producto):
         """Actualiza la información del producto seleccionado"""
@@ -284,11 +388,10 @@ class VentasWindow:
         self.cantidad_anterior = 0
 
         # Restaurar selecciones por defecto
-        if self.semanas:
-            self.semana_combo.current(0)
-        if self.productos:
-            self.producto_combo.current(0)
-            self.actualizar_info_producto(self.productos[0])
+        self.modelo_semanas.seleccionar_indice(self.semana_combo, 0)
+        self.producto_selector.limpiar()
+        self.info_label.config(text="Seleccione un producto para ver detalles")
+        self.inventario_label.config(text="(Disponible: 0)")
 
     def clear_form(self):
         """Limpia completamente el formulario"""
@@ -301,44 +404,35 @@ class VentasWindow:
         self.clear_form()
 
     def load_ventas(self):
-        """Carga todas las ventas en el Treeview"""
-        # Limpiar lista actual
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        try:
-            ventas = Venta.get_all()
-
-            if not ventas:
-                return
-
-            for venta in ventas:
-                # Obtener información de semana y producto
-                semana = venta.semana
-                producto = venta.producto
-
-                if semana and producto:
-                    # CAMBIO AQUÍ: Mostrar fechas en lugar de "Semana X"
-                    semana_info = f"{semana.fecha_inicio.strftime('%d/%m/%Y')} - {semana.fecha_fin.strftime('%d/%m/%Y')}"  # CAMBIADO
-                    producto_info = producto.nombre
-                    inventario_restante = producto.cantidad
-
-                    self.tree.insert(
-                        "",
-                        tk.END,
-                        values=(
-                            venta.id,
-                            semana_info,  # Ahora muestra fechas
-                            producto_info,
-                            venta.cantidad_vendida,
-                            f"${venta.monto:.2f}",
-                            inventario_restante,
-                        ),
-                    )
-
-        except Exception as e:
-            print(f"Error al cargar ventas: {e}")
-            messagebox.showerror("Error", f"No se pudieron cargar las ventas: {str(e)}")
+        """Carga la página visible de ventas (consulta en segundo plano)"""
+        self.tabla.recargar()
+
+    def error_cargar_ventas(self, e):
+        print(f"Error al cargar ventas: {e}")
+        messagebox.showerror("Error", f"No se pudieron cargar las ventas: {str(e)}")
+
+    def fila_venta(self, venta):
+        """Valores de la fila del Treeview para una venta de Venta.get_pagina"""
+        (
+            venta_id,
+            fecha_inicio,
+            fecha_fin,
+            producto_nombre,
+            cantidad_vendida,
+            monto,
+            inventario_restante,
+        ) = venta
+        semana_info = (
+            f"{fecha_inicio.strftime('%d/%m/%Y')} - {fecha_fin.strftime('%d/%m/%Y')}"
+        )
+        return (
+            venta_id,
+            semana_info,
+            producto_nombre,
+            cantidad_vendida,
+            f"${monto:.2f}",
+            inventario_restante,
+        )
 
     def on_venta_select(self, event):
         """Cuando se selecciona una venta en la lista"""
@@ -376,26 +470,15 @@ class VentasWindow:
             self.monto_entry.insert(0, str(venta_actualizada.monto))
 
             # Seleccionar semana en combobox
-            semana = venta_actualizada.semana
-            if semana and self.semanas:
-                for i, s in enumerate(self.semanas):
-                    if s.id == semana.id:
-                        self.semana_combo.current(i)
-                        break
-
-            # Seleccionar producto en combobox y mostrar información
+            self.modelo_semanas.seleccionar_id(
+                self.semana_combo, venta_actualizada.semana_id
+            )
+
+            # Seleccionar producto y mostrar información (inventario actual)
             producto = venta_actualizada.producto
-            if producto and self.productos:
-                # Primero actualizar la lista de productos (por si cambió el inventario)
-                self.productos = Producto.get_all()
-                self.load_productos_combo()
-
-                # Buscar el producto en la lista actualizada
-                for i, p in enumerate(self.productos):
-                    if p.id == producto.id:
-                        self.producto_combo.current(i)
-                        self.actualizar_info_producto(p)
-                        break
+            if producto:
+                self.producto_selector.seleccionar(producto)
+                self.actualizar_info_producto(producto)
 
             # Mantener la referencia
             self.current_venta = venta_actualizada
@@ -407,9 +490,9 @@ class VentasWindow:
     def save_venta(self):
         """Guarda la venta (crea o actualiza)"""
         try:
-            # Obtener IDs desde los comboboxes
+            # Obtener IDs desde el combobox y el selector de producto
             semana_id = self.get_semana_id_from_combo()
-            producto_id = self.get_producto_id_from_combo()
+            producto_id = self.producto_selector.get_id()
 
             # Validaciones básicas
             if not semana_id:
@@ -469,7 +552,29 @@ class VentasWindow:
                     cantidad_vendida=cantidad_vendida,
                     monto=monto,
                 )
-                nueva_venta.save()
+                if self.diario:
+                    # Misma verificación de inventario que Venta.save:
+                    # guardar_lote no la repite, así que se descuentan las
+                    # ventas del diario y las del mostrador (modo escaneo)
+                    # todavía no aplicadas
+                    producto = Producto.get_by_id(producto_id)
+                    if producto:
+                        disponible = (
+                            producto.cantidad
+                            - self.diario.pendiente_de(producto_id)
+                            - TransaccionVenta.get_pendiente_producto(producto_id)
+                        )
+                        if disponible < cantidad_vendida:
+                            messagebox.showwarning(
+                                "Advertencia",
+                                f"Inventario insuficiente. Solo hay {disponible} "
+                                "unidades disponibles",
+                            )
+                            return
+                    # Aceptada en el diario; se guarda con el próximo lote
+                    self.diario.registrar(nueva_venta)
+                else:
+                    nueva_venta.save()
                 messagebox.showinfo("Éxito", "Venta creada correctamente")
 
             # Refrescar datos
@@ -478,16 +583,42 @@ class VentasWindow:
         except Exception as e:
             messagebox.showerror("Error", f"No se pudo guardar la venta: {str(e)}")
 
+    def vaciar_diario(self):
+        """Aplica las ventas pendientes del diario (en segundo plano)"""
+        if self.diario.pendientes:
+            self.ejecutor.enviar(
+                self.diario.vaciar,
+                al_terminar=self.diario_vaciado,
+                al_fallar=self.error_vaciado_diario,
+                clave="diario",
+            )
+        else:
+            self.root.after(INTERVALO_VACIADO_DIARIO_MS, self.vaciar_diario)
+
+    def diario_vaciado(self, aplicados):
+        if aplicados:
+            self.load_ventas()
+        if self.diario.descartadas > self.descartadas_avisadas:
+            nuevas = self.diario.descartadas - self.descartadas_avisadas
+            self.descartadas_avisadas = self.diario.descartadas
+            messagebox.showwarning(
+                "Advertencia",
+                f"{nuevas} ventas del diario no se pudieron guardar porque su "
+                f"semana o producto fue eliminado. Quedaron en "
+                f"{self.diario.ruta_descartadas}",
+            )
+        self.root.after(INTERVALO_VACIADO_DIARIO_MS, self.vaciar_diario)
+
+    def error_vaciado_diario(self, e):
+        # Los registros siguen en el diario hasta el próximo intento
+        print(f"Error al aplicar el diario de ventas: {e}")
+        self.root.after(INTERVALO_VACIADO_DIARIO_MS, self.vaciar_diario)
+
     def refrescar_datos(self):
         """Refresca todos los datos después de una operación"""
         try:
-            # Actualizar listas
-            self.semanas = Semana.get_all()
-            self.productos = Producto.get_all()
-
-            # Actualizar comboboxes
+            # Actualizar combobox de semanas
             self.load_semanas_combo()
-            self.load_productos_combo()
 
             # Limpiar formulario
             self.clear_form()
@@ -0,0 +1,226 @@
+"""
+Verificación de los planes de consulta de database.py
+
+Extrae todas las sentencias SQL literales de database.py (y las de las
+listas paginadas, en su orden por defecto), ejecuta EXPLAIN QUERY PLAN sobre
+una base de datos generada con generador_datos.py y
+falla si alguna recorre una tabla completa (SCAN sin índice) o necesita un
+B-tree temporal para ordenar/agrupar, salvo que esté en PERMITIDOS con su
+motivo.
+
+Sirve para detectar que una consulta caliente deja de usar su índice tras un
+cambio de esquema o de SQL.
+
+Uso:
+    python verificar_planes.py [--verbose]
+"""
+
+import argparse
+import ast
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+ARCHIVO_SQL = Path(__file__).parent / "database.py"
+
+# Sentencias que pueden recorrer una tabla o usar un B-tree temporal.
+# Clave: (método, patrón del detalle del plan); valor: motivo.
+PERMITIDOS = {
+    (
+        "Producto.get_by_categoria",
+        r"TEMP B-TREE FOR ORDER BY",
+    ): "Ordena solo los productos de una categoría",
+    (
+        "Semana.generar_calendario",
+        r"^SCAN semanas$",
+    ): "Carga todas las semanas en el índice en memoria",
+    (
+        "Costo.get_all",
+        r"TEMP B-TREE FOR RIGHT PART OF ORDER BY",
+    ): "Tabla de configuración pequeña",
+    (
+        "Venta.get_all",
+        r"TEMP B-TREE FOR RIGHT PART OF ORDER BY",
+    ): "Orden mixto (semana DESC, producto ASC)",
+    ("CuentaCobrar.get_total", r"^SCAN cuentas_cobrar$"): "Suma toda la tabla",
+    ("CuentaPagar.get_total", r"^SCAN cuentas_pagar$"): "Suma toda la tabla",
+    (
+        "get_margen_neto_serie",
+        r"TEMP B-TREE FOR ORDER BY",
+    ): "Ordena solo las semanas del rango ya agrupadas",
+    (
+        "Semana.get_pagina",
+        r"TEMP B-TREE FOR RIGHT PART OF ORDER BY",
+    ): "Desempate por id; las fechas de inicio ya son únicas",
+    (
+        "Venta.get_pagina",
+        r"TEMP B-TREE FOR RIGHT PART OF ORDER BY",
+    ): "Desempate por id dentro de cada semana",
+    ("Semana.get_pagina", r"^SCAN semanas$"): "Filtro por prefijo de fecha",
+    ("Costo.get_pagina", r"^SCAN costos$"): "Tabla de configuración pequeña",
+    (
+        "TransaccionVenta.consolidar",
+        r"TEMP B-TREE FOR GROUP BY",
+    ): "Agrupa solo el lote pendiente (rango de ids)",
+    (
+        "buscar_global",
+        r"TEMP B-TREE FOR ORDER BY",
+    ): "Ordena por relevancia solo las coincidencias del índice FTS5",
+}
+
+SENTENCIAS_VERIFICABLES = ("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")
+
+# "SCAN tabla" sin índice; "SCAN tabla USING [COVERING] INDEX" recorre un índice
+PATRON_SCAN = re.compile(r"^SCAN (\w+)$")
+PATRON_CTE = re.compile(r"(\w+) AS \(", re.IGNORECASE)
+PATRON_TEMP = re.compile(r"USE TEMP B-TREE")
+
+
+def extraer_sentencias(archivo: Path):
+    """
+    Devuelve [(método, línea, sql)] con el primer argumento literal de cada
+    llamada a execute/executemany
+    """
+    arbol = ast.parse(archivo.read_text(encoding="utf-8"))
+    sentencias = []
+
+    def visitar(nodo, contexto):
+        if isinstance(nodo, (ast.ClassDef, ast.FunctionDef)):
+            contexto = contexto + [nodo.name]
+        if (
+            isinstance(nodo, ast.Call)
+            and isinstance(nodo.func, ast.Attribute)
+            and nodo.func.attr in ("execute", "executemany")
+            and nodo.args
+            and isinstance(nodo.args[0], ast.Constant)
+            and isinstance(nodo.args[0].value, str)
+        ):
+            sql = " ".join(nodo.args[0].value.split())
+            if sql.upper().startswith(SENTENCIAS_VERIFICABLES):
+                sentencias.append((".".join(contexto), nodo.lineno, sql))
+        for hijo in ast.iter_child_nodes(nodo):
+            visitar(hijo, contexto)
+
+    visitar(arbol, [])
+    return sentencias
+
+
+def sentencias_paginadas():
+    """
+    Devuelve [(método, línea, sql)] con las consultas de página y de total de cada
+    modelo con PAGINACION, en su orden por defecto, con y sin filtro
+    """
+    import inspect
+
+    import database
+
+    sentencias = []
+    for nombre in dir(database):
+        if nombre.startswith("_"):
+            continue
+        clase = getattr(database, nombre)
+        consulta = getattr(clase, "PAGINACION", None)
+        if not isinstance(consulta, database.ConsultaPaginada):
+            continue
+        linea = inspect.getsourcelines(clase)[1]
+        condicion = "tipo = ?" if clase is database.Costo else None
+        for filtro in ("", "a"):
+            pagina, total, _ = consulta.construir(filtro=filtro, condicion=condicion)
+            for sql in (pagina, total):
+                sentencias.append(
+                    (f"{nombre}.get_pagina", linea, " ".join(sql.split()))
+                )
+    return sentencias
+
+
+def plan(conn, sql):
+    """Detalles del plan de la sentencia (parámetros enlazados a NULL)"""
+    parametros = [None] * sql.count("?")
+    filas = conn.execute(f"EXPLAIN QUERY PLAN {sql}", parametros).fetchall()
+    return [fila[3] for fila in filas]
+
+
+def problemas_del_plan(metodo, sql, detalles, usados=None):
+    """Pasos del plan que son un recorrido completo o un B-tree temporal"""
+    # Recorrer una CTE ya materializada no es un recorrido de tabla
+    ctes = set(PATRON_CTE.findall(sql)) if sql.upper().startswith("WITH") else set()
+    for cte in list(ctes):
+        ctes.update(
+            re.findall(rf"(?:FROM|JOIN) {cte} (?:AS )?(\w+)", sql, re.IGNORECASE)
+        )
+    problemas = []
+    for detalle in detalles:
+        scan = PATRON_SCAN.search(detalle)
+        if scan and scan.group(1) in ctes:
+            continue
+        if not (scan or PATRON_TEMP.search(detalle)):
+            continue
+        permitidos = [
+            clave
+            for clave in PERMITIDOS
+            if clave[0] == metodo and re.search(clave[1], detalle)
+        ]
+        if usados is not None:
+            usados.update(permitidos)
+        if not permitidos:
+            problemas.append(detalle)
+    return problemas
+
+
+def verificar(ruta_db: Path, verbose=False) -> int:
+    """Verifica todas las sentencias y devuelve la cantidad de fallos"""
+    sentencias = extraer_sentencias(ARCHIVO_SQL) + sentencias_paginadas()
+    conn = sqlite3.connect(ruta_db)
+    fallos = 0
+    usados = set()
+    try:
+        for metodo, linea, sql in sentencias:
+            detalles = plan(conn, sql)
+            problemas = problemas_del_plan(metodo, sql, detalles, usados)
+            if problemas:
+                fallos += 1
+                print(f"FALLO {metodo} (database.py:{linea})")
+                print(f"  {sql}")
+                for detalle in problemas:
+                    print(f"  -> {detalle}")
+            elif verbose:
+                print(f"ok    {metodo} (database.py:{linea})")
+                for detalle in detalles:
+                    print(f"  {detalle}")
+    finally:
+        conn.close()
+
+    # Excepciones que ya no hacen falta (por ejemplo, tras añadir un índice)
+    for metodo, patron in sorted(set(PERMITIDOS) - usados):
+        print(f"Aviso: la excepción ({metodo}, {patron!r}) ya no se usa")
+
+    print(f"\n{len(sentencias)} sentencias verificadas, {fallos} con fallos")
+    return fallos
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Verifica que las consultas de database.py usen índices"
+    )
+    parser.add_argument("--verbose", action="store_true", help="Mostrar todos")
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Antes de importar database para que no se toque app_database.db
+        os.environ["SISTEMA_GESTION_DB"] = str(Path(tmp) / "inicial.db")
+        from generador_datos import generar
+
+        # Con datos y estadísticas (ANALYZE) el plan es el de una tienda real
+        ruta = Path(tmp) / "planes.db"
+        generar(ruta, "pequena", args.semilla)
+        fallos = verificar(ruta, args.verbose)
+
+    sys.exit(1 if fallos else 0)
+
+
+if __name__ == "__main__":
+    main()